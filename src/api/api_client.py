@@ -1,46 +1,124 @@
-from playwright.sync_api import APIRequestContext
-from typing import Dict, Any
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.api.async_api_client import AsyncApiClient, AsyncRunner, RequestTiming, get_async_runner
+from src.api.response_cache import get_response_cache
+from src.utils.config import Config
+from src.utils.step_timing import timed_step
 
 class ApiClient:
     """
-    Wrapper around Playwright's APIRequestContext.
+    Synchronous facade over AsyncApiClient.
     Used for setting up test data and bypassing UI login.
+    Every call is executed on the shared background event loop, so single calls and
+    concurrent batch calls share the same connections, retry policy and timings.
+    Catalog GETs go through the process-wide response cache (API_CACHE).
     """
 
-    def __init__(self, request_context: APIRequestContext):
-        self.request = request_context
+    def __init__(self, base_url: str = Config.BASE_API_URL, runner: Optional[AsyncRunner] = None, **options: Any):
+        if not isinstance(base_url, str):
+            # Before AsyncApiClient, ApiClient wrapped a sync APIRequestContext, which cannot be used from the runner loop
+            raise TypeError(
+                f"ApiClient takes the API base URL, not a {type(base_url).__name__}: "
+                "use ApiClient(Config.BASE_API_URL) instead of ApiClient(playwright.request.new_context(...))"
+            )
+        options.setdefault("cache", get_response_cache())
+        self._runner = runner or get_async_runner()
+        self._client = self._runner.run(AsyncApiClient.create(self._runner.playwright, base_url, **options))
+
+    @property
+    def timings(self) -> List[RequestTiming]:
+        """Per-request latency records (time in flight; queue wait and backoff in their own fields)."""
+        return self._client.timings
 
+    @timed_step("api")
     def register_user(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Registers a new user via API and returns the response."""
-        response = self.request.post("/users/register", data=payload)
-        
-        # We assert here to ensure setup didn't fail before UI tests even begin
-        assert response.ok, f"Failed to register user: {response.status} {response.text()}"
-        return response.json()
+        return self._runner.run(self._client.register_user(payload))
 
+    @timed_step("api")
     def login(self, email: str, password: str) -> str:
         """
         Authenticates a user and returns the JWT access token.
         This is critical for Hybrid tests to inject into LocalStorage.
         """
-        payload = {
-            "email": email,
-            "password": password
-        }
-        
-        response = self.request.post("/users/login", data=payload)
-        assert response.ok, f"Failed to login via API: {response.text()}"
-        
-        data = response.json()
-        assert "access_token" in data, "No access_token found in login response"
-        return data["access_token"]
-        
+        return self._runner.run(self._client.login(email, password))
+
+    @timed_step("api")
     def add_to_cart(self, product_id: str) -> None:
         """Adds a product to the cart via API (requires authentication context)"""
-        payload = {
-            "product_id": product_id,
-            "quantity": 1
-        }
-        response = self.request.post("/carts", data=payload)
-        # 201 Created
-        assert response.status == 201, f"Failed to add to cart: {response.text()}"
+        self._runner.run(self._client.add_to_cart(product_id))
+
+    @timed_step("api")
+    def create_cart(self, token: Optional[str] = None) -> str:
+        """Creates an empty cart and returns its id; with a `token` the cart belongs to that user."""
+        return self._runner.run(self._client.create_cart(token))
+
+    @timed_step("api")
+    def add_cart_item(self, cart_id: str, product_id: str, quantity: int = 1, token: Optional[str] = None) -> None:
+        """Adds (or increases) a product in an existing cart."""
+        self._runner.run(self._client.add_cart_item(cart_id, product_id, quantity, token))
+
+    @timed_step("api")
+    def get_cart(self, cart_id: str, token: Optional[str] = None) -> Dict[str, Any]:
+        """Returns a cart with its `cart_items`."""
+        return self._runner.run(self._client.get_cart(cart_id, token))
+
+    @timed_step("api")
+    def get_products(self, page: int = 1, **filters: Any) -> Dict[str, Any]:
+        """Returns one page of the product listing."""
+        return self._runner.run(self._client.get_products(page, **filters))
+
+    @timed_step("api")
+    def get_categories(self) -> List[Dict[str, Any]]:
+        """Returns the category tree."""
+        return self._runner.run(self._client.get_categories())
+
+    @timed_step("api")
+    def get_brands(self) -> List[Dict[str, Any]]:
+        """Returns the brand list."""
+        return self._runner.run(self._client.get_brands())
+
+    @timed_step("api")
+    def category_id(self, name: str) -> str:
+        """Id of a category by name, from the cached category tree."""
+        return self._runner.run(self._client.category_id(name))
+
+    @timed_step("api")
+    def brand_id(self, name: str) -> str:
+        """Id of a brand by name, from the cached brand list."""
+        return self._runner.run(self._client.brand_id(name))
+
+    @timed_step("api")
+    def register_users(self, payloads: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Registers several users concurrently."""
+        return self._runner.run(self._client.register_users(payloads))
+
+    @timed_step("api")
+    def login_many(self, credentials: Sequence[Tuple[str, str]]) -> List[str]:
+        """Logs several (email, password) pairs in concurrently and returns their tokens."""
+        return self._runner.run(self._client.login_many(credentials))
+
+    @timed_step("api")
+    def add_many_to_cart(self, product_ids: Sequence[str]) -> None:
+        """Adds several products to the cart concurrently instead of one round trip each."""
+        self._runner.run(self._client.add_many_to_cart(product_ids))
+
+    def latency_summary(self) -> Dict[str, Dict[str, float]]:
+        return self._client.latency_summary()
+
+    def dispose(self) -> None:
+        self._runner.run(self._client.dispose())
+
+
+_catalog_client: Optional[ApiClient] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog_client() -> ApiClient:
+    """Process-wide client for read-only catalog lookups of page objects (names to ids); answered from the cache."""
+    global _catalog_client
+    with _catalog_lock:
+        if _catalog_client is None:
+            _catalog_client = ApiClient(Config.BASE_API_URL)
+        return _catalog_client
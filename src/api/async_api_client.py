@@ -0,0 +1,318 @@
+import asyncio
+import atexit
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+from urllib.parse import urlencode
+
+from playwright.async_api import APIRequestContext, APIResponse, Playwright, async_playwright
+
+from src.api.response_cache import ResponseCache
+from src.utils.config import Config
+from src.utils.har import HarTape, request_key
+
+T = TypeVar("T")
+
+# Throttling and transient server errors are worth another attempt, everything else is final
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Methods that may be repeated without a second side effect; others are retried only with `retry=True`
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+@dataclass
+class RequestTiming:
+    """
+    Latency record of one logical request. `elapsed_ms` is the time its attempts were in flight;
+    waiting for a concurrency slot and backing off between attempts are counted separately.
+    """
+    method: str
+    path: str
+    status: int
+    elapsed_ms: float
+    attempts: int
+    queued_ms: float = 0.0
+    backoff_ms: float = 0.0
+
+
+class ReplayedResponse:
+    """Response served from a HAR tape, exposing the subset of APIResponse the client uses."""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = {name.lower(): value for name, value in headers.items()}
+        self._body = body
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status <= 299
+
+    async def body(self) -> bytes:
+        return self._body
+
+    async def text(self) -> str:
+        return self._body.decode("utf-8", errors="replace")
+
+    async def json(self) -> Any:
+        return json.loads(self._body)
+
+
+class AsyncApiClient:
+    """
+    asyncio counterpart of ApiClient built on `playwright.async_api`.
+    All calls share one APIRequestContext (and its connection pool), at most `max_concurrency`
+    requests are in flight, and 429/5xx responses of idempotent requests are retried with jittered
+    exponential backoff (a POST only when its call opts in, e.g. login).
+    With a `cache`, GETs of the catalog endpoints are served from it (see ResponseCache); `timings`
+    then only holds the requests that went over the network, revalidations included.
+    """
+
+    def __init__(self, request_context: APIRequestContext, max_concurrency: int = Config.API_MAX_CONCURRENCY,
+                 max_retries: int = Config.API_MAX_RETRIES, backoff_base: float = Config.API_BACKOFF_BASE,
+                 base_url: str = Config.BASE_API_URL, tape: Optional[HarTape] = None,
+                 cache: Optional[ResponseCache] = None):
+        self.request = request_context
+        self.base_url = base_url.rstrip("/")
+        # HAR record/replay (see Config.NETWORK_MODE); None talks to the live backend
+        self.tape = tape
+        # Bypassed while a tape records or replays: every request has to reach it
+        self.cache = cache
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.timings: List[RequestTiming] = []
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @classmethod
+    async def create(cls, playwright: Playwright, base_url: str = Config.BASE_API_URL, **options: Any) -> "AsyncApiClient":
+        """Opens a new APIRequestContext for `base_url` and wraps it."""
+        request_context = await playwright.request.new_context(base_url=base_url)
+        return cls(request_context, base_url=base_url, **options)
+
+    async def dispose(self) -> None:
+        await self.request.dispose()
+
+    async def register_user(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Registers a new user via API and returns the response."""
+        response = await self._send("POST", "/users/register", data=payload)
+
+        # We assert here to ensure setup didn't fail before UI tests even begin
+        assert response.ok, f"Failed to register user: {response.status} {await response.text()}"
+        return await response.json()
+
+    async def login(self, email: str, password: str) -> str:
+        """Authenticates a user and returns the JWT access token."""
+        payload = {
+            "email": email,
+            "password": password
+        }
+
+        # Issuing a second token has no side effect, so a failed login may be repeated
+        response = await self._send("POST", "/users/login", data=payload, retry=True)
+        assert response.ok, f"Failed to login via API: {await response.text()}"
+
+        data = await response.json()
+        assert "access_token" in data, "No access_token found in login response"
+        return data["access_token"]
+
+    async def add_to_cart(self, product_id: str) -> None:
+        """Adds a product to the cart via API (requires authentication context)"""
+        payload = {
+            "product_id": product_id,
+            "quantity": 1
+        }
+        response = await self._send("POST", "/carts", data=payload)
+        # 201 Created
+        assert response.status == 201, f"Failed to add to cart: {await response.text()}"
+
+    async def create_cart(self, token: Optional[str] = None) -> str:
+        """Creates an empty cart and returns its id; with a `token` the cart belongs to that user."""
+        response = await self._send("POST", "/carts", data={}, headers=_bearer(token))
+        assert response.status == 201, f"Failed to create cart: {await response.text()}"
+        return (await response.json())["id"]
+
+    async def add_cart_item(self, cart_id: str, product_id: str, quantity: int = 1, token: Optional[str] = None) -> None:
+        """Adds (or increases) a product in an existing cart."""
+        response = await self._send("POST", f"/carts/{cart_id}", data={"product_id": product_id, "quantity": quantity},
+                                    headers=_bearer(token))
+        assert response.ok, f"Failed to add to cart {cart_id}: {await response.text()}"
+
+    async def get_cart(self, cart_id: str, token: Optional[str] = None) -> Dict[str, Any]:
+        """Returns a cart with its `cart_items`."""
+        response = await self._send("GET", f"/carts/{cart_id}", headers=_bearer(token))
+        assert response.ok, f"Failed to read cart {cart_id}: {await response.text()}"
+        return await response.json()
+
+    async def get_products(self, page: int = 1, **filters: Any) -> Dict[str, Any]:
+        """Returns one page of the product listing (filters as query parameters, e.g. by_category)."""
+        response = await self._send("GET", "/products", params={"page": page, **filters})
+        assert response.ok, f"Failed to list products: {response.status} {await response.text()}"
+        return await response.json()
+
+    async def get_categories(self) -> List[Dict[str, Any]]:
+        """Returns the category tree (parents with their `sub_categories`)."""
+        response = await self._send("GET", "/categories/tree")
+        assert response.ok, f"Failed to list categories: {response.status} {await response.text()}"
+        return await response.json()
+
+    async def get_brands(self) -> List[Dict[str, Any]]:
+        """Returns the brand list ({id, name} records)."""
+        response = await self._send("GET", "/brands")
+        assert response.ok, f"Failed to list brands: {response.status} {await response.text()}"
+        return await response.json()
+
+    async def category_id(self, name: str) -> str:
+        """Id of a (sub)category by its name, e.g. for the `category-<id>` filter checkboxes."""
+        return _id_by_name(await self.get_categories(), name, "category")
+
+    async def brand_id(self, name: str) -> str:
+        """Id of a brand by its name, e.g. for the `by_brand` product filter."""
+        return _id_by_name(await self.get_brands(), name, "brand")
+
+    # Batch operations: requests run concurrently, bounded by the semaphore
+
+    async def register_users(self, payloads: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await asyncio.gather(*(self.register_user(payload) for payload in payloads))
+
+    async def login_many(self, credentials: Sequence[Tuple[str, str]]) -> List[str]:
+        return await asyncio.gather(*(self.login(email, password) for email, password in credentials))
+
+    async def add_many_to_cart(self, product_ids: Sequence[str]) -> None:
+        await asyncio.gather(*(self.add_to_cart(product_id) for product_id in product_ids))
+
+    def latency_summary(self) -> Dict[str, Dict[str, float]]:
+        """Aggregates the recorded timings per endpoint: count, average and max latency, max queue wait in ms."""
+        summary: Dict[str, Dict[str, float]] = {}
+        for timing in self.timings:
+            endpoint = summary.setdefault(f"{timing.method} {timing.path}",
+                                          {"count": 0, "avg_ms": 0.0, "max_ms": 0.0, "max_queued_ms": 0.0})
+            endpoint["count"] += 1
+            endpoint["avg_ms"] += (timing.elapsed_ms - endpoint["avg_ms"]) / endpoint["count"]
+            endpoint["max_ms"] = max(endpoint["max_ms"], timing.elapsed_ms)
+            endpoint["max_queued_ms"] = max(endpoint["max_queued_ms"], timing.queued_ms)
+        return summary
+
+    async def _send(self, method: str, path: str, retry: Optional[bool] = None,
+                    **options: Any) -> Union[APIResponse, ReplayedResponse]:
+        start = time.perf_counter()
+        url = f"{self.base_url}{path}"
+        if options.get("params"):
+            url += "?" + urlencode(options["params"])
+        request_body = json.dumps(options["data"]) if "data" in options else None
+
+        if self.tape is not None and self.tape.mode == "replay":
+            recorded = self.tape.lookup(method, url, request_body)
+            assert recorded is not None, f"No HAR recording for {method} {url} in {self.tape.path}"
+            response = ReplayedResponse(recorded["status"], recorded["headers"], recorded["body"])
+            self.timings.append(RequestTiming(method, path, response.status, (time.perf_counter() - start) * 1000, 1))
+            return response
+
+        if self.cache is not None and self.tape is None and self.cache.cacheable(method, path):
+            return await self._send_cached(path, url, start, **options)
+        retry = method in IDEMPOTENT_METHODS if retry is None else retry
+        return await self._fetch(method, path, url, request_body, start, retry, **options)
+
+    async def _send_cached(self, path: str, url: str, start: float, **options: Any) -> Union[APIResponse, ReplayedResponse]:
+        key = request_key("GET", url, None)
+        entry = self.cache.get(key)
+        if entry is not None and entry.fresh:
+            self.cache.stats["hits"] += 1
+            return ReplayedResponse(entry.status, entry.headers, entry.body)
+        if entry is not None and entry.etag:
+            options["headers"] = {**options.get("headers", {}), "If-None-Match": entry.etag}
+
+        response = await self._fetch("GET", path, url, None, start, True, **options)
+        if response.status == 304 and entry is not None:
+            entry = self.cache.refresh(key, entry)
+            return ReplayedResponse(entry.status, entry.headers, entry.body)
+        self.cache.stats["misses"] += 1
+        if response.status == 200:
+            self.cache.put(key, response.status, response.headers, await response.body())
+        return response
+
+    async def _fetch(self, method: str, path: str, url: str, request_body: Optional[str], start: float,
+                     retry: bool, **options: Any) -> APIResponse:
+        attempts, elapsed_ms, backoff_ms = 0, 0.0, 0.0
+        queued_ms = (time.perf_counter() - start) * 1000
+        while True:
+            attempts += 1
+            waiting = time.perf_counter()
+            async with self._semaphore:
+                # Only the time on the wire counts as latency, not the wait for a concurrency slot
+                sent = time.perf_counter()
+                queued_ms += (sent - waiting) * 1000
+                response = await self.request.fetch(path, method=method, **options)
+                elapsed_ms += (time.perf_counter() - sent) * 1000
+            if not retry or response.status not in RETRY_STATUSES or attempts > self.max_retries:
+                break
+            # The semaphore is released while backing off so other requests can proceed
+            delay = self._backoff_delay(attempts, response)
+            await asyncio.sleep(delay)
+            backoff_ms += delay * 1000
+
+        if self.tape is not None:
+            self.tape.record(method, url, request_body, response.status, response.status_text,
+                             response.headers, await response.body(), elapsed_ms)
+
+        self.timings.append(RequestTiming(method, path, response.status, elapsed_ms, attempts, queued_ms, backoff_ms))
+        return response
+
+    def _backoff_delay(self, attempt: int, response: Union[APIResponse, ReplayedResponse]) -> float:
+        retry_after = response.headers.get("retry-after")
+        if retry_after and retry_after.isdigit():
+            # A server asking for minutes would stall the whole run: never wait longer than the backoff cap
+            return min(float(retry_after), Config.API_BACKOFF_MAX)
+        # "Full jitter": a random delay up to the exponential cap spreads out retrying clients
+        return random.uniform(0, min(Config.API_BACKOFF_MAX, self.backoff_base * 2 ** (attempt - 1)))
+
+
+def _bearer(token: Optional[str]) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+def _id_by_name(items: List[Dict[str, Any]], name: str, kind: str) -> str:
+    """Looks `name` up in a list of {id, name} records, sub_categories included (case-insensitive)."""
+    pending = list(items)
+    while pending:
+        item = pending.pop(0)
+        if item["name"].casefold() == name.casefold():
+            return item["id"]
+        pending.extend(item.get("sub_categories") or [])
+    raise AssertionError(f"Unknown {kind} {name!r}")
+
+
+class AsyncRunner:
+    """
+    Runs an event loop (with its own async Playwright driver) on a background thread,
+    so synchronous code, e.g. the sync ApiClient facade or pytest fixtures, can await coroutines.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="async-api-runner", daemon=True)
+        self._thread.start()
+        self.playwright: Playwright = self.run(async_playwright().start())
+
+    def run(self, coroutine: Awaitable[T]) -> T:
+        """Blocks the calling thread until the coroutine finished on the runner loop."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def stop(self) -> None:
+        self.run(self.playwright.stop())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+_runner: Optional[AsyncRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_async_runner() -> AsyncRunner:
+    """Returns the process-wide runner, starting it on first use."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = AsyncRunner()
+            atexit.register(_runner.stop)
+        return _runner
@@ -0,0 +1,177 @@
+import base64
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Sequence
+
+from src.utils.config import Config
+from src.utils.file_lock import read_json, write_json_atomic
+
+# Read-only catalog endpoints: identical for every test, so one response can serve them all
+CACHEABLE_PATHS = ("/products", "/categories", "/brands")
+
+
+@dataclass
+class CachedResponse:
+    """A stored 200 response. Past `expires_at` it is stale: usable only after revalidation via its ETag."""
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    etag: Optional[str]
+    expires_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(name) + len(value) for name, value in self.headers.items())
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class ResponseCache:
+    """
+    Cache of GET responses of the catalog endpoints, keyed by method + URL (see `request_key`).
+
+    Entries are fresh for `ttl` seconds; a stale entry with an ETag is revalidated with If-None-Match
+    (a 304 refreshes it without a body). The memory tier is an LRU bounded by `max_bytes` of bodies
+    and headers. With `directory` set, entries are also written there (atomically, one file per key),
+    so xdist workers and later runs share them; a memory miss falls back to the disk tier. The directory
+    is bounded by `max_disk_bytes`: after a write, the files used longest ago (by mtime, which a disk
+    hit renews) are deleted.
+    """
+
+    def __init__(self, ttl: float = Config.API_CACHE_TTL, max_bytes: int = int(Config.API_CACHE_MAX_MB * 1024 * 1024),
+                 directory: Optional[str] = None, paths: Sequence[str] = CACHEABLE_PATHS,
+                 max_disk_bytes: int = int(Config.API_CACHE_DISK_MAX_MB * 1024 * 1024)):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.paths = tuple(paths)
+        self.stats = {"hits": 0, "disk_hits": 0, "revalidated": 0, "misses": 0, "evictions": 0, "disk_evictions": 0}
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def cacheable(self, method: str, path: str) -> bool:
+        path = path.split("?", 1)[0]
+        return method == "GET" and any(path == prefix or path.startswith(prefix + "/") for prefix in self.paths)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """The entry for `key` (fresh or stale) from memory, else from the disk tier; None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, status: int, headers: Dict[str, str], body: bytes) -> Optional[CachedResponse]:
+        if "no-store" in headers.get("cache-control", ""):
+            return None
+        entry = CachedResponse(status, dict(headers), body, headers.get("etag"), time.time() + self.ttl)
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+        return entry
+
+    def refresh(self, key: str, entry: CachedResponse) -> CachedResponse:
+        """A 304 confirmed the stored body: it is fresh for another `ttl`."""
+        entry.expires_at = time.time() + self.ttl
+        self.stats["revalidated"] += 1
+        self._write_disk(key, entry)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def summary(self) -> str:
+        return (
+            f"hits={self.stats['hits']} (disk {self.stats['disk_hits']}) revalidated={self.stats['revalidated']} "
+            f"misses={self.stats['misses']} evictions={self.stats['evictions']} (disk {self.stats['disk_evictions']}) "
+            f"memory={self._bytes / 1024:.0f}/{self.max_bytes / 1024:.0f} KB"
+        )
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.stats["evictions"] += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.directory or "", f"{hashlib.sha1(key.encode()).hexdigest()}.json")
+
+    def _read_disk(self, key: str) -> Optional[CachedResponse]:
+        if not self.directory:
+            return None
+        path = self._disk_path(key)
+        data = read_json(path)
+        if data is None or data.get("key") != key:
+            return None
+        try:
+            # The mtime is the recency the disk cap evicts by
+            os.utime(path)
+        except OSError:
+            pass
+        self.stats["disk_hits"] += 1
+        return CachedResponse(data["status"], data["headers"], base64.b64decode(data["body"]), data["etag"], data["expires_at"])
+
+    def _write_disk(self, key: str, entry: CachedResponse) -> None:
+        if not self.directory:
+            return
+        data = dict(asdict(entry), key=key, body=base64.b64encode(entry.body).decode("ascii"))
+        write_json_atomic(self._disk_path(key), data)
+        self._collect_disk()
+
+    def _collect_disk(self) -> None:
+        """Deletes the least recently used files until the directory fits `max_disk_bytes`."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    # Deleted by another worker's collection
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                self.stats["disk_evictions"] += 1
+            except OSError:
+                pass
+            total -= size
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """The process-wide cache shared by every ApiClient (API_CACHE=off: None)."""
+    global _cache
+    if Config.API_CACHE == "off":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(directory=Config.API_CACHE_DIR if Config.API_CACHE == "disk" else None)
+        return _cache
@@ -1,28 +1,255 @@
-from playwright.sync_api import Page, expect
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError, expect
 import allure
 
+from src.utils.config import Config
+from src.utils.step_timing import timed_step
+from src.utils.web_perf import PerfBudget, PerfRecord, get_web_perf_collector
+
+
+# Sets every field of a form in one evaluate: native value setter (so framework-wrapped inputs see it)
+# plus input/change/blur events, like a user typing and tabbing on. Returns the selectors it could not
+# handle (missing, hidden, disabled, read-only, unsupported element or a value the browser rejected).
+FILL_FORM_SCRIPT = """
+fields => {
+    const setters = {
+        INPUT: Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set,
+        TEXTAREA: Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, 'value').set,
+        SELECT: Object.getOwnPropertyDescriptor(HTMLSelectElement.prototype, 'value').set,
+    };
+    const unsupportedTypes = ['checkbox', 'radio', 'file', 'button', 'submit', 'reset', 'image', 'hidden'];
+    const skipped = [];
+    for (const [selector, value] of fields) {
+        let el;
+        try { el = document.querySelector(selector); } catch (e) { el = null; }
+        const visible = el && el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+        if (!visible || !(el.tagName in setters) || el.disabled || el.readOnly
+            || (el.tagName === 'INPUT' && unsupportedTypes.includes(el.type))) {
+            skipped.push(selector);
+            continue;
+        }
+        let target = value;
+        if (el.tagName === 'SELECT') {
+            const option = [...el.options].find(o => o.value === value || o.label === value);
+            if (!option) { skipped.push(selector); continue; }
+            target = option.value;
+        }
+        el.focus();
+        setters[el.tagName].call(el, target);
+        if (el.value !== target) { skipped.push(selector); continue; }
+        el.dispatchEvent(new Event('input', { bubbles: true }));
+        el.dispatchEvent(new Event('change', { bubbles: true }));
+        el.blur();
+    }
+    return skipped;
+}
+"""
+
+
+# Calibration: the page counts as network-idle once no request has been in flight for this long
+IDLE_QUIET_MS = 500
+IDLE_TIMEOUT_MS = 30_000
+
+
+def is_api_response(response: Any, path: str) -> bool:
+    """True for a non-preflight response of the backend endpoint `path` (query ignored), never for e.g. an image URL."""
+    api = urlsplit(Config.BASE_API_URL)
+    url = urlsplit(response.url)
+    return (url.netloc == api.netloc and url.path == api.path.rstrip("/") + path
+            and response.request.method != "OPTIONS")
+
+
+class InflightRequests:
+    """Counts the page's requests in flight, to measure when the network actually went quiet."""
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.count = 0
+        self.last_change = time.perf_counter()
+
+    def __enter__(self) -> "InflightRequests":
+        self.page.on("request", self._started)
+        self.page.on("requestfinished", self._ended)
+        self.page.on("requestfailed", self._ended)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.page.remove_listener("request", self._started)
+        self.page.remove_listener("requestfinished", self._ended)
+        self.page.remove_listener("requestfailed", self._ended)
+
+    def wait_for_idle(self, quiet_ms: float = IDLE_QUIET_MS, timeout_ms: float = IDLE_TIMEOUT_MS) -> Optional[float]:
+        """Waits until nothing was in flight for `quiet_ms`; returns when the quiet period began (None on timeout)."""
+        deadline = time.perf_counter() + timeout_ms / 1000
+        while time.perf_counter() < deadline:
+            if self.count <= 0 and (time.perf_counter() - self.last_change) * 1000 >= quiet_ms:
+                return self.last_change
+            # Events are only dispatched while Playwright waits
+            self.page.wait_for_timeout(50)
+        return None
+
+    def _started(self, _request: Any) -> None:
+        self.count += 1
+        self.last_change = time.perf_counter()
+
+    def _ended(self, _request: Any) -> None:
+        self.count -= 1
+        self.last_change = time.perf_counter()
+
+
+@dataclass
+class ReadinessTiming:
+    """How long a readiness wait took, and (in calibration mode) how long a networkidle wait would have taken."""
+    label: str
+    elapsed_ms: float
+    networkidle_ms: Optional[float] = None
+
+    @property
+    def saved_ms(self) -> Optional[float]:
+        if self.networkidle_ms is None:
+            return None
+        return self.networkidle_ms - self.elapsed_ms
+
+
 class BasePage:
     """
     Core page object containing shared methods for interacting with elements.
     It encapsulates Playwright's API to build more robust and readable tests.
     """
 
+    # Readiness declarations: what "loaded" means for this page object.
+    # API endpoint paths whose response must have arrived (see is_api_response), and selectors that must be visible.
+    # Pages that declare nothing fall back to waiting for networkidle.
+    READY_RESPONSES: Sequence[str] = ()
+    READY_SELECTORS: Sequence[str] = ()
+
+    # Web-performance budgets per route path, checked on `navigate` when PERF_BUDGETS is not "off"
+    PERF_BUDGETS: Dict[str, Tuple[PerfBudget, ...]] = {}
+
     def __init__(self, page: Page):
         self.page = page
+        self.readiness_timings: List[ReadinessTiming] = []
+        self.perf_records: List[PerfRecord] = []
 
+    @timed_step("page")
     def navigate(self, path: str = "/") -> None:
-        """Navigates to the specified relative path."""
-        self.page.goto(path)
-        self.page.wait_for_load_state("networkidle")
+        """
+        Navigates to the specified relative path and waits until the page is ready.
+        With an active web-performance collector the navigation is measured and checked against PERF_BUDGETS.
+        """
+        collector = get_web_perf_collector()
+        started = collector.before_navigation(self.page) if collector is not None else None
+        with self.until_ready(f"navigate {path}", self.READY_RESPONSES, self.READY_SELECTORS):
+            self.page.goto(path)
+        if collector is not None:
+            budgets = self.PERF_BUDGETS.get(path.split("?")[0], ())
+            record = collector.after_navigation(self.page, path, budgets, started)
+            self.perf_records.append(record)
 
+    @timed_step("page")
     def click_element(self, selector: str) -> None:
         """Clicks an element after ensuring it is visible and enabled."""
         element = self.page.locator(selector).first
         element.wait_for(state="visible")
         element.click()
 
+    @timed_step("page")
     def fill_input(self, selector: str, text: str) -> None:
         """Fills an input field after clearing it."""
         element = self.page.locator(selector).first
         element.wait_for(state="visible")
         element.fill(text)
+
+    @timed_step("page")
+    def select_option(self, selector: str, value: str) -> None:
+        """Selects the option of a <select> whose value or label is `value`."""
+        element = self.page.locator(selector).first
+        element.wait_for(state="visible")
+        try:
+            element.select_option(value)
+        except PlaywrightTimeoutError as error:
+            raise AssertionError(f"No option {value!r} in {selector}") from error
+
+    @timed_step("page")
+    def fill_form(self, mapping: Mapping[str, str]) -> List[str]:
+        """
+        Fills several fields ({selector: value}) in one browser round trip instead of two RPCs per field.
+        Fields the batch cannot set (not rendered yet, non-CSS selectors, ...) are filled one by one
+        with `fill_input` (`select_option` for a <select>); their selectors are returned.
+        """
+        skipped = self.page.evaluate(FILL_FORM_SCRIPT, [[selector, str(value)] for selector, value in mapping.items()])
+        for selector in skipped:
+            if self.page.locator(selector).first.evaluate("el => el.tagName") == "SELECT":
+                self.select_option(selector, str(mapping[selector]))
+            else:
+                self.fill_input(selector, str(mapping[selector]))
+        return skipped
+
+    @staticmethod
+    def form_values(fields: Mapping[str, str], data: Mapping[str, Any]) -> Dict[str, str]:
+        """
+        Turns a field map ({data key: selector}, dotted keys for nested data) and a data record
+        into the {selector: value} mapping for `fill_form`. Keys missing or None in `data` are left out.
+        """
+        values = {}
+        for key, selector in fields.items():
+            value: Any = data
+            for part in key.split("."):
+                value = value.get(part) if isinstance(value, Mapping) else None
+            if value is not None:
+                values[selector] = value
+        return values
+
+    @contextmanager
+    def until_ready(self, label: str, responses: Sequence[str] = (), selectors: Sequence[str] = (),
+                    rerendered: Sequence[str] = ()) -> Iterator[None]:
+        """
+        Runs the wrapped action and returns as soon as every expected API response arrived
+        and every selector is visible, instead of waiting for 500 ms of network silence.
+        Response waiters are registered *before* the action, so fast responses are never missed.
+        `rerendered` selectors must have had their current elements replaced (e.g. a grid re-render).
+        With READINESS_CALIBRATE the requests of the action are tracked, to report when the network
+        really went idle: no request in flight for IDLE_QUIET_MS, as networkidle defines it.
+        """
+        start = time.perf_counter()
+        for selector in rerendered:
+            self.page.evaluate(
+                "selector => document.querySelectorAll(selector).forEach(el => el.dataset.readyStale = '1')",
+                selector,
+            )
+
+        with ExitStack() as tracking:
+            # Entered before the action, so its first requests are counted too
+            inflight = tracking.enter_context(InflightRequests(self.page)) if Config.READINESS_CALIBRATE else None
+            with ExitStack() as waiters:
+                for path in responses:
+                    waiters.enter_context(
+                        self.page.expect_response(lambda response, path=path: is_api_response(response, path))
+                    )
+                yield
+
+            for selector in rerendered:
+                self.page.wait_for_function(
+                    "selector => !document.querySelector(selector + '[data-ready-stale]')",
+                    arg=selector,
+                )
+            for selector in selectors:
+                self.page.locator(selector).first.wait_for(state="visible")
+            if not responses and not selectors and not rerendered:
+                self.page.wait_for_load_state("networkidle")
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            networkidle_ms = None
+            if inflight is not None:
+                # Only for measuring. wait_for_load_state("networkidle") returns at once once the page
+                # has been idle after its load, so the quiet period is observed directly instead
+                quiet_since = inflight.wait_for_idle()
+                if quiet_since is not None:
+                    networkidle_ms = (quiet_since - start) * 1000 + IDLE_QUIET_MS
+
+        self.readiness_timings.append(ReadinessTiming(label, elapsed_ms, networkidle_ms))
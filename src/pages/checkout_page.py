@@ -1,4 +1,9 @@
+from typing import Dict, Optional
+
 from src.pages.base_page import BasePage
+from src.pages.home_page import HomePage
+from src.utils.checkpoints import CheckpointSpec
+from src.utils.web_perf import PerfBudget
 import allure
 
 class CheckoutPage(BasePage):
@@ -19,6 +24,38 @@ class CheckoutPage(BasePage):
     STATE_INPUT = "[data-test='state']"
     POSTCODE_INPUT = "[data-test='postal_code']"
     PAYMENT_METHOD_SELECT = "[data-test='payment-method']"
+    ADD_TO_CART_BTN = "[data-test='add-to-cart']"
+    CART_QUANTITY = "[data-test='cart-quantity']"
+
+    # Soft budgets warn, hard ones fail the test with PERF_BUDGETS=enforce
+    PERF_BUDGETS = {
+        "/cart": (
+            PerfBudget(ttfb_ms=800, lcp_ms=2500, cls=0.1, blocking_ms=300, transferred_kb=2500),
+            PerfBudget(lcp_ms=6000, cls=0.25, severity="hard"),
+        ),
+    }
+
+    # Field map of the billing address form (step 2)
+    BILLING_FORM = {
+        "address": ADDRESS_INPUT,
+        "city": CITY_INPUT,
+        "state": STATE_INPUT,
+        "postcode": POSTCODE_INPUT,
+    }
+
+    # Field map of the payment details (step 3); only the fields of the selected method are shown
+    PAYMENT_FORM = {
+        "bank_name": "[data-test='bank_name']",
+        "account_name": "[data-test='account_name']",
+        "account_number": "[data-test='account_number']",
+        "credit_card_number": "[data-test='credit_card_number']",
+        "expiration_date": "[data-test='expiration_date']",
+        "cvv": "[data-test='cvv']",
+        "card_holder_name": "[data-test='card_holder_name']",
+        "monthly_installments": "[data-test='monthly_installments']",
+        "gift_card_number": "[data-test='gift_card_number']",
+        "validation_code": "[data-test='validation_code']",
+    }
 
     def navigate_cart(self):
         """Goes directly to the cart page."""
@@ -32,17 +69,19 @@ class CheckoutPage(BasePage):
     @allure.step("Completing step 2: Billing Address")
     def complete_step_2(self, address: str, city: str, state: str, country: str = None, postcode: str = None) -> None:
         """Fills out the billing address form and proceeds."""
-        self.fill_input(self.ADDRESS_INPUT, address)
-        self.fill_input(self.CITY_INPUT, city)
-        self.fill_input(self.STATE_INPUT, state)
-        if postcode:
-            self.fill_input(self.POSTCODE_INPUT, postcode)
+        self.page.locator(self.ADDRESS_INPUT).wait_for(state="visible")
+        billing = {"address": address, "city": city, "state": state, "postcode": postcode or None}
+        self.fill_form(self.form_values(self.BILLING_FORM, billing))
         self.click_element(self.PROCEED_2_BTN)
 
     @allure.step("Completing step 3: Payment Method")
-    def complete_step_3(self, method: str = "Cash on Delivery") -> None:
-        """Selects a payment method and proceeds."""
+    def complete_step_3(self, method: str = "Cash on Delivery", details: Optional[Dict[str, str]] = None) -> None:
+        """Selects a payment method, fills the details it asks for (see PAYMENT_FORM) and proceeds."""
         self.page.locator(self.PAYMENT_METHOD_SELECT).select_option(label=method)
+        values = self.form_values(self.PAYMENT_FORM, details or {})
+        if values:
+            self.page.locator(next(iter(values))).wait_for(state="visible")
+            self.fill_form(values)
         self.click_element(self.PROCEED_3_BTN)
 
     @allure.step("Confirming Order")
@@ -56,3 +95,33 @@ class CheckoutPage(BasePage):
         element = self.page.locator(self.SUCCESS_MESSAGE)
         element.wait_for(state="visible", timeout=10000)
         return element.is_visible()
+
+    @allure.step("Adding the first product to the cart")
+    def add_first_product_to_cart(self) -> None:
+        """Opens the first product of the home grid and adds it to the cart."""
+        home_page = HomePage(self.page)
+        home_page.navigate_home()
+        with home_page.until_ready("open product", selectors=(self.ADD_TO_CART_BTN,)):
+            self.page.locator(home_page.PRODUCT_CARD).first.click()
+        self.click_element(self.ADD_TO_CART_BTN)
+        self.page.locator(self.CART_QUANTITY).wait_for(state="visible")
+
+    @classmethod
+    def checkpoint_after_billing(cls, billing: Dict[str, str]) -> CheckpointSpec:
+        """
+        Checkpoint of an authenticated user with a filled cart, right before the payment step.
+        The stepper keeps its current step in memory only, so a fork re-enters step 3 through the
+        cheap part of the flow (proceed + one batched billing fill) instead of replaying it all.
+        """
+        def build(page) -> None:
+            checkout_page = cls(page)
+            checkout_page.add_first_product_to_cart()
+            checkout_page.navigate_cart()
+            resume(page)
+
+        def resume(page) -> None:
+            checkout_page = cls(page)
+            checkout_page.complete_step_1()
+            checkout_page.complete_step_2(**billing)
+
+        return CheckpointSpec("checkout-before-payment", build, resume, page_objects=(cls, HomePage))
@@ -1,26 +1,132 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Set
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlsplit, urlunsplit
+
+from playwright.sync_api import Error as PlaywrightError, Page, Route
+
+from src.api.api_client import ApiClient, get_catalog_client
 from src.pages.base_page import BasePage
+from src.utils.config import Config
+from src.utils.har import request_key
+from src.utils.web_perf import PerfBudget
 import allure
 
+# Reads every visible product card in one round trip
+GRID_SCRIPT = """
+selector => [...document.querySelectorAll(selector)]
+    .filter(card => card.getClientRects().length > 0)
+    .map(card => [
+        card.dataset.test.replace(/^product-/, ''),
+        (card.querySelector("[data-test='product-name']") || card.querySelector('.card-title') || card).textContent.trim(),
+        (card.querySelector("[data-test='product-price']") || {textContent: ''}).textContent.trim(),
+        !card.querySelector("[data-test='out-of-stock']"),
+    ])
+"""
+
+# Query parameter that tags iter_catalog's own prefetch requests; stripped before they leave the browser
+PREFETCH_MARKER = "__grid_prefetch"
+# Longest wait (ms) of a grid request for its prefetched response, before it goes to the network itself
+PREFETCH_TIMEOUT_MS = 10000
+
+# URL of the page's most recent grid request (from the Resource Timing buffer), given the grid endpoint URLs
+LAST_GRID_URL_SCRIPT = """
+([endpoints, marker]) => performance.getEntriesByType('resource').map(entry => entry.name)
+    .filter(url => endpoints.includes(url.split('?')[0]) && !url.includes(marker)).pop() || null
+"""
+
+# Starts a grid-page fetch without awaiting it; the promise is kept under the request's key
+PREFETCH_SCRIPT = """
+([key, url]) => {
+    window.__gridPrefetch = window.__gridPrefetch || {};
+    window.__gridPrefetch[key] = fetch(url)
+        .then(async r => r.ok ? {body: await r.text(), contentType: r.headers.get('content-type')} : null)
+        .catch(() => null);
+}
+"""
+
+# Hands over (and forgets) the prefetched response for a key; evaluate waits for the promise, at most timeoutMs
+TAKE_PREFETCH_SCRIPT = """
+([key, timeoutMs]) => {
+    const prefetched = (window.__gridPrefetch || {})[key] || null;
+    if (window.__gridPrefetch) delete window.__gridPrefetch[key];
+    const timeout = new Promise(resolve => setTimeout(() => resolve(null), timeoutMs));
+    return prefetched && Promise.race([prefetched, timeout]);
+}
+"""
+
+
+@dataclass(frozen=True)
+class ProductCard:
+    """Compact record of one product card in the grid."""
+    id: str
+    name: str
+    price: Optional[float]
+    in_stock: bool
+
+    @classmethod
+    def from_row(cls, row: List[Any]) -> "ProductCard":
+        product_id, name, price_text, in_stock = row
+        price = re.sub(r"[^\d.]", "", price_text)
+        return cls(product_id, name, float(price) if price else None, in_stock)
+
+
 class HomePage(BasePage):
     """
     Page Object containing locators and specific actions for the Practice Software Testing Home Page.
     """
 
     # Locators
-    CATEGORY_CHECKBOX = "label[data-test='category-01HXGBFR231WXZZ9CYS3Q1RPYV']"  # Hand Tools
+    CATEGORY_CHECKBOX = "label[data-test='category-{id}']"  # see category_checkbox()
     PRICE_SLIDER = "input[data-test='price-slider']"
     PRODUCT_CARD = "a[data-test^='product-']"
+    NEXT_PAGE_LINK = "ul.pagination li:not(.disabled) a[aria-label='Next']"
+
+    # The grid is ready once the products API answered and the cards are rendered
+    READY_RESPONSES = ("/products",)
+    SEARCH_RESPONSES = ("/products/search",)
+    # API endpoints whose pages the grid shows, prefetched by iter_catalog
+    GRID_ENDPOINTS = READY_RESPONSES + SEARCH_RESPONSES
+    READY_SELECTORS = (PRODUCT_CARD,)
+
+    # Soft budgets warn, hard ones fail the test with PERF_BUDGETS=enforce
+    PERF_BUDGETS = {
+        "/": (
+            PerfBudget(ttfb_ms=800, lcp_ms=2500, cls=0.1, blocking_ms=300, transferred_kb=3000),
+            PerfBudget(lcp_ms=6000, cls=0.25, severity="hard"),
+        ),
+    }
+
+    def __init__(self, page: Page, api: Optional[ApiClient] = None):
+        super().__init__(page)
+        # The test's client (with its HAR tape) for name lookups; without one the process-wide catalog client
+        self.api = api
 
     def navigate_home(self):
         """Goes directly to the home grid."""
         self.navigate("/")
 
+    def category_checkbox(self, name: str) -> str:
+        """
+        Locator of a category's filter checkbox. The data-test attribute carries the category id, which is
+        looked up by name in the category tree (cached API response, so no round trip after the first).
+        An unknown name fails the test; an unreachable API falls back to matching the label text.
+        """
+        if self.api is None and Config.NETWORK_MODE in ("record", "replay"):
+            # The catalog client has no tape: a lookup would escape the recording
+            return f"label:has-text('{name}')"
+        try:
+            category_id = (self.api or get_catalog_client()).category_id(name)
+        except PlaywrightError:
+            return f"label:has-text('{name}')"
+        return self.CATEGORY_CHECKBOX.format(id=category_id)
+
     @allure.step("Filtering by 'Hand Tools' category")
     def filter_by_hand_tools(self) -> None:
         """Clicks the 'Hand Tools' category checkbox."""
-        # A more generic approach would use text, but data-test is safer
-        # Assuming 'Hand Tools' checkbox label is the one above
-        self.click_element("text=Hand Tools")
+        checkbox = self.category_checkbox("Hand Tools")
+        with self.until_ready("filter by category", self.READY_RESPONSES, rerendered=(self.PRODUCT_CARD,)):
+            self.click_element(checkbox)
 
     @allure.step("Setting price slider to {target_price}")
     def filter_by_price(self, target_price: int) -> None:
@@ -32,13 +138,94 @@ class HomePage(BasePage):
         # In a real scenario you would evaluate Javascript to change the value or use bounding boxes.
         self.page.evaluate(f"document.querySelector('{self.PRICE_SLIDER}').value = {target_price}")
         # Trigger 'input' and 'change' events to let Angular catch it
-        self.page.evaluate(f"document.querySelector('{self.PRICE_SLIDER}').dispatchEvent(new Event('input'))")
-        self.page.evaluate(f"document.querySelector('{self.PRICE_SLIDER}').dispatchEvent(new Event('change'))")
+        with self.until_ready("filter by price", self.READY_RESPONSES, rerendered=(self.PRODUCT_CARD,)):
+            self.page.evaluate(f"document.querySelector('{self.PRICE_SLIDER}').dispatchEvent(new Event('input'))")
+            self.page.evaluate(f"document.querySelector('{self.PRICE_SLIDER}').dispatchEvent(new Event('change'))")
 
     @allure.step("Counting visible products")
     def get_product_count(self) -> int:
         """Returns the number of products currently visible in the grid."""
-        # Wait for any potential API call that refreshes the grid to settle
-        self.page.wait_for_timeout(1000) # Small implicit wait to allow Angular digest 
+        # No sleep needed: the filter actions above already waited for the /products response and the grid re-render
         count = self.page.locator(self.PRODUCT_CARD).count()
         return count
+
+    @allure.step("Reading the product grid")
+    def get_grid_products(self) -> List[ProductCard]:
+        """Returns id, name, price and stock flag of every visible card, read in a single evaluate."""
+        return [ProductCard.from_row(row) for row in self.page.evaluate(GRID_SCRIPT, self.PRODUCT_CARD)]
+
+    def iter_catalog(self, max_pages: Optional[int] = None) -> Iterator[ProductCard]:
+        """
+        Streams the products of the current grid page, then of every following page.
+        While the caller consumes one page, the browser already fetches the next page from the same
+        grid endpoint (listing or search). The grid's own request for that page is then answered
+        from the prefetched body. The prefetch carries PREFETCH_MARKER, so the route tells the two
+        requests apart whichever arrives first.
+        """
+        # request_key of every page prefetched and not yet requested by the grid
+        prefetched: Set[str] = set()
+        endpoints = {Config.BASE_API_URL.rstrip("/") + path: path for path in self.GRID_ENDPOINTS}
+
+        def is_grid_page(url: str) -> bool:
+            return url.split("?", 1)[0] in endpoints
+
+        def serve_prefetched(route: Route) -> None:
+            url = route.request.url
+            if PREFETCH_MARKER in parse_qs(urlsplit(url).query):
+                # Our own prefetch, recognised by its marker (not by arrival order): send it without the marker
+                route.fallback(url=_without_marker(url))
+                return
+            key = request_key(route.request.method, url, None)
+            if key not in prefetched:
+                route.fallback()
+                return
+            # The grid's request for a prefetched page: resolves the prefetch promise, which usually
+            # settled while the previous page was consumed
+            prefetched.discard(key)
+            response = self.page.evaluate(TAKE_PREFETCH_SCRIPT, [key, PREFETCH_TIMEOUT_MS])
+            if response is None:
+                route.fallback()
+                return
+            route.fulfill(status=200, body=response["body"], headers={
+                "content-type": response["contentType"] or "application/json",
+                # The storefront calls the API cross-origin: without these the browser rejects the body
+                "access-control-allow-origin": route.request.headers.get("origin", "*"),
+                "vary": "Origin",
+            })
+
+        self.page.route(is_grid_page, serve_prefetched)
+        try:
+            pages = 0
+            while True:
+                pages += 1
+                records = self.get_grid_products()
+                has_next = (max_pages is None or pages < max_pages) and self.page.locator(self.NEXT_PAGE_LINK).count() > 0
+                last_url = self.page.evaluate(LAST_GRID_URL_SCRIPT, [list(endpoints), PREFETCH_MARKER])
+                if has_next and last_url:
+                    self._prefetch_next_page(prefetched, last_url, pages)
+                yield from records
+                if not has_next:
+                    return
+                # The next page comes from the endpoint of this one
+                ready = (endpoints[last_url.split("?", 1)[0]],) if last_url else ()
+                with self.until_ready(f"grid page {pages + 1}", ready, rerendered=(self.PRODUCT_CARD,)):
+                    self.page.locator(self.NEXT_PAGE_LINK).first.click()
+        finally:
+            self.page.unroute(is_grid_page, serve_prefetched)
+
+    def _prefetch_next_page(self, prefetched: Set[str], last_url: str, current_page: int) -> None:
+        parts = urlsplit(last_url)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        query["page"] = str(int(query.get("page", current_page)) + 1)
+        next_url = urlunsplit(parts._replace(query=urlencode(query)))
+
+        key = request_key("GET", next_url, None)
+        prefetched.add(key)
+        # Not awaited: the fetch runs while the caller processes the current page
+        self.page.evaluate(PREFETCH_SCRIPT, [key, f"{next_url}&{PREFETCH_MARKER}=1"])
+
+
+def _without_marker(url: str) -> str:
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if name != PREFETCH_MARKER]
+    return urlunsplit(parts._replace(query=urlencode(query)))
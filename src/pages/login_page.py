@@ -1,4 +1,5 @@
 from src.pages.base_page import BasePage
+from src.utils.web_perf import PerfBudget
 import allure
 
 class LoginPage(BasePage):
@@ -23,6 +24,30 @@ class LoginPage(BasePage):
     PHONE_INPUT = "[data-test='phone']"
     REGISTER_BTN = "[data-test='register-submit']"
 
+    READY_SELECTORS = (EMAIL_INPUT,)
+
+    # Soft budgets warn, hard ones fail the test with PERF_BUDGETS=enforce
+    PERF_BUDGETS = {
+        "/auth/login": (
+            PerfBudget(ttfb_ms=800, lcp_ms=2000, cls=0.1, blocking_ms=200, transferred_kb=2500),
+            PerfBudget(lcp_ms=5000, cls=0.25, severity="hard"),
+        ),
+    }
+
+    # Field map of the registration form: user data key -> input
+    REGISTRATION_FORM = {
+        "first_name": FIRST_NAME_INPUT,
+        "last_name": LAST_NAME_INPUT,
+        "dob": DOB_INPUT,
+        "address.street": STREET_INPUT,
+        "address.postal_code": POSTCODE_INPUT,
+        "address.city": CITY_INPUT,
+        "address.state": STATE_INPUT,
+        "phone": PHONE_INPUT,
+        "email": EMAIL_INPUT,
+        "password": PASSWORD_INPUT,
+    }
+
     def navigate_login(self):
         """Goes directly to the login page."""
         self.navigate("/auth/login")
@@ -32,25 +57,17 @@ class LoginPage(BasePage):
         """Fills the login form and submits."""
         self.fill_input(self.EMAIL_INPUT, email)
         self.fill_input(self.PASSWORD_INPUT, password)
-        self.click_element(self.LOGIN_BTN)
-        # Wait for the login to complete (e.g., navigation to home or account page)
-        self.page.wait_for_load_state("networkidle")
+        # Wait for the login API call to complete (successful or not) instead of networkidle
+        with self.until_ready("login", responses=("/users/login",)):
+            self.click_element(self.LOGIN_BTN)
 
     @allure.step("Registering a new user")
     def register(self, user_data: dict) -> None:
         """Completes the registration form."""
         self.click_element(self.REGISTER_LINK)
-        
-        self.fill_input(self.FIRST_NAME_INPUT, user_data["first_name"])
-        self.fill_input(self.LAST_NAME_INPUT, user_data["last_name"])
-        self.fill_input(self.DOB_INPUT, user_data["dob"])
-        self.fill_input(self.STREET_INPUT, user_data["address"]["street"])
-        self.fill_input(self.POSTCODE_INPUT, user_data["address"]["postal_code"])
-        self.fill_input(self.CITY_INPUT, user_data["address"]["city"])
-        self.fill_input(self.STATE_INPUT, user_data["address"]["state"])
-        self.fill_input(self.PHONE_INPUT, user_data["phone"])
-        self.fill_input(self.EMAIL_INPUT, user_data["email"])
-        self.fill_input(self.PASSWORD_INPUT, user_data["password"])
-        
-        self.click_element(self.REGISTER_BTN)
-        self.page.wait_for_load_state("networkidle")
+        # The first field is awaited so the batch does not race the form's rendering
+        self.page.locator(self.FIRST_NAME_INPUT).wait_for(state="visible")
+        self.fill_form(self.form_values(self.REGISTRATION_FORM, user_data))
+
+        with self.until_ready("register", responses=("/users/register",)):
+            self.click_element(self.REGISTER_BTN)
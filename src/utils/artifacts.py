@@ -0,0 +1,282 @@
+import hashlib
+import importlib.util
+import io
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import allure
+
+from src.utils.config import Config
+from src.utils.file_lock import read_json, write_json_atomic
+
+# Allure label that links a test result to artifacts finished after the test (see ArtifactPipeline.close)
+ARTIFACT_LABEL = "artifacts"
+
+# Scripts, styles and whitespace runs carry no information in a DOM snapshot
+_SNAPSHOT_NOISE = re.compile(r"<(script|style)\b[^>]*>.*?</\1>", re.S | re.I)
+_WHITESPACE = re.compile(r"\s{2,}")
+
+_KINDS = {
+    "image": ("image/jpeg", "jpg"),
+    "dom": ("text/html", "html"),
+    "log": ("text/plain", "txt"),
+}
+
+
+@dataclass
+class Artifact:
+    """
+    One captured artifact: raw bytes from the test thread, `path` once the worker has stored it.
+    `keep` artifacts (failure evidence) are never dropped: no near-duplicate check, storage cap or backlog limit.
+    """
+    test: str
+    test_key: str
+    name: str
+    kind: str
+    data: bytes
+    keep: bool = False
+    path: Optional[str] = None
+    duplicate_of: Optional[str] = None
+    dropped: Optional[str] = None
+
+
+@dataclass
+class TestArtifacts:
+    """Capture handle of one test (the `artifacts` fixture). Every method returns without waiting for I/O."""
+    pipeline: "ArtifactPipeline"
+    test: str
+    key: str = field(default_factory=lambda: uuid.uuid4().hex)
+    count: int = 0
+
+    def screenshot(self, page: Any, name: str, full_page: bool = False, keep: bool = False) -> None:
+        data = page.screenshot(full_page=full_page, scale="css", **self.pipeline.capture_options)
+        self._submit(name, "image", data, keep)
+
+    def dom_snapshot(self, page: Any, name: str, keep: bool = False) -> None:
+        self._submit(name, "dom", page.content().encode(), keep)
+
+    def log(self, name: str, text: str) -> None:
+        self._submit(name, "log", text.encode())
+
+    def image(self, name: str, data: bytes) -> None:
+        """An already captured image (PNG or JPEG), e.g. from the FailureTracer ring."""
+        self._submit(name, "image", data)
+
+    def _submit(self, name: str, kind: str, data: bytes, keep: bool = False) -> None:
+        if self.count == 0:
+            # In-memory only: tells ArtifactPipeline.close which Allure result the artifacts belong to
+            allure.dynamic.label(ARTIFACT_LABEL, self.key)
+        self.count += 1
+        self.pipeline.submit(Artifact(self.test, self.key, f"{self.count:02d}-{name}", kind, data, keep))
+
+
+class ArtifactPipeline:
+    """
+    Screenshots, DOM snapshots and logs handed from the test thread to one background worker.
+    The worker encodes them compactly (JPEG through Pillow, scripts/whitespace stripped from DOM
+    snapshots) and drops near-duplicate images: a 64-bit difference hash within `dedup_distance`
+    bits of an image stored earlier by the same test is only referenced again (byte-identical files
+    are shared across the run). A per-run storage cap (split between the xdist workers) bounds the
+    disk usage; artifacts past it are dropped and counted. `keep` artifacts are always stored.
+
+    Allure attachments belong to the test that is running, so the worker cannot attach them itself.
+    Instead every test that captured something gets an `artifacts` label; `close` waits for the
+    worker and adds the stored files to those Allure results, so a test never waits for its artifacts.
+    Without Pillow screenshots are captured as JPEG by the browser and only exact duplicates are dropped.
+    """
+
+    def __init__(self, directory: str = Config.ARTIFACT_DIR, allure_dir: Optional[str] = None,
+                 max_mb: float = Config.ARTIFACT_MAX_MB, quality: int = Config.ARTIFACT_IMAGE_QUALITY,
+                 dedup_distance: int = Config.ARTIFACT_DEDUP_DISTANCE, queue_size: int = Config.ARTIFACT_QUEUE_SIZE):
+        workers = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+        self.directory = os.path.join(directory, Config.WORKER_ID)
+        self.allure_dir = allure_dir
+        self.max_bytes = int(max_mb * 1024 * 1024 / max(workers, 1))
+        self.quality = quality
+        self.dedup_distance = dedup_distance
+        self.has_pillow = importlib.util.find_spec("PIL") is not None
+        # PNG is lossless input for the worker's encoder; without Pillow the browser's JPEG is kept as is
+        self.capture_options: Dict[str, Any] = {"type": "png"} if self.has_pillow else {"type": "jpeg", "quality": quality}
+
+        self.stats = {"submitted": 0, "stored": 0, "duplicates": 0, "over_cap": 0, "backlog_full": 0,
+                      "bytes_in": 0, "bytes_stored": 0, "worker_ms": 0.0}
+        self._queue: "queue.Queue[Optional[Artifact]]" = queue.Queue(maxsize=queue_size)
+        self._by_test: Dict[str, List[Artifact]] = {}
+        # Perceptual hashes per test: a similar screenshot of another test is different evidence
+        self._image_hashes: Dict[str, List[Tuple[int, str]]] = {}
+        self._digests: Dict[str, str] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def for_test(self, test: str) -> TestArtifacts:
+        return TestArtifacts(self, test)
+
+    def submit(self, artifact: Artifact) -> None:
+        """
+        Queues an artifact for the worker; drops it (never blocks) when the worker is too far behind.
+        A `keep` artifact waits for room instead.
+        """
+        self._ensure_started()
+        self.stats["submitted"] += 1
+        self.stats["bytes_in"] += len(artifact.data)
+        try:
+            if artifact.keep:
+                self._queue.put(artifact)
+            else:
+                self._queue.put_nowait(artifact)
+        except queue.Full:
+            artifact.dropped, artifact.data = "backlog", b""
+            self.stats["backlog_full"] += 1
+        self._by_test.setdefault(artifact.test_key, []).append(artifact)
+
+    def close(self) -> int:
+        """Drains the worker and links the stored artifacts into the Allure results. Returns the attachments added."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+        attached = self._attach_to_allure() if self.allure_dir else 0
+        if self._by_test:
+            manifest: Dict[str, List[Dict[str, Any]]] = {}
+            for artifacts in self._by_test.values():
+                for artifact in artifacts:
+                    entry = {key: value for key, value in vars(artifact).items() if key not in ("test", "test_key", "data")}
+                    manifest.setdefault(artifact.test, []).append(entry)
+            write_json_atomic(os.path.join(self.directory, "manifest.json"), manifest)
+        return attached
+
+    def summary(self) -> str:
+        saved = self.stats["bytes_in"] - self.stats["bytes_stored"]
+        return (
+            f"{self.stats['submitted']} artifacts: {self.stats['stored']} stored "
+            f"({self.stats['bytes_stored'] / 1024:.0f} KB, {saved / 1024:.0f} KB saved), "
+            f"{self.stats['duplicates']} duplicates, {self.stats['over_cap']} over the storage cap, "
+            f"{self.stats['backlog_full']} dropped on a full backlog; worker busy {self.stats['worker_ms'] / 1000:.1f} s"
+        )
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                # The directory holds one run: the cap only makes sense without leftovers of earlier runs
+                shutil.rmtree(self.directory, ignore_errors=True)
+                self._thread = threading.Thread(target=self._work, name="artifact-pipeline", daemon=True)
+                self._thread.start()
+
+    def _work(self) -> None:
+        while True:
+            artifact = self._queue.get()
+            if artifact is None:
+                return
+            start = time.perf_counter()
+            try:
+                self._store(artifact)
+            except Exception as error:
+                # A broken image must not take the worker (and every later artifact) down
+                artifact.dropped = f"error: {error}"
+            finally:
+                artifact.data = b""
+                self.stats["worker_ms"] += (time.perf_counter() - start) * 1000
+
+    def _store(self, artifact: Artifact) -> None:
+        fingerprint = None
+        if artifact.kind == "image":
+            data, fingerprint = self._encode_image(artifact.data)
+        elif artifact.kind == "dom":
+            data = _WHITESPACE.sub(" ", _SNAPSHOT_NOISE.sub("", artifact.data.decode(errors="replace"))).encode()
+        else:
+            data = artifact.data
+
+        digest = hashlib.sha256(data).hexdigest()
+        # Identical bytes are the same file for any test, failure evidence included
+        duplicate = self._digests.get(digest)
+        image_hashes = self._image_hashes.setdefault(artifact.test_key, [])
+        if duplicate is None and fingerprint is not None and not artifact.keep:
+            duplicate = next((path for known, path in image_hashes
+                              if bin(known ^ fingerprint).count("1") <= self.dedup_distance), None)
+        if duplicate is not None:
+            artifact.path = artifact.duplicate_of = duplicate
+            self.stats["duplicates"] += 1
+            return
+        if not artifact.keep and self.stats["bytes_stored"] + len(data) > self.max_bytes:
+            artifact.dropped = "storage cap"
+            self.stats["over_cap"] += 1
+            return
+
+        extension = _KINDS[artifact.kind][1]
+        name = re.sub(r"[^\w.-]+", "_", artifact.name)[:80]
+        path = os.path.join(self.directory, f"{name}-{digest[:12]}.{extension}")
+        os.makedirs(self.directory, exist_ok=True)
+        with open(path, "wb") as handle:
+            handle.write(data)
+        artifact.path = path
+        self._digests[digest] = path
+        if fingerprint is not None:
+            image_hashes.append((fingerprint, path))
+        self.stats["stored"] += 1
+        self.stats["bytes_stored"] += len(data)
+
+    def _encode_image(self, data: bytes) -> Tuple[bytes, Optional[int]]:
+        """JPEG at the configured quality plus the image's difference hash (Pillow), or the bytes unchanged."""
+        if not self.has_pillow:
+            return data, None
+        from PIL import Image
+
+        with Image.open(io.BytesIO(data)) as image:
+            fingerprint = _difference_hash(image)
+            if image.format == "JPEG":
+                return data, fingerprint
+            output = io.BytesIO()
+            image.convert("RGB").save(output, "JPEG", quality=self.quality, optimize=True)
+            return output.getvalue(), fingerprint
+
+    def _attach_to_allure(self) -> int:
+        """Adds the artifacts of every labelled Allure result of this process as attachments."""
+        attached = 0
+        if not self._by_test:
+            return attached
+        for name in sorted(os.listdir(self.allure_dir)) if os.path.isdir(self.allure_dir) else []:
+            if not name.endswith("-result.json"):
+                continue
+            path = os.path.join(self.allure_dir, name)
+            result = read_json(path)
+            keys = [label["value"] for label in (result or {}).get("labels", []) if label.get("name") == ARTIFACT_LABEL]
+            artifacts = [artifact for key in keys for artifact in self._by_test.get(key, []) if artifact.path]
+            if not artifacts:
+                continue
+            for artifact in artifacts:
+                mime_type, extension = _KINDS[artifact.kind]
+                source = f"{os.path.basename(artifact.path).rsplit('.', 1)[0]}-attachment.{extension}"
+                target = os.path.join(self.allure_dir, source)
+                if not os.path.exists(target):
+                    _link(artifact.path, target)
+                result.setdefault("attachments", []).append({"name": artifact.name, "source": source, "type": mime_type})
+                attached += 1
+            write_json_atomic(path, result)
+        return attached
+
+
+def _difference_hash(image: Any) -> int:
+    """64-bit dHash: brightness gradients of a 9x8 grayscale thumbnail, robust to re-encoding and tiny changes."""
+    pixels = list(image.convert("L").resize((9, 8)).getdata())
+    value = 0
+    for row in range(8):
+        for column in range(8):
+            value = (value << 1) | (pixels[row * 9 + column] > pixels[row * 9 + column + 1])
+    return value
+
+
+def _link(source: str, target: str) -> None:
+    try:
+        os.link(source, target)
+    except OSError:
+        with open(source, "rb") as reader, open(target, "wb") as writer:
+            writer.write(reader.read())
+
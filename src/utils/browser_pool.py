@@ -0,0 +1,125 @@
+from typing import Any, Dict, Optional, Set
+
+from playwright.sync_api import Browser, BrowserContext, Playwright
+
+from src.utils.config import Config
+
+
+class BrowserPool:
+    """
+    Keeps one long-lived Chromium instance per pytest (or xdist) worker and hands out
+    isolated browser contexts from it.
+    Launching a browser costs far more than creating a context, so tests only pay for the latter.
+    With `ws_endpoint` the browser is a connection to an already running server (see
+    src.utils.browser_server) instead; if that server is gone, the pool launches locally.
+    """
+
+    def __init__(self, playwright: Playwright, launch_options: Optional[Dict[str, Any]] = None,
+                 recycle_after: int = Config.BROWSER_RECYCLE_AFTER, ws_endpoint: Optional[str] = None):
+        self.playwright = playwright
+        self.launch_options = launch_options or {"headless": Config.HEADLESS, "slow_mo": Config.SLOWMO}
+        self.recycle_after = recycle_after
+        self.ws_endpoint = ws_endpoint
+        self.worker_id = Config.WORKER_ID
+
+        self._browser: Optional[Browser] = None
+        self._served_by_browser = 0
+        self._open_contexts: Set[BrowserContext] = set()
+
+        self.stats = {
+            "launches": 0,
+            "connects": 0,
+            "connect_failures": 0,
+            "reuses": 0,
+            "recycles": 0,
+            "health_failures": 0,
+            "contexts": 0,
+        }
+
+    def new_context(self, **options: Any) -> BrowserContext:
+        """Returns a fresh context on the pooled browser (base_url defaults to the UI URL)."""
+        browser = self._acquire_browser()
+        options.setdefault("base_url", Config.BASE_UI_URL)
+
+        context = browser.new_context(**options)
+        self._open_contexts.add(context)
+        context.on("close", lambda closed: self._open_contexts.discard(closed))
+        return context
+
+    def release(self, context: BrowserContext) -> None:
+        """Closes a context handed out by the pool. The browser itself stays alive."""
+        self._open_contexts.discard(context)
+        try:
+            context.close()
+        except Exception:
+            # The browser may already be gone (crash / recycle); nothing left to clean up
+            pass
+
+    def is_healthy(self) -> bool:
+        """Checks that the pooled browser process is still connected and responding."""
+        if self._browser is None or not self._browser.is_connected():
+            return False
+        try:
+            self._browser.version
+        except Exception:
+            return False
+        return True
+
+    def close(self) -> None:
+        """Closes every open context and the pooled browser."""
+        for context in list(self._open_contexts):
+            self.release(context)
+        self._close_browser()
+
+    def summary(self) -> str:
+        """Human readable one-liner of the pool metrics, used in the pytest terminal summary."""
+        return (
+            f"worker={self.worker_id} launches={self.stats['launches']} connects={self.stats['connects']} "
+            f"connect_failures={self.stats['connect_failures']} reuses={self.stats['reuses']} "
+            f"recycles={self.stats['recycles']} health_failures={self.stats['health_failures']} "
+            f"contexts={self.stats['contexts']}"
+        )
+
+    def _acquire_browser(self) -> Browser:
+        if self._browser is not None and not self.is_healthy():
+            self.stats["health_failures"] += 1
+            self._close_browser()
+
+        # Recycle only when nothing is using the browser, otherwise we would kill a running test
+        if (self._browser is not None and self._served_by_browser >= self.recycle_after
+                and not self._open_contexts):
+            self.stats["recycles"] += 1
+            self._close_browser()
+
+        if self._browser is None:
+            self._browser = self._start_browser()
+            self._served_by_browser = 0
+        else:
+            self.stats["reuses"] += 1
+
+        self._served_by_browser += 1
+        self.stats["contexts"] += 1
+        return self._browser
+
+    def _start_browser(self) -> Browser:
+        if self.ws_endpoint:
+            try:
+                browser = self.playwright.chromium.connect(self.ws_endpoint, slow_mo=self.launch_options.get("slow_mo"))
+                self.stats["connects"] += 1
+                return browser
+            except Exception:
+                # Server stopped (idle timeout, reboot): launch locally for the rest of the session
+                self.stats["connect_failures"] += 1
+                self.ws_endpoint = None
+        self.stats["launches"] += 1
+        return self.playwright.chromium.launch(**self.launch_options)
+
+    def _close_browser(self) -> None:
+        if self._browser is None:
+            return
+        try:
+            self._browser.close()
+        except Exception:
+            pass
+        self._browser = None
+        self._open_contexts.clear()
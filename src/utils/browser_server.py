@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from src.utils.config import Config
+from src.utils.file_lock import file_lock, read_json, write_json_atomic
+
+# Root of the repository: the daemon is started as `python -m src.utils.browser_server` from there
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class BrowserServer:
+    """
+    Handle to the warm browser daemon of this checkout, through its state file.
+
+    The daemon (`python -m src.utils.browser_server start`) keeps a Chromium `launchServer` alive between
+    pytest runs, so a run connects over its websocket instead of launching a browser. Each pytest
+    process leases the server for its lifetime; the daemon shuts down after `idle_timeout` seconds
+    without a lease. Contexts belong to the connection that created them and are closed with it,
+    so they cannot outlive a run: only the browser process is kept warm.
+    The daemon relies on POSIX sessions and signals; on Windows set BROWSER_SERVER to an endpoint instead.
+    """
+
+    def __init__(self, state_path: str = Config.BROWSER_SERVER_STATE):
+        self.state_path = os.path.abspath(state_path)
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """The daemon's state, or None when no daemon is running."""
+        state = read_json(self.state_path)
+        if state is None or not _pid_alive(state["pid"]) or not _pid_alive(state["server_pid"]):
+            return None
+        return state
+
+    def lease(self, pid: Optional[int] = None) -> Optional[str]:
+        """Registers `pid` (default: this process) as a client and returns the endpoint, if the daemon runs."""
+        with file_lock(self.state_path):
+            state = self.read()
+            if state is None:
+                return None
+            state["clients"] = sorted(set(state["clients"]) | {pid or os.getpid()})
+            state["last_used"] = time.time()
+            write_json_atomic(self.state_path, state)
+            return state["ws_endpoint"]
+
+    def release(self, pid: Optional[int] = None) -> None:
+        with file_lock(self.state_path):
+            state = self.read()
+            if state is None:
+                return
+            state["clients"] = [client for client in state["clients"] if client != (pid or os.getpid())]
+            state["last_used"] = time.time()
+            write_json_atomic(self.state_path, state)
+
+    def start(self, headless: bool = True, idle_timeout: float = Config.BROWSER_SERVER_IDLE_TIMEOUT,
+              port: int = Config.BROWSER_SERVER_PORT, wait: float = 60) -> Dict[str, Any]:
+        """Starts the daemon in its own session (or returns the running one) and waits for its endpoint."""
+        state = self.read()
+        if state is not None:
+            return state
+        log_path = os.path.splitext(self.state_path)[0] + ".log"
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        command = [
+            sys.executable, "-m", "src.utils.browser_server", "--state", self.state_path, "serve",
+            "--idle-timeout", str(idle_timeout), "--port", str(port),
+        ] + ([] if headless else ["--headed"])
+        with open(log_path, "a", encoding="utf-8") as log:
+            daemon = subprocess.Popen(command, cwd=PROJECT_ROOT, stdout=log, stderr=subprocess.STDOUT,
+                                      stdin=subprocess.DEVNULL, start_new_session=True)
+
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            state = self.read()
+            if state is not None and state["pid"] == daemon.pid:
+                return state
+            if daemon.poll() is not None:
+                raise RuntimeError(f"Browser server exited with code {daemon.returncode}, see {log_path}")
+            time.sleep(0.1)
+        daemon.terminate()
+        raise RuntimeError(f"Browser server did not report an endpoint within {wait:.0f} s, see {log_path}")
+
+    def stop(self) -> bool:
+        state = self.read()
+        if state is None:
+            return False
+        os.kill(state["pid"], signal.SIGTERM)
+        deadline = time.monotonic() + 15
+        while self.read() is not None and time.monotonic() < deadline:
+            time.sleep(0.1)
+        return True
+
+    def serve(self, headless: bool, idle_timeout: float, port: int, poll_interval: float = 2.0) -> None:
+        """
+        Daemon body: runs `playwright launch-server` through Playwright's bundled driver, publishes
+        its endpoint in the state file and stops it once no client has held a lease for `idle_timeout`.
+        """
+        from playwright._impl._driver import compute_driver_executable, get_driver_env
+
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as handle:
+            # Loopback only, and a random path keeps other local processes from guessing the endpoint
+            json.dump({"headless": headless, "host": "127.0.0.1", "port": port, "wsPath": f"/{uuid.uuid4().hex}"},
+                      handle)
+            options_path = handle.name
+        driver, cli = compute_driver_executable()
+        server = subprocess.Popen([driver, cli, "launch-server", "--browser", "chromium", "--config", options_path],
+                                  stdout=subprocess.PIPE, env=get_driver_env(), text=True)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            ws_endpoint = (server.stdout.readline() if server.stdout else "").strip()
+            if not ws_endpoint.startswith("ws"):
+                raise RuntimeError(f"launch-server printed {ws_endpoint!r} instead of an endpoint")
+            # The driver may still log; keep its pipe from filling up
+            threading.Thread(target=server.stdout.read, daemon=True).start()
+            print(f"Browser server {ws_endpoint} (pid {server.pid}), idle timeout {idle_timeout:.0f} s", flush=True)
+
+            with file_lock(self.state_path):
+                write_json_atomic(self.state_path, {
+                    "pid": os.getpid(), "server_pid": server.pid, "ws_endpoint": ws_endpoint, "headless": headless,
+                    "idle_timeout": idle_timeout, "started_at": time.time(), "last_used": time.time(), "clients": [],
+                })
+            while server.poll() is None and not self._idle(idle_timeout):
+                time.sleep(poll_interval)
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+            os.remove(options_path)
+            with file_lock(self.state_path):
+                state = read_json(self.state_path)
+                if state is not None and state["pid"] == os.getpid():
+                    os.remove(self.state_path)
+            print("Browser server stopped", flush=True)
+
+    def _idle(self, idle_timeout: float) -> bool:
+        """Drops leases of exited clients (crashed runs); True once the server has been unused long enough."""
+        with file_lock(self.state_path):
+            state = read_json(self.state_path)
+            if state is None or state["pid"] != os.getpid():
+                # State removed or taken over by another daemon: this one is orphaned
+                return True
+            clients: List[int] = [pid for pid in state["clients"] if _pid_alive(pid)]
+            if clients != state["clients"] or clients:
+                state["clients"] = clients
+                state["last_used"] = time.time() if clients else state["last_used"]
+                write_json_atomic(self.state_path, state)
+            return not clients and time.time() - state["last_used"] > idle_timeout
+
+
+def benchmark(iterations: int = 5) -> Dict[str, float]:
+    """
+    Median time from a fresh Playwright start to a usable page: launching Chromium (cold) vs.
+    connecting to the warm server. Starts a temporary server when none is running.
+    """
+    from playwright.sync_api import sync_playwright
+
+    server = BrowserServer()
+    started_here = server.read() is None
+    ws_endpoint = server.start()["ws_endpoint"]
+    timings: Dict[str, List[float]] = {"cold": [], "warm": []}
+    try:
+        for _ in range(iterations):
+            for mode in timings:
+                start = time.perf_counter()
+                with sync_playwright() as playwright:
+                    if mode == "cold":
+                        browser = playwright.chromium.launch()
+                    else:
+                        browser = playwright.chromium.connect(ws_endpoint)
+                    page = browser.new_context().new_page()
+                    page.set_content("<p>ready</p>")
+                    timings[mode].append((time.perf_counter() - start) * 1000)
+                    browser.close()
+    finally:
+        if started_here:
+            server.stop()
+    return {mode: statistics.median(values) for mode, values in timings.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm Chromium server kept alive between pytest runs")
+    parser.add_argument("--state", default=Config.BROWSER_SERVER_STATE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("start", "start the daemon in the background"), ("serve", "run the daemon in the foreground")):
+        command_parser = commands.add_parser(name, help=help_text)
+        command_parser.add_argument("--headed", action="store_true")
+        command_parser.add_argument("--idle-timeout", type=float, default=Config.BROWSER_SERVER_IDLE_TIMEOUT,
+                                    help="seconds without a pytest client before the daemon exits")
+        command_parser.add_argument("--port", type=int, default=Config.BROWSER_SERVER_PORT, help="0 = any free port")
+    commands.add_parser("stop", help="stop the daemon")
+    commands.add_parser("status", help="print the daemon's state")
+    benchmark_parser = commands.add_parser("benchmark", help="cold launch vs. warm connect")
+    benchmark_parser.add_argument("--iterations", type=int, default=5)
+
+    args = parser.parse_args()
+    browser_server = BrowserServer(args.state)
+    if args.command == "start":
+        print(json.dumps(browser_server.start(not args.headed, args.idle_timeout, args.port), indent=2))
+    elif args.command == "serve":
+        browser_server.serve(not args.headed, args.idle_timeout, args.port)
+    elif args.command == "stop":
+        print("Stopped" if browser_server.stop() else "Not running")
+    elif args.command == "status":
+        running = browser_server.read()
+        print(json.dumps(running, indent=2) if running else "Not running")
+    else:
+        medians = benchmark(args.iterations)
+        print(f"cold launch  median {medians['cold']:7.1f} ms to first page")
+        print(f"warm connect median {medians['warm']:7.1f} ms to first page "
+              f"({medians['cold'] - medians['warm']:.0f} ms saved per run and worker)")
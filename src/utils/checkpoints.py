@@ -0,0 +1,176 @@
+import hashlib
+import inspect
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.api.api_client import ApiClient
+from src.utils.config import Config
+from src.utils.file_lock import file_lock, read_json, write_json_atomic
+from src.utils.storage_state_cache import AUTH_TOKEN_KEY, decode_jwt_exp
+
+# Storage keys under which the storefront keeps the id of its server-side cart
+CART_ID_KEYS = ("cart_id",)
+
+# Restores sessionStorage (not part of Playwright's storage_state) once per tab, on the checkpoint's origin
+RESTORE_SESSION_STORAGE_SCRIPT = """
+(([origin, items]) => {
+    if (location.origin !== origin || sessionStorage.getItem('__checkpoint_restored')) return;
+    for (const [key, value] of Object.entries(items)) sessionStorage.setItem(key, value);
+    sessionStorage.setItem('__checkpoint_restored', '1');
+})(%s);
+"""
+
+
+@dataclass(frozen=True)
+class CheckpointSpec:
+    """
+    A named point in a flow. `build` drives a fresh page (of an authenticated context) to that point,
+    `resume` re-enters it on a page restored from the snapshot. The source of both and of
+    `page_objects` is fingerprinted: editing any of them invalidates the checkpoint.
+    """
+    name: str
+    build: Callable[[Any], None]
+    resume: Callable[[Any], None]
+    page_objects: Tuple[type, ...] = ()
+
+
+def code_fingerprint(*objects: Any) -> str:
+    """Hash of the source code of classes/functions (inherited page-object code included)."""
+    digest = hashlib.sha256()
+    seen = set()
+    for obj in objects:
+        for member in (obj.__mro__ if inspect.isclass(obj) else (obj,)):
+            if member in seen or member is object:
+                continue
+            seen.add(member)
+            try:
+                digest.update(inspect.getsource(member).encode())
+            except (OSError, TypeError):
+                digest.update(getattr(member, "__qualname__", repr(member)).encode())
+    return digest.hexdigest()[:16]
+
+
+class CheckpointStore:
+    """
+    Session cache of mid-flow snapshots: the context's storage state (cookies, localStorage), its
+    sessionStorage, the page URL and the items of the server-side cart.
+    Snapshots live on disk behind a file lock, so every xdist worker of a run reuses the same one,
+    and are keyed by the run seed: a new run (or a changed page object) captures afresh.
+
+    `fork` starts a test from a snapshot: a new context with the captured state and a *copy* of the
+    server-side cart, so forks never share (or check out) each other's cart.
+    """
+
+    def __init__(self, api: ApiClient, directory: str = Config.CHECKPOINT_DIR, run_key: Optional[str] = None):
+        self.api = api
+        self.directory = directory
+        self.run_key = run_key or os.getenv("DATA_SEED", "")
+        self.stats = {"captures": 0, "hits": 0, "forks": 0, "invalidated": 0}
+
+    def get_or_capture(self, spec: CheckpointSpec, new_context: Callable[..., Any]) -> Dict[str, Any]:
+        fingerprint = code_fingerprint(spec.build, spec.resume, *spec.page_objects)
+        path = os.path.join(self.directory, f"{spec.name}.json")
+        with file_lock(path):
+            checkpoint = read_json(path)
+            if checkpoint is not None and self._is_valid(checkpoint, fingerprint):
+                self.stats["hits"] += 1
+                return checkpoint
+            if checkpoint is not None:
+                self.stats["invalidated"] += 1
+
+            context = new_context()
+            page = context.new_page()
+            spec.build(page)
+            checkpoint = self._capture(spec.name, fingerprint, context, page)
+            page.close()
+            write_json_atomic(path, checkpoint)
+            self.stats["captures"] += 1
+            return checkpoint
+
+    def fork(self, spec: CheckpointSpec, new_context: Callable[..., Any]) -> Any:
+        """Returns a page restored from the (cached) checkpoint and re-entered via `spec.resume`."""
+        checkpoint = self.get_or_capture(spec, new_context)
+        storage_state = json.loads(json.dumps(checkpoint["storage_state"]))
+        session_storage = dict(checkpoint["session_storage"])
+
+        if checkpoint["cart_items"]:
+            # The copy belongs to the checkpoint's user, like the cart it was taken from
+            token = _auth_token(storage_state)
+            cart_id = self.api.create_cart(token)
+            for item in checkpoint["cart_items"]:
+                self.api.add_cart_item(cart_id, item["product_id"], item["quantity"], token)
+            self._replace_cart_id(storage_state, session_storage, cart_id)
+
+        context = new_context(storage_state=storage_state)
+        if session_storage:
+            context.add_init_script(RESTORE_SESSION_STORAGE_SCRIPT % json.dumps([checkpoint["origin"], session_storage]))
+        page = context.new_page()
+        page.goto(checkpoint["url"])
+        spec.resume(page)
+        self.stats["forks"] += 1
+        return page
+
+    def summary(self) -> str:
+        return (
+            f"captures={self.stats['captures']} hits={self.stats['hits']} forks={self.stats['forks']} "
+            f"invalidated={self.stats['invalidated']}"
+        )
+
+    def _capture(self, name: str, fingerprint: str, context: Any, page: Any) -> Dict[str, Any]:
+        origin, session_storage = page.evaluate("() => [location.origin, Object.assign({}, sessionStorage)]")
+        storage_state = context.storage_state()
+        cart_id = self._find_cart_id(storage_state, session_storage)
+        token = _auth_token(storage_state)
+        cart_items: List[Dict[str, Any]] = []
+        if cart_id:
+            cart_items = [
+                {"product_id": item["product_id"], "quantity": item["quantity"]}
+                for item in self.api.get_cart(cart_id, token).get("cart_items", [])
+            ]
+        return {
+            "name": name,
+            "fingerprint": fingerprint,
+            "run_key": self.run_key,
+            "created": time.time(),
+            "expires_at": decode_jwt_exp(token) if token else None,
+            "origin": origin,
+            "url": page.url,
+            "storage_state": storage_state,
+            "session_storage": session_storage,
+            "cart_items": cart_items,
+        }
+
+    def _is_valid(self, checkpoint: Dict[str, Any], fingerprint: str) -> bool:
+        if checkpoint.get("fingerprint") != fingerprint or checkpoint.get("run_key") != self.run_key:
+            return False
+        expires_at = checkpoint.get("expires_at")
+        return expires_at is None or expires_at - Config.STORAGE_STATE_EXPIRY_MARGIN > time.time()
+
+    @staticmethod
+    def _find_cart_id(storage_state: Dict[str, Any], session_storage: Dict[str, str]) -> Optional[str]:
+        for key in CART_ID_KEYS:
+            if session_storage.get(key):
+                return session_storage[key]
+            for entry in storage_state["origins"]:
+                for item in entry["localStorage"]:
+                    if item["name"] == key and item["value"]:
+                        return item["value"]
+        return None
+
+    @staticmethod
+    def _replace_cart_id(storage_state: Dict[str, Any], session_storage: Dict[str, str], cart_id: str) -> None:
+        for key in CART_ID_KEYS:
+            if key in session_storage:
+                session_storage[key] = cart_id
+            for entry in storage_state["origins"]:
+                for item in entry["localStorage"]:
+                    if item["name"] == key:
+                        item["value"] = cart_id
+
+
+def _auth_token(storage_state: Dict[str, Any]) -> Optional[str]:
+    return next((item["value"] for entry in storage_state["origins"] for item in entry["localStorage"]
+                 if item["name"] == AUTH_TOKEN_KEY), None)
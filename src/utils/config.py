@@ -1,4 +1,7 @@
 import os
+import re
+from urllib.parse import urlsplit
+
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -14,3 +17,125 @@ class Config:
     TEST_USER_PASSWORD = os.getenv("TEST_USER_PASSWORD", "welcome01")
     
     HEADLESS = os.getenv("HEADLESS", "true").lower() == "true"
+    # Playwright slow_mo (ms) for watching a headed run; 0 for normal runs
+    SLOWMO = float(os.getenv("SLOWMO", "0"))
+
+    # Parallel execution: xdist exports the worker id, plain pytest runs as "master"
+    WORKER_ID = os.getenv("PYTEST_XDIST_WORKER", "master")
+
+    # Browser pool: relaunch the shared browser after N contexts to cap memory growth
+    BROWSER_RECYCLE_AFTER = int(os.getenv("BROWSER_RECYCLE_AFTER", "50"))
+
+    # Warm browser server (python -m src.utils.browser_server start): "auto" connects to the running
+    # daemon and launches locally otherwise, "off" always launches, a ws:// endpoint connects to that server
+    BROWSER_SERVER = os.getenv("BROWSER_SERVER", "auto")
+    BROWSER_SERVER_STATE = os.getenv("BROWSER_SERVER_STATE", ".cache/browser-server.json")
+    BROWSER_SERVER_IDLE_TIMEOUT = float(os.getenv("BROWSER_SERVER_IDLE_TIMEOUT", "1800"))
+    BROWSER_SERVER_PORT = int(os.getenv("BROWSER_SERVER_PORT", "0"))
+
+    # Storage-state cache: API-issued tokens are reused until shortly (margin in seconds) before they expire
+    STORAGE_STATE_DIR = os.getenv("STORAGE_STATE_DIR", ".cache/storage-state")
+    STORAGE_STATE_EXPIRY_MARGIN = int(os.getenv("STORAGE_STATE_EXPIRY_MARGIN", "60"))
+
+    # User pool: pre-registered users leased to tests, refilled in the background below the low-water mark
+    USER_POOL_FILE = os.getenv("USER_POOL_FILE", ".cache/user-pool.json")
+    USER_POOL_SIZE = int(os.getenv("USER_POOL_SIZE", "10"))
+    USER_POOL_LOW_WATER = int(os.getenv("USER_POOL_LOW_WATER", "3"))
+    USER_POOL_LEASE_TIMEOUT = int(os.getenv("USER_POOL_LEASE_TIMEOUT", "900"))
+
+    # API client: concurrency limit and jittered exponential backoff (seconds) for 429/5xx responses
+    API_MAX_CONCURRENCY = int(os.getenv("API_MAX_CONCURRENCY", "10"))
+    API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "3"))
+    API_BACKOFF_BASE = float(os.getenv("API_BACKOFF_BASE", "0.5"))
+    API_BACKOFF_MAX = float(os.getenv("API_BACKOFF_MAX", "10"))
+
+    # Response cache of the catalog GETs (/products, /categories, /brands): "memory", "disk" (memory + a
+    # directory shared by workers and runs, capped at API_CACHE_DISK_MAX_MB) or "off".
+    # Stale entries are revalidated with their ETag.
+    API_CACHE = os.getenv("API_CACHE", "memory").lower()
+    API_CACHE_TTL = float(os.getenv("API_CACHE_TTL", "300"))
+    API_CACHE_MAX_MB = float(os.getenv("API_CACHE_MAX_MB", "32"))
+    API_CACHE_DIR = os.getenv("API_CACHE_DIR", ".cache/api-responses")
+    API_CACHE_DISK_MAX_MB = float(os.getenv("API_CACHE_DISK_MAX_MB", "128"))
+
+    # Readiness waits: additionally wait for networkidle to measure how much time each wait saved
+    READINESS_CALIBRATE = os.getenv("READINESS_CALIBRATE", "false").lower() == "true"
+
+    # Network mode: "live" (default), "record" (capture per-test HAR files) or "replay" (serve them offline)
+    NETWORK_MODE = os.getenv("NETWORK_MODE", "live").lower()
+    HAR_DIR = os.getenv("HAR_DIR", "recordings")
+    HAR_MAX_AGE_DAYS = int(os.getenv("HAR_MAX_AGE_DAYS", "14"))
+
+    # Resource policy: blocked resource types / URL substrings (comma separated) and the static bundle cache.
+    # Off by default (pages then load like for a user) and always off while PERF_BUDGETS are checked
+    RESOURCE_POLICY = os.getenv("RESOURCE_POLICY", "false").lower() == "true"
+    BLOCKED_RESOURCE_TYPES = os.getenv("BLOCKED_RESOURCE_TYPES", "image,media,font").split(",")
+    BLOCKED_URL_PATTERNS = os.getenv(
+        "BLOCKED_URL_PATTERNS",
+        "google-analytics.com,googletagmanager.com,doubleclick.net,hotjar.com,facebook.net,fonts.googleapis.com",
+    ).split(",")
+    STATIC_CACHE_DIR = os.getenv("STATIC_CACHE_DIR", ".cache/static")
+
+    # Local stand-in server: when enabled, the API base URL points at an in-process fake of the PST API.
+    # Every xdist worker gets its own port (base port + worker number).
+    LOCAL_SERVER = os.getenv("LOCAL_SERVER", "false").lower() == "true"
+    LOCAL_SERVER_PORT = int(os.getenv("LOCAL_SERVER_PORT", "8091")) + int("".join(filter(str.isdigit, WORKER_ID)) or 0)
+    if LOCAL_SERVER:
+        BASE_API_URL = f"http://127.0.0.1:{LOCAL_SERVER_PORT}"
+
+    # Users and their tokens only exist on the backend that issued them: the user pool and the storage-state
+    # cache are kept per API host (the local stand-in, one per worker port, gets its own)
+    API_HOST_KEY = re.sub(r"[^\w.-]+", "_", urlsplit(BASE_API_URL).netloc)
+    USER_POOL_FILE = os.path.join(os.path.dirname(USER_POOL_FILE), API_HOST_KEY, os.path.basename(USER_POOL_FILE))
+    STORAGE_STATE_DIR = os.path.join(STORAGE_STATE_DIR, API_HOST_KEY)
+
+    # Step timing instrumentation: per-test Allure attachment + session JSON/CSV, optional CDP metrics (Chromium only)
+    STEP_TIMINGS = os.getenv("STEP_TIMINGS", "false").lower() == "true"
+    # Per-step Playwright RPC counts wrap a private Playwright method: opt-in, and skipped if that method changed
+    STEP_RPC_COUNTS = os.getenv("STEP_RPC_COUNTS", "false").lower() == "true"
+    STEP_CDP_METRICS = os.getenv("STEP_CDP_METRICS", "false").lower() == "true"
+    STEP_TIMINGS_DIR = os.getenv("STEP_TIMINGS_DIR", "step-timings")
+
+    # Allure results store: compacted per-run archives + content-addressed attachments
+    ALLURE_STORE_DIR = os.getenv("ALLURE_STORE_DIR", "allure-store")
+    ALLURE_COMPACT = os.getenv("ALLURE_COMPACT", "false").lower() == "true"
+    ALLURE_KEEP_RUNS = int(os.getenv("ALLURE_KEEP_RUNS", "20"))
+
+    # Duration-aware sharding: own timing store, estimate for tests without history (seconds), plan/report output
+    TEST_DURATIONS_FILE = os.getenv("TEST_DURATIONS_FILE", ".cache/test-durations.json")
+    DEFAULT_TEST_DURATION = float(os.getenv("DEFAULT_TEST_DURATION", "10"))
+    SHARD_REPORT_DIR = os.getenv("SHARD_REPORT_DIR", ".cache/shards")
+
+    # Test data factory: records generated per batch and the bound of the prefill queue.
+    # DATA_SEED (read by src.utils.data_factory.run_seed) makes a run's data reproducible; unset = random per run.
+    DATA_BATCH_SIZE = int(os.getenv("DATA_BATCH_SIZE", "20"))
+    DATA_QUEUE_SIZE = int(os.getenv("DATA_QUEUE_SIZE", "100"))
+
+    # Load mode (python -m src.utils.load_test): where the latency/throughput summaries are written
+    LOAD_RESULTS_DIR = os.getenv("LOAD_RESULTS_DIR", "load-results")
+
+    # Web-performance budgets on BasePage.navigate: "off" (default), "report" (collect, warn on any violation)
+    # or "enforce" (hard budgets fail the test). Metrics are appended to a trend file to spot regressions.
+    PERF_BUDGETS = os.getenv("PERF_BUDGETS", "off").lower()
+    PERF_TRENDS_FILE = os.getenv("PERF_TRENDS_FILE", ".cache/perf-trends.jsonl")
+    PERF_REGRESSION_TOLERANCE = float(os.getenv("PERF_REGRESSION_TOLERANCE", "0.2"))
+
+    # Mid-flow checkpoints (storage state + server-side cart), shared by the workers of a run
+    CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", ".cache/checkpoints")
+
+    # Failure-only tracing: "off" (default), "on-failure" (trace, written only for failing/flaky tests)
+    # or "always" (every trace is written). TRACE_STEP_SCREENSHOTS adds a ring of screenshots after page-object steps
+    TRACE_MODE = os.getenv("TRACE_MODE", "off").lower()
+    TRACE_STEP_SCREENSHOTS = os.getenv("TRACE_STEP_SCREENSHOTS", "false").lower() == "true"
+    TRACE_RING_SIZE = int(os.getenv("TRACE_RING_SIZE", "20"))
+    TRACE_SCREENSHOT_QUALITY = int(os.getenv("TRACE_SCREENSHOT_QUALITY", "50"))
+    TRACE_DIR = os.getenv("TRACE_DIR", "traces")
+
+    # Artifact pipeline (screenshots, DOM snapshots, logs): encoded, deduplicated and stored by a background worker.
+    # ARTIFACT_MAX_MB caps a run's artifacts (split between xdist workers); images within
+    # ARTIFACT_DEDUP_DISTANCE bits (of a 64-bit perceptual hash) of a stored one are not stored again.
+    ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", "artifacts")
+    ARTIFACT_MAX_MB = float(os.getenv("ARTIFACT_MAX_MB", "200"))
+    ARTIFACT_IMAGE_QUALITY = int(os.getenv("ARTIFACT_IMAGE_QUALITY", "60"))
+    ARTIFACT_DEDUP_DISTANCE = int(os.getenv("ARTIFACT_DEDUP_DISTANCE", "4"))
+    ARTIFACT_QUEUE_SIZE = int(os.getenv("ARTIFACT_QUEUE_SIZE", "200"))
@@ -0,0 +1,232 @@
+import hashlib
+import os
+import queue
+import random
+import string
+import threading
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.config import Config
+
+# Payment methods of the PST checkout (step 3) and the extra fields each one asks for
+PAYMENT_METHODS = ("Bank Transfer", "Cash on Delivery", "Credit Card", "Buy Now Pay Later", "Gift Card")
+# Card expiry years are drawn after this year instead of today's, so a seed gives the same cards on any day.
+# Move it forward before it comes close: the checkout rejects expired cards
+EXPIRY_REFERENCE_YEAR = 2030
+# Longest a test waits for the prefill thread before giving up (seconds)
+RECORD_TIMEOUT = 30
+
+
+def run_seed() -> int:
+    """
+    Base seed of the run: DATA_SEED when set (reproducible data), otherwise a fresh random seed.
+    The seed is exported to the environment, so xdist workers started afterwards share it.
+    """
+    if not os.getenv("DATA_SEED"):
+        os.environ["DATA_SEED"] = str(random.SystemRandom().getrandbits(32))
+    return int(os.environ["DATA_SEED"])
+
+
+def run_nonce() -> str:
+    """
+    Random tag of the run (DATA_RUN_NONCE, exported like the seed). Only emails carry it: the backend
+    keeps registered users, so a fixed DATA_SEED must not produce the same addresses in the next run.
+    """
+    if not os.getenv("DATA_RUN_NONCE"):
+        os.environ["DATA_RUN_NONCE"] = f"{random.SystemRandom().getrandbits(24):06x}"
+    return os.environ["DATA_RUN_NONCE"]
+
+
+def worker_seed(base_seed: int, worker_id: str = Config.WORKER_ID) -> int:
+    """Independent, stable seed per xdist worker derived from the run seed."""
+    return int(hashlib.sha256(f"{base_seed}:{worker_id}".encode()).hexdigest()[:16], 16)
+
+
+def _registration(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Payload of POST /users/register (and of LoginPage.REGISTRATION_FORM)."""
+    return {key: profile[key] for key in ("first_name", "last_name", "email", "password", "dob", "phone", "address")}
+
+
+def _registration_required(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Only the fields the registration form requires; for validation tests of optional fields."""
+    user = _registration(profile)
+    del user["phone"]
+    return user
+
+
+def _billing(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Keys of CheckoutPage.BILLING_FORM / complete_step_2."""
+    address = profile["address"]
+    return {"address": address["street"], "city": address["city"], "state": address["state"],
+            "country": address["country"], "postcode": address["postal_code"]}
+
+
+def _payment(profile: Dict[str, Any], method: Optional[str] = None) -> Dict[str, Any]:
+    """Step 3 of the checkout: a payment method (the profile's own unless given) and the details it needs."""
+    method = method or profile["payment_method"]
+    return dict(profile["payment_details"][method], method=method)
+
+
+SCHEMAS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "registration": _registration,
+    "registration_required": _registration_required,
+    "billing": _billing,
+    "payment": _payment,
+}
+
+
+class DataFactory:
+    """
+    Seeded test-data factory. A background thread generates profiles (user, address, payment)
+    in batches into a bounded queue, so tests take ready-made records instead of calling Faker
+    about ten times each. Records are shaped per form by schema variants (see SCHEMAS).
+
+    Every record is unique within the run: emails carry the worker seed and a sequence number,
+    and passwords are drawn from the seeded generator instead of getting a fixed suffix.
+    The same DATA_SEED reproduces the same records per worker, except for the run nonce in emails.
+    """
+
+    def __init__(self, seed: Optional[int] = None, worker_id: str = Config.WORKER_ID,
+                 batch_size: int = Config.DATA_BATCH_SIZE, queue_size: int = Config.DATA_QUEUE_SIZE):
+        self.base_seed = run_seed() if seed is None else seed
+        self.nonce = run_nonce()
+        self.worker_id = worker_id
+        self.seed = worker_seed(self.base_seed, worker_id)
+        self.batch_size = batch_size
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max(queue_size, batch_size))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._sequence = 0
+        self._error: Optional[BaseException] = None
+        self.stats = {"generated": 0, "served": 0, "waits": 0}
+
+    def record(self, schema: str = "registration", **options: Any) -> Dict[str, Any]:
+        """
+        Takes the next profile from the queue and shapes it with the given schema variant
+        (options go to the variant, e.g. `record("payment", method="Gift Card")`).
+        """
+        shape = SCHEMAS[schema]
+        self._ensure_started()
+        try:
+            profile = self._queue.get_nowait()
+        except queue.Empty:
+            # The prefill thread fell behind: wait for it rather than generating concurrently (keeps order stable)
+            self.stats["waits"] += 1
+            profile = self._wait_for_profile()
+        self.stats["served"] += 1
+        return shape(profile, **options)
+
+    def user(self) -> Dict[str, Any]:
+        """A registration payload; usable as `user_factory` of the UserPool."""
+        return self.record("registration")
+
+    def records(self, count: int, schema: str = "registration") -> List[Dict[str, Any]]:
+        return [self.record(schema) for _ in range(count)]
+
+    def close(self) -> None:
+        self._stop.set()
+        # Unblock a producer waiting on a full queue
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def summary(self) -> str:
+        return (
+            f"seed {self.base_seed} (worker {self.worker_id}): {self.stats['generated']} generated, "
+            f"{self.stats['served']} served, {self.stats['waits']} waits on the prefill thread"
+        )
+
+    def _wait_for_profile(self) -> Dict[str, Any]:
+        """Blocks for the prefill thread; a failure of that thread is raised here, in the test's thread."""
+        waited = 0.0
+        while True:
+            try:
+                return self._queue.get(timeout=0.5)
+            except queue.Empty:
+                waited += 0.5
+            if self._error is not None:
+                raise self._error
+            if waited >= RECORD_TIMEOUT or self._thread is None or not self._thread.is_alive():
+                raise TimeoutError(f"No test data from the prefill thread within {waited:.1f} s")
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._prefill, name="data-factory", daemon=True)
+                self._thread.start()
+
+    def _prefill(self) -> None:
+        # Imported here: Faker's providers take a while to load and collection does not need them
+        from faker import Faker
+
+        try:
+            fake = Faker()
+            fake.seed_instance(self.seed)
+            rng = random.Random(self.seed)
+            while not self._stop.is_set():
+                for profile in [self._profile(fake, rng) for _ in range(self.batch_size)]:
+                    while not self._stop.is_set():
+                        try:
+                            self._queue.put(profile, timeout=0.5)
+                            self.stats["generated"] += 1
+                            break
+                        except queue.Full:
+                            continue
+        except Exception as error:
+            # Handed to the next waiting `record` call instead of dying silently with the thread
+            self._error = error
+
+    def _profile(self, fake: Any, rng: random.Random) -> Dict[str, Any]:
+        self._sequence += 1
+        first_name, last_name = fake.first_name(), fake.last_name()
+        # Seed + sequence make the address unique per worker, the nonce per run; the domain is reserved for tests
+        local_part = f"{first_name}.{last_name}".lower().replace(" ", "").replace("'", "")
+        email = f"{local_part}.{self.seed % 0xFFFFFF:06x}{self._sequence}.{self.nonce}@example.com"
+        return {
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": email,
+            "password": self._password(rng),
+            # Fixed range instead of date_of_birth(): that one depends on today's date, breaking reproducibility
+            "dob": fake.date_between_dates(date(1955, 1, 1), date(2000, 12, 31)).isoformat(),
+            "phone": fake.numerify("##########"),
+            "address": {
+                "street": fake.street_address(),
+                "city": fake.city(),
+                "state": fake.state(),
+                "country": fake.country_code(),
+                "postal_code": fake.postcode(),
+            },
+            "payment_method": rng.choice(PAYMENT_METHODS),
+            "payment_details": {method: self._payment_details(fake, rng, method) for method in PAYMENT_METHODS},
+        }
+
+    @staticmethod
+    def _password(rng: random.Random) -> str:
+        # Random per record (so it is never a known, leaked password) and always of every character class
+        classes = (string.ascii_uppercase, string.ascii_lowercase, string.digits, "!@#$%^&*")
+        chars = [rng.choice(chars) for chars in classes]
+        chars += [rng.choice("".join(classes)) for _ in range(12)]
+        rng.shuffle(chars)
+        return "".join(chars)
+
+    @staticmethod
+    def _payment_details(fake: Any, rng: random.Random, method: str) -> Dict[str, Any]:
+        payment: Dict[str, Any] = {}
+        if method == "Bank Transfer":
+            payment.update(bank_name=fake.company(), account_name=fake.name(), account_number=fake.numerify("##########"))
+        elif method == "Credit Card":
+            expiration = f"{rng.randint(1, 12):02d}/{EXPIRY_REFERENCE_YEAR + rng.randint(1, 4)}"
+            payment.update(credit_card_number=fake.numerify("####-####-####-####"), cvv=fake.numerify("###"),
+                           expiration_date=expiration, card_holder_name=fake.name())
+        elif method == "Buy Now Pay Later":
+            payment.update(monthly_installments=str(rng.choice((3, 6, 9, 12))))
+        elif method == "Gift Card":
+            payment.update(gift_card_number=fake.bothify("????####????####").upper(), validation_code=fake.numerify("####"))
+        return payment
@@ -0,0 +1,190 @@
+import argparse
+import os
+import re
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from src.utils.artifacts import TestArtifacts
+from src.utils.config import Config
+from src.utils.step_timing import add_step_listener, remove_step_listener
+
+TRACE_MODES = ("off", "on-failure", "always")
+
+
+@dataclass
+class StepScreenshot:
+    """JPEG of the page right after a page-object step, kept in memory until the test outcome is known."""
+    step: str
+    taken_at: float
+    jpeg: bytes
+
+
+class FailureTracer:
+    """
+    Playwright tracing that only costs disk I/O when it is needed.
+
+    "on-failure": every context is traced (one chunk per test, held by the Playwright driver) and, with
+    `step_screenshots`, a screenshot is taken after every outermost page-object step into a bounded
+    in-memory ring. When the test fails (or is marked flaky) the trace chunk and the ring are written
+    and returned for Allure; otherwise the chunk is discarded and the ring cleared.
+    "always": traces of every test are written (no ring; the trace has its own screencast).
+    The time spent in tracing calls is accumulated per test to quantify the overhead.
+
+    Only the screenshots live in the ring. The trace stays one chunk per test, buffered by the driver:
+    it is bounded by the length of the test, not of the run, because `finish` stops it after every test.
+    Per-step trace chunks would need `stop_chunk(path=...)`, which writes a zip for every step and
+    would bring back the disk I/O this class avoids for passing tests.
+    """
+
+    def __init__(self, mode: str = Config.TRACE_MODE, ring_size: int = Config.TRACE_RING_SIZE,
+                 directory: str = Config.TRACE_DIR, step_screenshots: bool = Config.TRACE_STEP_SCREENSHOTS):
+        assert mode in TRACE_MODES, f"TRACE_MODE must be one of {TRACE_MODES}, got {mode!r}"
+        self.mode = mode
+        self.directory = directory
+        self.ring: Deque[StepScreenshot] = deque(maxlen=ring_size)
+        self.stats = {"tests": 0, "kept": 0, "dropped": 0, "screenshots": 0, "overhead_ms": 0.0, "bytes_written": 0}
+        self._traced: List[Any] = []
+        if mode == "on-failure" and step_screenshots:
+            add_step_listener(self.on_step)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def attach(self, context: Any, test: str) -> None:
+        """Starts tracing a context created for `test`."""
+        if not self.enabled:
+            return
+        start = time.perf_counter()
+        context.tracing.start(title=test, screenshots=True, snapshots=True, sources=False)
+        self._traced.append(context)
+        self.stats["overhead_ms"] += (time.perf_counter() - start) * 1000
+
+    def on_step(self, name: str, kind: str, owner: Any) -> None:
+        page = getattr(owner, "page", None)
+        if kind != "page" or page is None or not self._traced:
+            return
+        start = time.perf_counter()
+        try:
+            jpeg = page.screenshot(type="jpeg", quality=Config.TRACE_SCREENSHOT_QUALITY, scale="css", timeout=2000)
+        except Exception:
+            # Page closed or navigating: a missing frame is better than a failing step
+            return
+        finally:
+            self.stats["overhead_ms"] += (time.perf_counter() - start) * 1000
+        self.ring.append(StepScreenshot(name, time.time(), jpeg))
+        self.stats["screenshots"] += 1
+
+    def finish(self, test: str, keep: bool, artifacts: Optional[TestArtifacts] = None) -> List[str]:
+        """
+        Stops tracing the test's contexts. Returns the written files (traces, ring screenshots):
+        all of them in "always" mode, and in "on-failure" mode only if `keep`.
+        With `artifacts`, ring screenshots go to the artifact pipeline instead of being written here.
+        """
+        if not self.enabled:
+            return []
+        start = time.perf_counter()
+        keep = keep or self.mode == "always"
+        written: List[str] = []
+        base = os.path.join(self.directory, re.sub(r"[^\w.-]+", "_", test).strip("_")[:150])
+
+        for index, context in enumerate(self._traced):
+            try:
+                if keep:
+                    path = f"{base}-trace{index or ''}.zip"
+                    context.tracing.stop(path=path)
+                    written.append(path)
+                else:
+                    context.tracing.stop()
+            except Exception:
+                # Context closed by the test itself: its trace is gone
+                continue
+        if keep and artifacts is not None:
+            for shot in self.ring:
+                artifacts.image(shot.step, shot.jpeg)
+        elif keep:
+            for index, shot in enumerate(self.ring):
+                step = re.sub(r"[^\w.]+", "_", shot.step)
+                path = f"{base}-step{index:02d}-{step}.jpg"
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                with open(path, "wb") as handle:
+                    handle.write(shot.jpeg)
+                written.append(path)
+
+        self._traced.clear()
+        self.ring.clear()
+        self.stats["tests"] += 1
+        self.stats["kept" if keep else "dropped"] += 1
+        self.stats["bytes_written"] += sum(os.path.getsize(path) for path in written if os.path.exists(path))
+        self.stats["overhead_ms"] += (time.perf_counter() - start) * 1000
+        return written
+
+    def close(self) -> None:
+        remove_step_listener(self.on_step)
+
+    def summary(self) -> str:
+        tests = self.stats["tests"] or 1
+        return (
+            f"mode {self.mode}: {self.stats['kept']} test(s) kept, {self.stats['dropped']} dropped, "
+            f"{self.stats['overhead_ms'] / tests:.0f} ms tracing overhead per test, "
+            f"{self.stats['bytes_written'] / 1024:.0f} KB written"
+        )
+
+
+def _workload(page: Any) -> None:
+    """A few page-object steps on a static page, standing in for a short UI test."""
+    from src.pages.base_page import BasePage
+
+    page.set_content(
+        "<button data-test='go' onclick=\"document.body.insertAdjacentHTML('beforeend', '<p>clicked</p>')\">Go</button>"
+        "<input data-test='q'>" + "<div class='card'>product</div>" * 50
+    )
+    page_object = BasePage(page)
+    for index in range(5):
+        page_object.fill_input("[data-test='q']", f"query {index}")
+        page_object.click_element("[data-test='go']")
+
+
+def benchmark(iterations: int = 10) -> Dict[str, Dict[str, float]]:
+    """Wall time per test of the same workload with tracing off, on-failure (passing tests) and always."""
+    import tempfile
+
+    from playwright.sync_api import sync_playwright
+
+    results: Dict[str, Dict[str, float]] = {}
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        for mode in TRACE_MODES:
+            directory = tempfile.mkdtemp(prefix=f"trace-{mode}-")
+            tracer = FailureTracer(mode, directory=directory)
+            timings: List[float] = []
+            for iteration in range(iterations):
+                start = time.perf_counter()
+                context = browser.new_context()
+                tracer.attach(context, f"bench-{iteration}")
+                _workload(context.new_page())
+                tracer.finish(f"bench-{iteration}", keep=False)
+                context.close()
+                timings.append((time.perf_counter() - start) * 1000)
+            tracer.close()
+            results[mode] = {
+                "median_ms": statistics.median(timings),
+                "kb_written": tracer.stats["bytes_written"] / 1024,
+            }
+        browser.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Overhead of failure-only tracing vs. tracing off / always on")
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    measured = benchmark(args.iterations)
+    for trace_mode, result in measured.items():
+        overhead = result["median_ms"] - measured["off"]["median_ms"]
+        print(f"{trace_mode:>10}: median {result['median_ms']:7.1f} ms/test  (+{overhead:6.1f} ms)  "
+              f"{result['kb_written']:8.0f} KB written")
@@ -0,0 +1,74 @@
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from playwright.sync_api import sync_playwright
+
+from src.pages.login_page import LoginPage
+from src.utils.step_timing import rpc_counter
+
+# A static copy of the registration form (same data-test hooks), so the benchmark needs no backend
+FORM_HTML = """
+<form>
+  <input data-test="first-name"> <input data-test="last-name"> <input data-test="dob" type="date">
+  <input data-test="street"> <input data-test="postal_code"> <input data-test="city">
+  <input data-test="state"> <input data-test="phone"> <input data-test="email" type="email">
+  <input data-test="password" type="password">
+</form>
+<script>
+  window.events = 0;
+  document.addEventListener('input', () => window.events++, true);
+</script>
+"""
+
+SAMPLE_USER = {
+    "first_name": "Ada", "last_name": "Lovelace", "dob": "1990-12-10",
+    "address": {"street": "1 Main St", "postal_code": "12345", "city": "Springfield", "state": "IL"},
+    "phone": "5551234567", "email": "ada@example.com", "password": "SuperSecure@123",
+}
+
+
+def _measure(page_object: LoginPage, fill: Callable[[], None], iterations: int) -> Dict[str, float]:
+    timings: List[float] = []
+    rpcs: List[int] = []
+    for _ in range(iterations):
+        page_object.page.set_content(FORM_HTML)
+        rpcs_before = rpc_counter.count
+        start = time.perf_counter()
+        fill()
+        timings.append((time.perf_counter() - start) * 1000)
+        rpcs.append(rpc_counter.count - rpcs_before)
+    return {"median_ms": statistics.median(timings), "min_ms": min(timings), "rpcs": statistics.median(rpcs)}
+
+
+def run(iterations: int = 20, headed: bool = False, slow_mo: float = 0) -> Dict[str, Dict[str, float]]:
+    """Fills the registration form field by field and in one batch, and returns timings and RPC counts."""
+    rpc_counter.install()
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=not headed, slow_mo=slow_mo)
+        page_object = LoginPage(browser.new_page())
+        values = LoginPage.form_values(LoginPage.REGISTRATION_FORM, SAMPLE_USER)
+
+        def per_field() -> None:
+            for selector, value in values.items():
+                page_object.fill_input(selector, value)
+
+        def batched() -> None:
+            skipped = page_object.fill_form(values)
+            assert not skipped, f"batch fill fell back for {skipped}"
+
+        results = {"per-field": _measure(page_object, per_field, iterations), "fill_form": _measure(page_object, batched, iterations)}
+        browser.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-field fill_input vs. batched fill_form on the registration form")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--slowmo", type=float, default=0, help="Playwright slow_mo in ms, like SLOWMO for a watched pytest run")
+    args = parser.parse_args()
+
+    for name, result in run(args.iterations, args.headed, args.slowmo).items():
+        print(f"{name:>10}: median {result['median_ms']:7.1f} ms  min {result['min_ms']:7.1f} ms  {result['rpcs']:.0f} rpcs")
@@ -0,0 +1,190 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from playwright.sync_api import BrowserContext, Route
+
+from src.utils.config import Config
+from src.utils.file_lock import read_json, write_json_atomic
+
+# Values that change on every run and must not take part in request matching
+VOLATILE_QUERY_PARAMS = {"_", "t", "ts", "timestamp", "cache_bust"}
+VOLATILE_BODY_FIELDS = {
+    "email", "password", "first_name", "last_name", "dob", "phone", "address",
+    "street", "city", "state", "country", "postal_code", "postcode",
+}
+# The recorded body is stored decoded, so these headers would no longer match it
+STRIPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+TEXT_MIME_PATTERN = re.compile(r"^(text/|application/(json|javascript|xml))|\+json|\+xml")
+
+
+class HarRecordingMissing(Exception):
+    """Raised in replay mode when a test has no HAR recording yet."""
+
+
+def request_key(method: str, url: str, body: Optional[str]) -> str:
+    """
+    Matching key of a request: method, origin + path, sorted non-volatile query parameters and a
+    hash of the JSON body with volatile fields (random emails, passwords, ...) blanked out.
+    """
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in VOLATILE_QUERY_PARAMS)
+    key = f"{method.upper()} {parts.scheme}://{parts.netloc}{parts.path}?{urlencode(query)}"
+
+    if body:
+        try:
+            body = json.dumps(_blank_volatile(json.loads(body)), sort_keys=True)
+        except ValueError:
+            pass
+        key += "#" + hashlib.sha1(body.encode()).hexdigest()[:12]
+    return key
+
+
+def _blank_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: "*" if k in VOLATILE_BODY_FIELDS else _blank_volatile(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_blank_volatile(item) for item in value]
+    return value
+
+
+class HarTape:
+    """
+    Per-test HAR file shared by the browser context(s) and the ApiClient of a test.
+    In "record" mode live traffic is captured and saved at teardown, in "replay" mode the
+    recorded responses are served locally and nothing reaches the network.
+    Repeated identical requests are replayed in recorded order (the last one repeats).
+    """
+
+    def __init__(self, path: str, mode: str):
+        self.path = path
+        self.mode = mode
+        self.missing: List[str] = []
+        self.recorded_at: Optional[float] = None
+        self._entries: List[Dict[str, Any]] = []
+        self._index: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            self._load()
+
+    @classmethod
+    def for_test(cls, nodeid: str, mode: str, directory: str = Config.HAR_DIR) -> "HarTape":
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid).strip("_")
+        return cls(os.path.join(directory, f"{name}.har"), mode)
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the recording is older than HAR_MAX_AGE_DAYS and should be re-recorded."""
+        if self.recorded_at is None:
+            return False
+        return time.time() - self.recorded_at > Config.HAR_MAX_AGE_DAYS * 86400
+
+    def attach(self, context: BrowserContext) -> None:
+        """Routes every request of the browser context through the tape."""
+        context.route("**/*", self._handle_route)
+
+    def record(self, method: str, url: str, request_body: Optional[str], status: int, status_text: str,
+               headers: Dict[str, str], body: bytes, elapsed_ms: float) -> None:
+        mime_type = headers.get("content-type", "")
+        content: Dict[str, Any] = {"size": len(body), "mimeType": mime_type}
+        if TEXT_MIME_PATTERN.search(mime_type):
+            content["text"] = body.decode("utf-8", errors="replace")
+        else:
+            content["text"] = base64.b64encode(body).decode()
+            content["encoding"] = "base64"
+
+        entry = {
+            "startedDateTime": datetime.now(timezone.utc).isoformat(),
+            "time": round(elapsed_ms, 3),
+            "request": {
+                "method": method,
+                "url": url,
+                "headers": [],
+                "postData": {"mimeType": "application/json", "text": request_body} if request_body else None,
+            },
+            "response": {
+                "status": status,
+                "statusText": status_text,
+                "headers": [{"name": name, "value": value} for name, value in headers.items()],
+                "content": content,
+            },
+            "_key": request_key(method, url, request_body),
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+    def lookup(self, method: str, url: str, request_body: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Returns the recorded response (status, headers dict, body bytes) or None if unrecorded."""
+        key = request_key(method, url, request_body)
+        with self._lock:
+            candidates = self._index.get(key)
+            if not candidates:
+                self.missing.append(key)
+                return None
+            entry = candidates[min(self._cursor[key], len(candidates) - 1)]
+            self._cursor[key] += 1
+
+        response = entry["response"]
+        content = response["content"]
+        body = content.get("text", "")
+        return {
+            "status": response["status"],
+            "headers": {
+                header["name"]: header["value"] for header in response["headers"]
+                if header["name"].lower() not in STRIPPED_RESPONSE_HEADERS
+            },
+            "body": base64.b64decode(body) if content.get("encoding") == "base64" else body.encode(),
+        }
+
+    def save(self) -> None:
+        with self._lock:
+            entries = list(self._entries)
+        write_json_atomic(self.path, {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "pst-playwright-framework", "version": "1.0"},
+                "pages": [],
+                "entries": entries,
+                "_recordedAt": time.time(),
+            }
+        })
+
+    def _load(self) -> None:
+        har = read_json(self.path)
+        if har is None:
+            raise HarRecordingMissing(
+                f"No HAR recording at {self.path}. Re-run this test with NETWORK_MODE=record first."
+            )
+        self.recorded_at = har["log"].get("_recordedAt")
+        for entry in har["log"]["entries"]:
+            post_data = entry["request"].get("postData") or {}
+            # Keys are recomputed so changes to the volatile field lists apply to old recordings
+            key = request_key(entry["request"]["method"], entry["request"]["url"], post_data.get("text"))
+            self._index[key].append(entry)
+
+    def _handle_route(self, route: Route) -> None:
+        request = route.request
+        if self.mode == "replay":
+            recorded = self.lookup(request.method, request.url, request.post_data)
+            if recorded is None:
+                route.abort()
+                return
+            route.fulfill(status=recorded["status"], headers=recorded["headers"], body=recorded["body"])
+            return
+
+        start = time.perf_counter()
+        response = route.fetch()
+        body = response.body()
+        self.record(request.method, request.url, request.post_data, response.status, response.status_text,
+                    response.headers, body, (time.perf_counter() - start) * 1000)
+        route.fulfill(response=response, body=body)
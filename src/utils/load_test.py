@@ -0,0 +1,473 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+from playwright.async_api import Playwright, async_playwright
+
+from src.api.async_api_client import AsyncApiClient, RequestTiming
+from src.utils.config import Config
+from src.utils.data_factory import DataFactory
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of latencies: values are kept in microseconds in log-linear buckets
+    (2^sub_bucket_bits linear sub-buckets per power of two), so memory stays constant
+    and every percentile is exact to within 1 / 2^(sub_bucket_bits - 1).
+    """
+
+    def __init__(self, sub_bucket_bits: int = 8):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.sum_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def record(self, elapsed_ms: float) -> None:
+        value = max(int(elapsed_ms * 1000), 0)
+        shift = max(value.bit_length() - self.sub_bucket_bits, 0)
+        bucket = (value >> shift) << shift
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+        self.sum_us += value
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+        self.max_us = max(self.max_us, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total += other.total
+        self.sum_us += other.sum_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, percent: float) -> float:
+        """Latency in ms below which `percent` % of the recorded values fall (upper bound of the bucket)."""
+        if not self.total:
+            return 0.0
+        rank = max(1, int(round(percent / 100 * self.total)))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                width = 1 << max(bucket.bit_length() - self.sub_bucket_bits, 0)
+                return min(bucket + width - 1, self.max_us) / 1000
+        return self.max_us / 1000
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.total,
+            "min_ms": (self.min_us or 0) / 1000,
+            "mean_ms": self.sum_us / self.total / 1000 if self.total else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_us / 1000,
+        }
+
+
+class LatencyRecorder:
+    """Histograms and error counts per key ("api POST /users/login", "step shop.add_to_cart", ...), thread-safe."""
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, elapsed_ms: float, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.histograms.setdefault(key, LatencyHistogram()).record(elapsed_ms)
+            if error is not None:
+                errors = self.errors.setdefault(key, {})
+                errors[error] = errors.get(error, 0) + 1
+
+    def record_timings(self, timings: Sequence[RequestTiming]) -> None:
+        """Folds the per-request timings of an (Async)ApiClient into per-endpoint histograms."""
+        for timing in timings:
+            self.record(f"api {timing.method} {timing.path}", timing.elapsed_ms,
+                        None if timing.status < 400 else f"HTTP {timing.status}")
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as exception:
+            error = type(exception).__name__
+            raise
+        finally:
+            self.record(f"step {name}", (time.perf_counter() - start) * 1000, error)
+
+
+@dataclass
+class Scenario:
+    """
+    A weighted user flow. API scenarios are coroutines `(client, data, recorder)` run on the event loop,
+    UI scenarios are functions `(context, data, recorder, api)` run on a capped pool of browser contexts;
+    `api(action)` runs `action(client)` with an AsyncApiClient on the load test's event loop, for setup.
+    """
+    name: str
+    weight: float
+    run: Callable
+    kind: str = "api"
+
+
+# API scenarios
+
+async def next_user(data: DataFactory) -> Dict[str, Any]:
+    """A registration payload without blocking the event loop (the factory may wait for its prefill thread)."""
+    return await asyncio.get_running_loop().run_in_executor(None, data.user)
+
+
+async def browse(client: AsyncApiClient, data: DataFactory, recorder: LatencyRecorder) -> None:
+    with recorder.step("browse.first_page"):
+        listing = await client.get_products(1)
+    with recorder.step("browse.next_page"):
+        await client.get_products(random.randint(2, max(2, listing.get("last_page", 2))))
+
+
+async def register_and_login(client: AsyncApiClient, data: DataFactory, recorder: LatencyRecorder) -> None:
+    user = await next_user(data)
+    with recorder.step("register_and_login.register"):
+        await client.register_user(user)
+    with recorder.step("register_and_login.login"):
+        await client.login(user["email"], user["password"])
+
+
+async def shop(client: AsyncApiClient, data: DataFactory, recorder: LatencyRecorder) -> None:
+    user = await next_user(data)
+    with recorder.step("shop.register"):
+        await client.register_user(user)
+    with recorder.step("shop.login"):
+        await client.login(user["email"], user["password"])
+    with recorder.step("shop.list_products"):
+        products = (await client.get_products(1))["data"]
+    with recorder.step("shop.add_to_cart"):
+        await client.add_to_cart(random.choice(products)["id"])
+
+
+# UI scenarios (page objects are imported lazily: they are only needed when UI users are configured)
+
+ApiCall = Callable[[Callable[[AsyncApiClient], Awaitable[Any]]], Any]
+
+
+def ui_browse(context: Any, data: DataFactory, recorder: LatencyRecorder, api: ApiCall) -> None:
+    from src.pages.home_page import HomePage
+
+    home_page = HomePage(context.new_page())
+    with recorder.step("ui_browse.home"):
+        home_page.navigate_home()
+    with recorder.step("ui_browse.read_grid"):
+        assert home_page.get_grid_products(), "The product grid is empty"
+
+
+def ui_checkout(context: Any, data: DataFactory, recorder: LatencyRecorder, api: ApiCall) -> None:
+    from src.pages.checkout_page import CheckoutPage
+    from src.pages.home_page import HomePage
+    from src.utils.storage_state_cache import AUTH_TOKEN_KEY
+
+    async def register_and_login(client: AsyncApiClient) -> str:
+        await client.register_user(user)
+        return await client.login(user["email"], user["password"])
+
+    user = data.user()
+    with recorder.step("ui_checkout.api_setup"):
+        token = api(register_and_login)
+
+    page = context.new_page()
+    home_page, checkout_page = HomePage(page), CheckoutPage(page)
+    with recorder.step("ui_checkout.home"):
+        home_page.navigate_home()
+        page.evaluate("([key, token]) => localStorage.setItem(key, token)", [AUTH_TOKEN_KEY, token])
+    with recorder.step("ui_checkout.add_to_cart"):
+        with home_page.until_ready("open product", selectors=("[data-test='add-to-cart']",)):
+            page.locator(home_page.PRODUCT_CARD).first.click()
+        page.locator("[data-test='add-to-cart']").click()
+        page.locator("[data-test='cart-quantity']").wait_for(state="visible")
+    with recorder.step("ui_checkout.cart"):
+        checkout_page.navigate_cart()
+        checkout_page.complete_step_1()
+    with recorder.step("ui_checkout.billing"):
+        checkout_page.complete_step_2(**data.record("billing"))
+    with recorder.step("ui_checkout.payment"):
+        checkout_page.complete_step_3()
+        checkout_page.confirm_order()
+    with recorder.step("ui_checkout.confirmation"):
+        assert checkout_page.validate_success(), "The order was not confirmed"
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "browse": Scenario("browse", 6, browse),
+    "register_and_login": Scenario("register_and_login", 2, register_and_login),
+    "shop": Scenario("shop", 2, shop),
+    "ui_browse": Scenario("ui_browse", 0, ui_browse, kind="ui"),
+    "ui_checkout": Scenario("ui_checkout", 0, ui_checkout, kind="ui"),
+}
+
+
+class _UiContexts:
+    """
+    Capped pool for UI virtual users: one thread per slot, each with its own sync Playwright and browser
+    (the sync API is bound to its thread), and a fresh context per iteration.
+    """
+
+    def __init__(self, slots: int, api: ApiCall, headless: bool = True):
+        self.slots = max(slots, 1)
+        self.api = api
+        self.headless = headless
+        self.executor = ThreadPoolExecutor(max_workers=self.slots, thread_name_prefix="ui-user")
+        self._local = threading.local()
+        # Thread ident -> (playwright, browser) started on that thread
+        self._drivers: Dict[int, Tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    def run(self, scenario: Scenario, data: DataFactory, recorder: LatencyRecorder) -> None:
+        browser = getattr(self._local, "browser", None)
+        if browser is None:
+            from playwright.sync_api import sync_playwright
+
+            self._local.playwright = sync_playwright().start()
+            browser = self._local.browser = self._local.playwright.chromium.launch(headless=self.headless)
+            with self._lock:
+                self._drivers[threading.get_ident()] = (self._local.playwright, browser)
+        context = browser.new_context(base_url=Config.BASE_UI_URL)
+        try:
+            scenario.run(context, data, recorder, self.api)
+        finally:
+            context.close()
+
+    def close(self, timeout: float = 60) -> None:
+        # Playwright objects must be closed on the thread that created them. Every task waits at the
+        # barrier until all `slots` tasks run, so each one is on a different thread of the pool
+        barrier = threading.Barrier(self.slots)
+
+        def stop_own() -> None:
+            barrier.wait(timeout)
+            with self._lock:
+                driver = self._drivers.pop(threading.get_ident(), None)
+            if driver is not None:
+                playwright, browser = driver
+                browser.close()
+                playwright.stop()
+
+        try:
+            for future in [self.executor.submit(stop_own) for _ in range(self.slots)]:
+                future.result()
+        finally:
+            self.executor.shutdown()
+        assert not self._drivers, f"{len(self._drivers)} UI user thread(s) kept their browser"
+
+
+class LoadTest:
+    """
+    Runs weighted scenarios as virtual users and summarizes latencies and throughput.
+
+    Profiles:
+      - "ramp" (closed model): `users` virtual users start evenly over `ramp_up` seconds and loop
+        (scenario, think time) until `duration` is over.
+      - "arrival" (open model): iterations start at `rate` per second (reached linearly over `ramp_up`),
+        independent of response times; at most `users` run at once, further arrivals are dropped.
+
+    A failed iteration counts as an error of its scenario; the first traceback of each
+    (scenario, exception type) is printed to stderr so a failing flow can be diagnosed.
+    """
+
+    def __init__(self, scenarios: Sequence[Scenario], profile: str = "ramp", users: int = 10, duration: float = 30,
+                 ramp_up: float = 5, rate: float = 10, think_time: float = 0.5, ui_contexts: int = 2,
+                 base_url: str = Config.BASE_API_URL, headless: bool = True):
+        self.scenarios = [scenario for scenario in scenarios if scenario.weight > 0]
+        assert self.scenarios, "At least one scenario needs a positive weight"
+        assert profile in ("ramp", "arrival"), f"Unknown load profile {profile!r}"
+        self.profile = profile
+        self.users = users
+        self.duration = duration
+        self.ramp_up = min(ramp_up, duration)
+        self.rate = rate
+        self.think_time = think_time
+        self.base_url = base_url
+        self.recorder = LatencyRecorder()
+        self.data = DataFactory()
+        self.iterations: Dict[str, int] = {scenario.name: 0 for scenario in self.scenarios}
+        self.dropped = 0
+        self._ui = _UiContexts(ui_contexts, self._api, headless) if any(s.kind == "ui" for s in self.scenarios) else None
+        self._playwright: Optional[Playwright] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reported: set = set()
+        self._started = 0.0
+        self.elapsed = 0.0
+
+    def run(self) -> Dict[str, Any]:
+        try:
+            asyncio.run(self._main())
+        finally:
+            if self._ui is not None:
+                self._ui.close()
+            self.data.close()
+        return self.summary()
+
+    async def _main(self) -> None:
+        async with async_playwright() as playwright:
+            self._playwright = playwright
+            self._loop = asyncio.get_running_loop()
+            self._started = time.perf_counter()
+            if self.profile == "ramp":
+                await asyncio.gather(*(self._virtual_user(index) for index in range(self.users)))
+            else:
+                await self._arrivals()
+            self.elapsed = time.perf_counter() - self._started
+
+    async def _virtual_user(self, index: int) -> None:
+        await asyncio.sleep(self.ramp_up * index / self.users)
+        deadline = self._started + self.duration
+        while time.perf_counter() < deadline:
+            await self._iteration(self._pick())
+            await asyncio.sleep(random.uniform(0, self.think_time))
+
+    async def _arrivals(self) -> None:
+        in_flight: set = set()
+        deadline = self._started + self.duration
+        while (now := time.perf_counter()) < deadline:
+            elapsed = now - self._started
+            # Ramp linearly, starting at a tenth of the target so the first gaps are not seconds long
+            current_rate = self.rate * max(0.1, min(1.0, elapsed / self.ramp_up)) if self.ramp_up else self.rate
+            if len(in_flight) >= self.users:
+                self.dropped += 1
+            else:
+                task = asyncio.ensure_future(self._iteration(self._pick()))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            # Exponential inter-arrival times: a Poisson process at the current rate
+            await asyncio.sleep(min(random.expovariate(current_rate), max(deadline - time.perf_counter(), 0)))
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    def _pick(self) -> Scenario:
+        return random.choices(self.scenarios, weights=[scenario.weight for scenario in self.scenarios])[0]
+
+    async def _with_client(self, action: Callable[[AsyncApiClient], Awaitable[Any]]) -> Any:
+        # One request context per iteration: like a new user with its own connections
+        client = await AsyncApiClient.create(self._playwright, self.base_url)
+        try:
+            return await action(client)
+        finally:
+            self.recorder.record_timings(client.timings)
+            await client.dispose()
+
+    def _api(self, action: Callable[[AsyncApiClient], Awaitable[Any]]) -> Any:
+        """For UI user threads: API calls share the load test's loop and Playwright instead of starting their own."""
+        return asyncio.run_coroutine_threadsafe(self._with_client(action), self._loop).result()
+
+    async def _iteration(self, scenario: Scenario) -> None:
+        start = time.perf_counter()
+        error = None
+        try:
+            if scenario.kind == "ui":
+                await asyncio.get_running_loop().run_in_executor(
+                    self._ui.executor, self._ui.run, scenario, self.data, self.recorder
+                )
+            else:
+                await self._with_client(lambda client: scenario.run(client, self.data, self.recorder))
+        except Exception as exception:
+            error = type(exception).__name__
+            if (scenario.name, error) not in self._reported:
+                self._reported.add((scenario.name, error))
+                print(f"Scenario {scenario.name} failed with {error} (further {error}s are only counted):\n"
+                      + "".join(traceback.format_exception(type(exception), exception, exception.__traceback__)), file=sys.stderr, flush=True)
+        self.iterations[scenario.name] += 1
+        self.recorder.record(f"scenario {scenario.name}", (time.perf_counter() - start) * 1000, error)
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = self.elapsed or 1e-9
+        return {
+            "profile": self.profile,
+            "users": self.users,
+            "rate": self.rate if self.profile == "arrival" else None,
+            "duration_s": round(elapsed, 3),
+            "base_url": self.base_url,
+            "iterations": sum(self.iterations.values()),
+            "throughput_per_s": sum(self.iterations.values()) / elapsed,
+            "dropped_arrivals": self.dropped,
+            "latencies": {
+                key: dict(histogram.to_dict(), throughput_per_s=histogram.total / elapsed,
+                          errors=self.recorder.errors.get(key, {}))
+                for key, histogram in sorted(self.recorder.histograms.items())
+            },
+        }
+
+
+def write_summary(summary: Dict[str, Any], directory: str = Config.LOAD_RESULTS_DIR) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"load-summary-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(summary, handle, indent=2)
+    return path
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    lines = [
+        f"{summary['profile']} profile, {summary['iterations']} iterations in {summary['duration_s']:.1f}s "
+        f"({summary['throughput_per_s']:.1f}/s), {summary['dropped_arrivals']} dropped arrivals",
+        f"{'key':<45} {'count':>7} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'/s':>7}",
+    ]
+    for key, stats in summary["latencies"].items():
+        lines.append(
+            f"{key:<45} {stats['count']:>7} {sum(stats['errors'].values()):>5} {stats['p50_ms']:>9.1f} "
+            f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f} {stats['throughput_per_s']:>7.1f}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Virtual-user load test over the framework's API and UI flows")
+    parser.add_argument("--profile", choices=("ramp", "arrival"), default="ramp")
+    parser.add_argument("--users", type=int, default=10, help="virtual users (ramp) or max in-flight iterations (arrival)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--ramp-up", type=float, default=5, help="seconds until all users / the full rate are reached")
+    parser.add_argument("--rate", type=float, default=10, help="iterations per second (arrival profile)")
+    parser.add_argument("--think-time", type=float, default=0.5, help="max random pause between iterations (ramp profile)")
+    parser.add_argument("--scenario", action="append", default=[], metavar="NAME=WEIGHT",
+                        help=f"override a scenario weight; available: {', '.join(SCENARIOS)}")
+    parser.add_argument("--ui-contexts", type=int, default=2, help="max concurrent browser contexts for UI scenarios")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--local-server", action="store_true", help="run against an in-process LocalPstServer")
+    args = parser.parse_args()
+
+    weights = {name: scenario.weight for name, scenario in SCENARIOS.items()}
+    for override in args.scenario:
+        name, _, weight = override.partition("=")
+        assert name in SCENARIOS, f"Unknown scenario {name!r}"
+        weights[name] = float(weight or 1)
+
+    local_server = None
+    base_url = Config.BASE_API_URL
+    if args.local_server:
+        from src.utils.local_server import LocalPstServer
+
+        local_server = LocalPstServer(port=0).start()
+        base_url = local_server.url
+
+    load_test = LoadTest(
+        [Scenario(s.name, weights[s.name], s.run, s.kind) for s in SCENARIOS.values()],
+        profile=args.profile, users=args.users, duration=args.duration, ramp_up=args.ramp_up, rate=args.rate,
+        think_time=args.think_time, ui_contexts=args.ui_contexts, base_url=base_url, headless=not args.headed,
+    )
+    try:
+        result = load_test.run()
+    finally:
+        if local_server is not None:
+            local_server.stop()
+    print(format_summary(result))
+    print(f"Summary written to {write_summary(result)}")
@@ -0,0 +1,355 @@
+import argparse
+import base64
+import bisect
+import hashlib
+import hmac
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.utils.config import Config
+
+CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+JWT_SECRET = b"local-pst-stand-in"
+TOKEN_TTL = 300  # Same lifetime as the real backend
+PAGE_SIZE = 9
+# Fixed creation time, so catalog ids are identical on every run
+CATALOG_TIMESTAMP_MS = 1715000000000
+
+# Category ids are resolved by name through /categories/tree; Hand Tools keeps the real ULID anyway
+CATEGORIES = {
+    "01HXGBFR231WXZZ9CYS3Q1RPYV": ("Hand Tools", ["Pliers", "Hammer", "Hand Saw", "Wrench", "Screwdriver", "Chisels"]),
+    "01HXGBFR231WXZZ9CYS3Q1RPYW": ("Power Tools", ["Grinder", "Sander", "Saw", "Drill"]),
+    "01HXGBFR231WXZZ9CYS3Q1RPYX": ("Other", ["Tool Belt", "Storage Solutions", "Workbench", "Safety Gear"]),
+}
+BRANDS = {
+    "01HXGBFR6Q1RJ5KMS0T8Y4N4WA": "ForgeFlex Tools",
+    "01HXGBFR6Q1RJ5KMS0T8Y4N4WB": "MightyCraft Hardware",
+}
+ADJECTIVES = ["Combination", "Bolt Cutters", "Long Nose", "Slip Joint", "Claw", "Thor", "Sledge", "Adjustable",
+              "Phillips", "Wood", "Cordless", "Belt", "Circular", "Compact", "Heavy Duty", "Precision"]
+
+
+def new_ulid(rng: Optional[random.Random] = None, timestamp_ms: Optional[int] = None) -> str:
+    """ULID-shaped id (48-bit ms timestamp + 80 random bits in Crockford base32), like the real API."""
+    rng = rng or random
+    timestamp_ms = int(time.time() * 1000) if timestamp_ms is None else timestamp_ms
+    value = (timestamp_ms << 80) | rng.getrandbits(80)
+    return "".join(CROCKFORD[(value >> shift) & 31] for shift in range(125, -1, -5))
+
+
+def issue_jwt(user: Dict[str, Any]) -> str:
+    """HS256 JWT with the same claims the real backend issues."""
+    def encode(part: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(part, separators=(",", ":")).encode()).decode().rstrip("=")
+
+    now = int(time.time())
+    header = encode({"alg": "HS256", "typ": "JWT"})
+    payload = encode({
+        "iss": Config.BASE_API_URL + "/users/login", "iat": now, "exp": now + TOKEN_TTL, "nbf": now,
+        "jti": new_ulid(), "sub": user["id"], "prv": "local", "role": "user",
+    })
+    signature = hmac.new(JWT_SECRET, f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{base64.urlsafe_b64encode(signature).decode().rstrip('=')}"
+
+
+class Catalog:
+    """
+    Deterministic in-memory product catalog with indexes for the filters the storefront uses:
+    category, brand, price range (sorted list + bisect) and name tokens for search.
+    """
+
+    def __init__(self, seed: int = 42):
+        rng = random.Random(seed)
+        self.products: Dict[str, Dict[str, Any]] = {}
+        for category_id, (category_name, nouns) in CATEGORIES.items():
+            for noun in nouns:
+                for adjective in rng.sample(ADJECTIVES, 3):
+                    brand_id = rng.choice(list(BRANDS))
+                    product = {
+                        "id": new_ulid(rng, CATALOG_TIMESTAMP_MS),
+                        "name": f"{adjective} {noun}",
+                        "description": f"{adjective} {noun.lower()} for every workshop.",
+                        "price": round(rng.uniform(3, 250), 2),
+                        "is_location_offer": rng.random() < 0.1,
+                        "is_rental": False,
+                        "in_stock": rng.random() > 0.15,
+                        "category": {"id": category_id, "name": category_name},
+                        "brand": {"id": brand_id, "name": BRANDS[brand_id]},
+                        "product_image": {"file_name": f"{noun.lower().replace(' ', '_')}.avif"},
+                    }
+                    self.products[product["id"]] = product
+
+        self.by_category: Dict[str, set] = defaultdict(set)
+        self.by_brand: Dict[str, set] = defaultdict(set)
+        self.by_token: Dict[str, set] = defaultdict(set)
+        for product in self.products.values():
+            self.by_category[product["category"]["id"]].add(product["id"])
+            self.by_brand[product["brand"]["id"]].add(product["id"])
+            for token in re.findall(r"\w+", product["name"].lower()):
+                self.by_token[token].add(product["id"])
+        self.by_price: List[Tuple[float, str]] = sorted((p["price"], p["id"]) for p in self.products.values())
+
+    def query(self, params: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        """Applies by_category / by_brand / between=price,min,max / q filters and sort=field,dir."""
+        candidates: Optional[set] = None
+
+        def narrow(ids: set) -> None:
+            nonlocal candidates
+            candidates = ids if candidates is None else candidates & ids
+
+        for key, index in (("by_category", self.by_category), ("by_brand", self.by_brand)):
+            if params.get(key):
+                narrow(set().union(*(index[value] for value in params[key][0].split(","))))
+        if params.get("between"):
+            _, low, high = params["between"][0].split(",")
+            start = bisect.bisect_left(self.by_price, (float(low), ""))
+            end = bisect.bisect_right(self.by_price, (float(high), "~"))
+            narrow({product_id for _, product_id in self.by_price[start:end]})
+        if params.get("q"):
+            for token in re.findall(r"\w+", params["q"][0].lower()):
+                # Prefix match, so "plier" finds "Pliers"
+                narrow(set().union(*(ids for word, ids in self.by_token.items() if word.startswith(token))))
+
+        products = [self.products[i] for i in candidates] if candidates is not None else list(self.products.values())
+        field, _, direction = (params.get("sort", ["name,asc"])[0]).partition(",")
+        return sorted(products, key=lambda p: p.get(field, p["name"]), reverse=direction == "desc")
+
+
+def paginate(items: List[Dict[str, Any]], page: int) -> Dict[str, Any]:
+    """Laravel-style paginator envelope, as returned by the real /products endpoint."""
+    last_page = max(1, -(-len(items) // PAGE_SIZE))
+    start = (page - 1) * PAGE_SIZE
+    data = items[start:start + PAGE_SIZE]
+    return {
+        "current_page": page, "data": data, "from": start + 1 if data else None, "last_page": last_page,
+        "per_page": PAGE_SIZE, "to": start + len(data) if data else None, "total": len(items),
+    }
+
+
+class LocalPstServer:
+    """
+    In-process stand-in for the PST API: /users/register, /users/login, /users/me, /carts,
+    /products (paged + filters), /products/search, /categories and /brands.
+    Runs a threaded HTTP/1.1 server (keep-alive) so hundreds of concurrent clients are fine.
+
+    Only the API is emulated, not the Angular storefront: serving it would mean vendoring the built app.
+    It covers API tests, the load mode and API benchmarks; UI and hybrid tests keep the real
+    BASE_UI_URL and backend. A cart created with a bearer token belongs to that user: only their
+    token can read or change it (403 otherwise), while carts created anonymously stay open to all.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = Config.LOCAL_SERVER_PORT):
+        self.catalog = Catalog()
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.carts: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.routes: List[Tuple[str, re.Pattern, Callable]] = [
+            ("POST", re.compile(r"^/users/register$"), self.register),
+            ("POST", re.compile(r"^/users/login$"), self.login),
+            ("GET", re.compile(r"^/users/me$"), self.me),
+            ("POST", re.compile(r"^/carts$"), self.create_cart),
+            ("POST", re.compile(r"^/carts/(?P<cart_id>\w+)$"), self.add_cart_item),
+            ("GET", re.compile(r"^/carts/(?P<cart_id>\w+)$"), self.get_cart),
+            ("GET", re.compile(r"^/products$"), self.list_products),
+            ("GET", re.compile(r"^/products/search$"), self.list_products),
+            ("GET", re.compile(r"^/products/(?P<product_id>\w+)$"), self.get_product),
+            ("GET", re.compile(r"^/categories(/tree)?$"), self.list_categories),
+            ("GET", re.compile(r"^/brands$"), self.list_brands),
+        ]
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.dispatch(self)
+
+            def do_POST(self):
+                server.dispatch(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.request_queue_size = 1024
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalPstServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="local-pst-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def dispatch(self, handler: BaseHTTPRequestHandler) -> None:
+        parts = urlsplit(handler.path)
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw_body = handler.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+        except ValueError:
+            body = {}
+
+        status, payload = 404, {"message": "Resource not found"}
+        for method, pattern, view in self.routes:
+            match = pattern.match(parts.path)
+            if method == handler.command and match:
+                request = {"body": body, "query": parse_qs(parts.query), "headers": handler.headers, **match.groupdict()}
+                try:
+                    status, payload = view(request)
+                except (AttributeError, IndexError, KeyError, TypeError, ValueError) as error:
+                    # Malformed query or body (e.g. between=price,5): answer instead of dropping the connection
+                    status, payload = 400, {"message": f"Malformed request: {error!r}"}
+                except Exception as error:
+                    status, payload = 500, {"message": f"Server error: {error!r}"}
+                break
+
+        data = json.dumps(payload).encode()
+        etag = f'"{hashlib.sha1(data).hexdigest()[:16]}"' if handler.command == "GET" and status == 200 else None
+        if etag is not None and handler.headers.get("If-None-Match") == etag:
+            # Conditional GET: the client's copy is current, no body
+            status, data = 304, b""
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        if etag is not None:
+            handler.send_header("ETag", etag)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def register(self, request: Dict[str, Any]) -> Tuple[int, Any]:
+        body = request["body"]
+        missing = [field for field in ("first_name", "last_name", "email", "password") if not body.get(field)]
+        if missing:
+            return 422, {field: [f"The {field.replace('_', ' ')} field is required."] for field in missing}
+
+        with self.lock:
+            if body["email"].lower() in self.users:
+                return 422, {"email": ["A customer with this email address already exists."]}
+            user = dict(body, id=new_ulid(), email=body["email"].lower())
+            self.users[user["email"]] = user
+        return 201, {key: value for key, value in user.items() if key != "password"}
+
+    def login(self, request: Dict[str, Any]) -> Tuple[int, Any]:
+        body = request["body"]
+        user = self.users.get(str(body.get("email", "")).lower())
+        if user is None or user["password"] != body.get("password"):
+            return 401, {"error": "Invalid email or password"}
+        return 200, {"access_token": issue_jwt(user), "token_type": "bearer", "expires_in": TOKEN_TTL}
+
+    def me(self, request: Dict[str, Any]) -> Tuple[int, Any]:
+        user = self._authenticated_user(request)
+        if user is None:
+            return 401, {"message": "Unauthorized"}
+        return 200, {key: value for key, value in user.items() if key != "password"}
+
+    def create_cart(self, request: Dict[str, Any]) -> Tuple[int, Any]:
+        user = self._authenticated_user(request)
+        if user is None and "Authorization" in request["headers"]:
+            return 401, {"message": "Unauthorized"}
+        cart = {"id": new_ulid(), "user_id": user["id"] if user else None, "cart_items": []}
+        with self.lock:
+            self.carts[cart["id"]] = cart
+        # The framework's ApiClient.add_to_cart posts the first item together with the cart
+        if request["body"].get("product_id"):
+            status, payload = self.add_cart_item(dict(request, cart_id=cart["id"]))
+            if status != 200:
+                return status, payload
+        return 201, {"id": cart["id"]}
+
+    def add_cart_item(self, request: Dict[str, Any]) -> Tuple[int, Any]:
+        body = request["body"]
+        product = self.catalog.products.get(body.get("product_id"))
+        if product is None:
+            return 422, {"product_id": ["The selected product id is invalid."]}
+        with self.lock:
+            cart = self.carts.get(request["cart_id"])
+            if cart is None:
+                return 404, {"message": "Cart not found"}
+            if not self._may_access(request, cart):
+                return 403, {"message": "Forbidden"}
+            for item in cart["cart_items"]:
+                if item["product_id"] == product["id"]:
+                    item["quantity"] += int(body.get("quantity", 1))
+                    break
+            else:
+                cart["cart_items"].append({"product_id": product["id"], "quantity": int(body.get("quantity", 1)), "product": product})
+        return 200, {"result": "item added or updated"}
+
+    def get_cart(self, request: Dict[str, Any]) -> Tuple[int, Any]:
+        cart = self.carts.get(request["cart_id"])
+        if cart is None:
+            return 404, {"message": "Cart not found"}
+        if not self._may_access(request, cart):
+            return 403, {"message": "Forbidden"}
+        return 200, cart
+
+    def list_products(self, request: Dict[str, Any]) -> Tuple[int, Any]:
+        page = int(request["query"].get("page", ["1"])[0])
+        return 200, paginate(self.catalog.query(request["query"]), page)
+
+    def get_product(self, request: Dict[str, Any]) -> Tuple[int, Any]:
+        product = self.catalog.products.get(request["product_id"])
+        if product is None:
+            return 404, {"message": "Requested item not found"}
+        return 200, product
+
+    def list_categories(self, request: Dict[str, Any]) -> Tuple[int, Any]:
+        return 200, [{"id": category_id, "name": name, "slug": name.lower().replace(" ", "-"), "parent_id": None}
+                     for category_id, (name, _) in CATEGORIES.items()]
+
+    def list_brands(self, request: Dict[str, Any]) -> Tuple[int, Any]:
+        return 200, [{"id": brand_id, "name": name, "slug": name.lower().replace(" ", "-")}
+                     for brand_id, name in BRANDS.items()]
+
+    def _may_access(self, request: Dict[str, Any], cart: Dict[str, Any]) -> bool:
+        if cart["user_id"] is None:
+            return True
+        user = self._authenticated_user(request)
+        return user is not None and user["id"] == cart["user_id"]
+
+    def _authenticated_user(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        header = request["headers"].get("Authorization", "")
+        if not header.startswith("Bearer "):
+            return None
+        try:
+            encoded_header, payload, signature = header[7:].split(".")
+            expected = hmac.new(JWT_SECRET, f"{encoded_header}.{payload}".encode(), hashlib.sha256).digest()
+            if not hmac.compare_digest(base64.urlsafe_b64encode(expected).decode().rstrip("="), signature):
+                return None
+            claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        except ValueError:
+            return None
+        # A token without a numeric exp is as unauthorized as an expired one
+        expires = claims.get("exp") if isinstance(claims, dict) else None
+        if not isinstance(expires, (int, float)) or expires < time.time():
+            return None
+        return next((user for user in self.users.values() if user["id"] == claims["sub"]), None)
+
+
+if __name__ == "__main__":
+    # Standalone mode, e.g. for benchmarking the API layer or load tooling: python -m src.utils.local_server
+    parser = argparse.ArgumentParser(description="Local stand-in server for the PST API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=Config.LOCAL_SERVER_PORT)
+    args = parser.parse_args()
+
+    local_server = LocalPstServer(args.host, args.port)
+    print(f"Serving the PST API stand-in on {local_server.url}")
+    local_server.httpd.serve_forever()
@@ -0,0 +1,131 @@
+import hashlib
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Sequence
+
+from playwright.sync_api import BrowserContext, Route
+
+from src.utils.config import Config
+from src.utils.file_lock import read_json, write_json_atomic
+
+if TYPE_CHECKING:
+    from src.utils.har import HarTape
+
+# Build artifacts carry a content hash in their name, so the same URL always returns the same bytes and can be
+# cached forever: webpack-era Angular writes main.3f2a1b9c8d7e6f50.js, esbuild (Angular 17+) main-ABCD1234.js
+# and Vite index-BxD3k9aZ.js. The hash is lowercase hex or has a digit/capital, which plain names lack
+HASHED_BUNDLE_PATTERN = re.compile(
+    r"[.-](?=[0-9A-Za-z]{8,}\.)(?:[0-9a-f]+|[0-9A-Za-z]*[0-9A-Z][0-9A-Za-z]*)\.(js|css|woff2?|ttf|svg)$"
+)
+
+
+@dataclass
+class ResourceCounters:
+    """What the policy did for one browser context (i.e. one test)."""
+    blocked_requests: int = 0
+    cached_requests: int = 0
+    cached_bytes: int = 0
+    cache_misses: int = 0
+
+    def add(self, other: "ResourceCounters") -> None:
+        self.blocked_requests += other.blocked_requests
+        self.cached_requests += other.cached_requests
+        self.cached_bytes += other.cached_bytes
+        self.cache_misses += other.cache_misses
+
+
+class ResourcePolicy:
+    """
+    Applied to every browser context: aborts analytics, fonts, images and media, and serves
+    hashed static bundles from an on-disk content-addressed cache shared by all workers and runs.
+    Requests the policy does not handle fall back to earlier routes (e.g. the HAR tape); the bundles
+    it serves itself are written to a recording tape, so a replay finds them even without the cache.
+    """
+
+    def __init__(self, blocked_types: Sequence[str] = Config.BLOCKED_RESOURCE_TYPES,
+                 blocked_url_patterns: Sequence[str] = Config.BLOCKED_URL_PATTERNS,
+                 cache_dir: str = Config.STATIC_CACHE_DIR):
+        self.blocked_types = set(blocked_types)
+        self.blocked_url_patterns = [pattern for pattern in blocked_url_patterns if pattern]
+        self.cache_dir = cache_dir
+        self.totals = ResourceCounters()
+
+    def apply(self, context: BrowserContext, tape: Optional["HarTape"] = None) -> ResourceCounters:
+        """Routes the context through the policy and returns its (live-updated) counters."""
+        counters = ResourceCounters()
+        recording = tape if tape is not None and tape.mode == "record" else None
+        context.route("**/*", lambda route: self._handle(route, counters, recording))
+        return counters
+
+    def summary(self) -> str:
+        return (
+            f"blocked={self.totals.blocked_requests} served_from_cache={self.totals.cached_requests} "
+            f"bytes_saved={self.totals.cached_bytes} cache_misses={self.totals.cache_misses}"
+        )
+
+    def _handle(self, route: Route, counters: ResourceCounters, tape: Optional["HarTape"]) -> None:
+        request = route.request
+        if request.resource_type in self.blocked_types or any(p in request.url for p in self.blocked_url_patterns):
+            counters.blocked_requests += 1
+            route.abort()
+            return
+
+        if request.method != "GET" or not HASHED_BUNDLE_PATTERN.search(request.url.split("?")[0]):
+            route.fallback()
+            return
+
+        cached = self._load(request.url)
+        if cached is not None:
+            body, content_type = cached
+            counters.cached_requests += 1
+            counters.cached_bytes += len(body)
+            if tape is not None:
+                tape.record(request.method, request.url, None, 200, "OK", {"content-type": content_type}, body, 0.0)
+            route.fulfill(status=200, headers={"content-type": content_type}, body=body)
+            return
+
+        counters.cache_misses += 1
+        if Config.NETWORK_MODE == "replay":
+            # Offline: let the HAR tape serve it, we cannot fetch it to fill the cache
+            route.fallback()
+            return
+
+        start = time.perf_counter()
+        response = route.fetch()
+        body = response.body()
+        if tape is not None:
+            tape.record(request.method, request.url, None, response.status, response.status_text,
+                        response.headers, body, (time.perf_counter() - start) * 1000)
+        if response.ok:
+            self._store(request.url, body, response.headers.get("content-type", "application/octet-stream"))
+        route.fulfill(response=response, body=body)
+
+    def _load(self, url: str) -> Optional[tuple]:
+        index = read_json(self._index_path(url))
+        if index is None:
+            return None
+        try:
+            with open(self._blob_path(index["digest"]), "rb") as handle:
+                return handle.read(), index["content_type"]
+        except OSError:
+            return None
+
+    def _store(self, url: str, body: bytes, content_type: str) -> None:
+        digest = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            # Same content means same file name, so concurrent workers can't corrupt each other
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as handle:
+                handle.write(body)
+            os.replace(tmp_path, blob_path)
+        write_json_atomic(self._index_path(url), {"url": url, "digest": digest, "content_type": content_type})
+
+    def _index_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, "index", hashlib.sha256(url.encode()).hexdigest()[:32] + ".json")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, "blobs", digest[:2], digest)
@@ -0,0 +1,252 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.utils.config import Config
+from src.utils.file_lock import file_lock, read_json, write_json_atomic
+
+# Written by `materialize` into its target: the files there that are copies of stored runs
+MATERIALIZED_MANIFEST = ".materialized.json"
+
+
+def _rewrite_sources(node: Any, sources: Dict[str, str]) -> Any:
+    """Points every attachment `source` (in results, steps, befores/afters) at its content-addressed name."""
+    if isinstance(node, dict):
+        if "source" in node and node["source"] in sources:
+            node["source"] = sources[node["source"]]
+        for value in node.values():
+            _rewrite_sources(value, sources)
+    elif isinstance(node, list):
+        for item in node:
+            _rewrite_sources(item, sources)
+    return node
+
+
+class AllureResultsStore:
+    """
+    Compact store for Allure results.
+    Loose `*-result.json`/`*-container.json` files of a run are rolled up into one gzipped JSON-lines
+    archive per run, attachments are stored once by content hash, and `index.json` lists the runs.
+    `materialize` writes runs back as a flat results directory, so `allure serve` keeps working; it
+    records what it wrote, and `compact` drops those copies instead of archiving them a second time.
+    """
+
+    def __init__(self, directory: str = Config.ALLURE_STORE_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+
+    def compact(self, source_dirs: Sequence[str], run_id: Optional[str] = None, remove_sources: bool = True) -> Dict[str, Any]:
+        """
+        Stream-merges the results of one run (one or more directories, e.g. one per CI node or
+        xdist worker) into a new run archive. Files are processed one at a time, so memory stays flat.
+        Files an earlier `materialize` wrote into a source directory are already stored: they are
+        skipped (and removed with the sources).
+        """
+        run_id = run_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        archive_path = os.path.join(self.directory, "runs", f"{run_id}.jsonl.gz")
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+
+        consumed: List[str] = []
+        for source_dir in source_dirs:
+            manifest_path = os.path.join(source_dir, MATERIALIZED_MANIFEST)
+            materialized = read_json(manifest_path, default={"files": []})["files"]
+            consumed.extend(os.path.join(source_dir, name) for name in materialized
+                            if os.path.isfile(os.path.join(source_dir, name)))
+            if os.path.exists(manifest_path):
+                consumed.append(manifest_path)
+        skipped = set(consumed)
+
+        # Attachments first: the JSON documents need their content-addressed names. The blobs themselves
+        # are written under the index lock together with the run, so a concurrent prune cannot
+        # collect them as unreferenced in between
+        sources: Dict[str, str] = {}
+        attachments: List[Tuple[str, str]] = []
+        for path, name in self._files(source_dirs):
+            if path in skipped:
+                continue
+            if "-attachment" in name:
+                sources[name] = self._blob_name(path, name)
+                attachments.append((path, sources[name]))
+                consumed.append(path)
+
+        statuses: Dict[str, int] = {}
+        documents = 0
+        with gzip.open(archive_path, "wt", encoding="utf-8") as archive:
+            for path, name in self._files(source_dirs):
+                if "-attachment" in name or path in skipped:
+                    continue
+                if name.endswith(".json"):
+                    document = _rewrite_sources(read_json(path), sources)
+                    if document is None:
+                        continue
+                    if name.endswith("-result.json"):
+                        statuses[document.get("status", "unknown")] = statuses.get(document.get("status", "unknown"), 0) + 1
+                    record = {"file": name, "json": document}
+                else:
+                    # environment.properties, executor files, ... are kept verbatim
+                    with open(path, encoding="utf-8", errors="replace") as handle:
+                        record = {"file": name, "text": handle.read()}
+                archive.write(json.dumps(record) + "\n")
+                documents += 1
+                consumed.append(path)
+
+        run = {
+            "id": run_id,
+            "created": time.time(),
+            "archive": os.path.relpath(archive_path, self.directory),
+            "documents": documents,
+            "attachments": sorted(set(sources.values())),
+            "statuses": statuses,
+        }
+        with file_lock(self.index_path):
+            for path, blob in attachments:
+                self._store_blob(path, blob)
+            index = read_json(self.index_path, default={"runs": []})
+            index["runs"].append(run)
+            write_json_atomic(self.index_path, index)
+
+        if remove_sources:
+            for path in consumed:
+                os.remove(path)
+        return run
+
+    def materialize(self, target_dir: str, run_ids: Optional[Sequence[str]] = None) -> int:
+        """
+        Writes the given runs (default: the latest) as loose Allure results into `target_dir`.
+        Attachments are hard-linked from the store when possible, so identical files cost no space.
+        The written names go to MATERIALIZED_MANIFEST, so compacting `target_dir` later skips them.
+        """
+        runs = self.runs()
+        if run_ids:
+            runs = [run for run in runs if run["id"] in run_ids]
+        elif runs:
+            runs = runs[-1:]
+
+        os.makedirs(target_dir, exist_ok=True)
+        written = 0
+        files: List[str] = []
+        for run in runs:
+            with gzip.open(os.path.join(self.directory, run["archive"]), "rt", encoding="utf-8") as archive:
+                for line in archive:
+                    record = json.loads(line)
+                    with open(os.path.join(target_dir, record["file"]), "w", encoding="utf-8") as handle:
+                        if "json" in record:
+                            json.dump(record["json"], handle)
+                        else:
+                            handle.write(record["text"])
+                    files.append(record["file"])
+                    written += 1
+            for blob in run["attachments"]:
+                target = os.path.join(target_dir, blob)
+                if not os.path.exists(target):
+                    self._link(self._blob_path(blob), target)
+                files.append(blob)
+        manifest_path = os.path.join(target_dir, MATERIALIZED_MANIFEST)
+        previous = read_json(manifest_path, default={"files": []})["files"]
+        write_json_atomic(manifest_path, {"files": sorted(set(previous) | set(files))})
+        return written
+
+    def prune(self, keep_runs: Optional[int] = None, max_age_days: Optional[float] = None) -> List[str]:
+        """Drops old runs by count and/or age and garbage-collects attachments no run references anymore."""
+        with file_lock(self.index_path):
+            index = read_json(self.index_path, default={"runs": []})
+            runs = index["runs"]
+            kept = runs[max(0, len(runs) - keep_runs):] if keep_runs is not None else list(runs)
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 86400
+                kept = [run for run in kept if run["created"] >= cutoff]
+            removed = [run for run in runs if run not in kept]
+
+            for run in removed:
+                archive_path = os.path.join(self.directory, run["archive"])
+                if os.path.exists(archive_path):
+                    os.remove(archive_path)
+
+            referenced = {blob for run in kept for blob in run["attachments"]}
+            blobs_dir = os.path.join(self.directory, "blobs")
+            for root, _, files in os.walk(blobs_dir):
+                for name in files:
+                    if name not in referenced:
+                        os.remove(os.path.join(root, name))
+
+            index["runs"] = kept
+            write_json_atomic(self.index_path, index)
+        return [run["id"] for run in removed]
+
+    def runs(self) -> List[Dict[str, Any]]:
+        return read_json(self.index_path, default={"runs": []})["runs"]
+
+    def _files(self, source_dirs: Sequence[str]) -> Iterator[Tuple[str, str]]:
+        for source_dir in source_dirs:
+            if not os.path.isdir(source_dir):
+                continue
+            for name in sorted(os.listdir(source_dir)):
+                path = os.path.join(source_dir, name)
+                if os.path.isfile(path):
+                    yield path, name
+
+    @staticmethod
+    def _blob_name(path: str, name: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+        # Keep the extension: Allure uses it to pick the viewer
+        return f"{digest.hexdigest()}-attachment{os.path.splitext(name)[1]}"
+
+    def _store_blob(self, path: str, blob: str) -> None:
+        blob_path = self._blob_path(blob)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.{os.getpid()}.tmp"
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, blob_path)
+
+    def _blob_path(self, blob: str) -> str:
+        return os.path.join(self.directory, "blobs", blob[:2], blob)
+
+    @staticmethod
+    def _link(source: str, target: str) -> None:
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compacted, deduplicated Allure results store")
+    parser.add_argument("--store", default=Config.ALLURE_STORE_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compact_parser = commands.add_parser("compact", help="roll loose results of a run into the store")
+    compact_parser.add_argument("sources", nargs="+", help="results directories (e.g. one per worker or CI node)")
+    compact_parser.add_argument("--run-id")
+    compact_parser.add_argument("--keep-sources", action="store_true")
+
+    materialize_parser = commands.add_parser("materialize", help="write runs back as loose files for `allure serve`")
+    materialize_parser.add_argument("target")
+    materialize_parser.add_argument("--run", action="append", dest="runs")
+
+    prune_parser = commands.add_parser("prune", help="drop old runs and unreferenced attachments")
+    prune_parser.add_argument("--keep-runs", type=int)
+    prune_parser.add_argument("--max-age-days", type=float)
+
+    commands.add_parser("list", help="list stored runs")
+
+    args = parser.parse_args()
+    store = AllureResultsStore(args.store)
+    if args.command == "compact":
+        print(json.dumps(store.compact(args.sources, args.run_id, remove_sources=not args.keep_sources), indent=2))
+    elif args.command == "materialize":
+        print(f"Wrote {store.materialize(args.target, args.runs)} documents to {args.target}")
+    elif args.command == "prune":
+        print(f"Removed runs: {store.prune(args.keep_runs, args.max_age_days)}")
+    else:
+        for stored_run in store.runs():
+            print(stored_run["id"], stored_run["documents"], stored_run["statuses"])
@@ -0,0 +1,214 @@
+import argparse
+import glob
+import hashlib
+import heapq
+import json
+import os
+import statistics
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.utils.config import Config
+from src.utils.file_lock import file_lock, read_json, write_json_atomic
+
+# Tests using these fixtures share expensive per-worker setup (user pool, storage-state cache, ...),
+# so they are kept on the same worker where possible
+HEAVY_FIXTURES = ("authenticated_context", "pooled_context", "pooled_user", "user_pool")
+# Weight of the newest measurement in the moving average of a test's duration
+EWMA_ALPHA = 0.3
+
+
+def allure_full_name_to_nodeid(full_name: str) -> str:
+    """tests.ui.test_search#test_search_functionality -> tests/ui/test_search.py::test_search_functionality"""
+    module, _, function = full_name.partition("#")
+    return f"{module.replace('.', '/')}.py::{function}"
+
+
+class DurationStore:
+    """
+    Past test durations (seconds) by node id: our own EWMA timing store first, then Allure results.
+    Tests without history get the median of their module, then of the suite, then a default.
+    """
+
+    def __init__(self, path: str = Config.TEST_DURATIONS_FILE, allure_dirs: Sequence[str] = ("allure-results",)):
+        self.path = path
+        self.durations: Dict[str, float] = {}
+        for allure_dir in allure_dirs:
+            self.durations.update(self._from_allure(allure_dir))
+        self.durations.update(read_json(path, default={}))
+
+    def estimate(self, nodeid: str) -> Tuple[float, bool]:
+        """Returns (duration, measured); `measured` is False for estimates of new tests."""
+        base_id = nodeid.split("[")[0]
+        for key in (nodeid, base_id):
+            if key in self.durations:
+                return self.durations[key], True
+
+        module = nodeid.split("::")[0]
+        module_durations = [d for key, d in self.durations.items() if key.startswith(module + "::")]
+        if module_durations:
+            return statistics.median(module_durations), False
+        if self.durations:
+            return statistics.median(self.durations.values()), False
+        return Config.DEFAULT_TEST_DURATION, False
+
+    def update(self, measured: Dict[str, float]) -> None:
+        """Folds the durations of this run into the store (shared by workers/nodes via a file lock)."""
+        with file_lock(self.path):
+            stored = read_json(self.path, default={})
+            for nodeid, duration in measured.items():
+                previous = stored.get(nodeid)
+                stored[nodeid] = duration if previous is None else EWMA_ALPHA * duration + (1 - EWMA_ALPHA) * previous
+            write_json_atomic(self.path, stored)
+
+    def digest(self) -> str:
+        """Fingerprint of the planning input: nodes that plan from different durations would split differently."""
+        return hashlib.sha256(json.dumps(self.durations, sort_keys=True).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _from_allure(allure_dir: str) -> Dict[str, float]:
+        # Latest run wins: results are read oldest first
+        results = []
+        for path in glob.glob(os.path.join(allure_dir, "*-result.json")):
+            result = read_json(path)
+            if result and "fullName" in result and "start" in result and "stop" in result:
+                results.append(result)
+        results.sort(key=lambda result: result["start"])
+        return {
+            allure_full_name_to_nodeid(result["fullName"]): (result["stop"] - result["start"]) / 1000
+            for result in results
+        }
+
+
+class ShardPlan:
+    """
+    Longest-processing-time-first assignment of tests to N CI nodes and M workers per node.
+    Tests sharing heavy fixtures in the same module form one unit, so they land on the same worker.
+    """
+
+    def __init__(self, items: Iterable[Any], durations: DurationStore, nodes: int, workers: int = 1):
+        self.nodes = nodes
+        self.workers = workers
+        self.estimates: Dict[str, float] = {}
+        self.unmeasured: List[str] = []
+
+        units: Dict[str, List[str]] = {}
+        for item in items:
+            duration, measured = durations.estimate(item.nodeid)
+            self.estimates[item.nodeid] = duration
+            if not measured:
+                self.unmeasured.append(item.nodeid)
+            heavy = any(name in getattr(item, "fixturenames", ()) for name in HEAVY_FIXTURES)
+            key = f"heavy:{item.nodeid.split('::')[0]}" if heavy else item.nodeid
+            units.setdefault(key, []).append(item.nodeid)
+
+        unit_list = list(units.values())
+        # Level 1: units to CI nodes, level 2: each node's units to its workers
+        self.node_loads, node_units = self._lpt(unit_list, nodes)
+        self.assignment: Dict[str, Tuple[int, int]] = {}
+        self.worker_loads: List[List[float]] = []
+        for node, units_of_node in enumerate(node_units):
+            loads, worker_units = self._lpt(units_of_node, workers)
+            self.worker_loads.append(loads)
+            for worker, units_of_worker in enumerate(worker_units):
+                for unit in units_of_worker:
+                    for nodeid in unit:
+                        self.assignment[nodeid] = (node, worker)
+
+    def predicted_makespan(self, node: Optional[int] = None) -> float:
+        """Predicted wall time of one node (its busiest worker), or of the whole run."""
+        if node is not None:
+            return max(self.worker_loads[node], default=0.0)
+        return max((max(loads, default=0.0) for loads in self.worker_loads), default=0.0)
+
+    def _lpt(self, units: List[List[str]], bins: int) -> Tuple[List[float], List[List[List[str]]]]:
+        loads = [0.0] * bins
+        assigned: List[List[List[str]]] = [[] for _ in range(bins)]
+        heap = [(0.0, index) for index in range(bins)]
+        for unit in sorted(units, key=self._unit_duration, reverse=True):
+            load, index = heapq.heappop(heap)
+            assigned[index].append(unit)
+            loads[index] = load + self._unit_duration(unit)
+            heapq.heappush(heap, (loads[index], index))
+        return loads, assigned
+
+    def _unit_duration(self, unit: List[str]) -> float:
+        return sum(self.estimates[nodeid] for nodeid in unit)
+
+
+class ShardTracker:
+    """
+    Compares the plan of one CI node with what actually happened.
+    Under xdist only the workers collect (and plan), so they persist the predicted part of the plan
+    and the controller, which sees every test report, adds the actual durations at the end.
+    """
+
+    def __init__(self, node: int, directory: str = Config.SHARD_REPORT_DIR):
+        self.node = node
+        self.plan_path = os.path.join(directory, f"shard-plan-{node}.json")
+        self.report_path = os.path.join(directory, f"shard-report-{node}.json")
+        self.durations: Dict[str, float] = {}
+        self.report: Optional[Dict[str, Any]] = None
+
+    def save_plan(self, plan: ShardPlan) -> None:
+        write_json_atomic(self.plan_path, {
+            "node": self.node,
+            "nodes": plan.nodes,
+            "workers": plan.workers,
+            "predicted_makespan": plan.predicted_makespan(self.node),
+            "predicted_run_makespan": plan.predicted_makespan(),
+            "predicted_worker_loads": plan.worker_loads[self.node],
+            "worker_of_test": {nodeid: worker for nodeid, (node, worker) in plan.assignment.items() if node == self.node},
+            "estimated_tests": [nodeid for nodeid in plan.unmeasured if plan.assignment[nodeid][0] == self.node],
+        })
+
+    def pytest_runtest_logreport(self, report: Any) -> None:
+        """Pytest hook (the tracker is registered as a plugin): setup + call + teardown time per test."""
+        self.record(report.nodeid, report.duration)
+
+    def record(self, nodeid: str, seconds: float) -> None:
+        # xdist's loadgroup scheduling appends "@<group>" to node ids
+        nodeid = nodeid.split("@")[0]
+        self.durations[nodeid] = self.durations.get(nodeid, 0.0) + seconds
+
+    def finish(self, actual_wall: float) -> Optional[Dict[str, Any]]:
+        plan = read_json(self.plan_path)
+        if plan is None:
+            return None
+        actual_workers = [0.0] * plan["workers"]
+        for nodeid, seconds in self.durations.items():
+            if nodeid in plan["worker_of_test"]:
+                actual_workers[plan["worker_of_test"][nodeid]] += seconds
+
+        # The measured durations travel with the report: CI merges every node's report into one store
+        self.report = dict(plan, actual_wall=actual_wall, actual_worker_loads=actual_workers,
+                           measured_durations=self.durations)
+        write_json_atomic(self.report_path, self.report)
+        return self.report
+
+    def summary(self) -> str:
+        if self.report is None:
+            return "no shard plan found"
+        return (
+            f"node {self.node + 1}/{self.report['nodes']}: predicted {self.report['predicted_makespan']:.1f}s, "
+            f"actual {self.report['actual_wall']:.1f}s (run predicted {self.report['predicted_run_makespan']:.1f}s); "
+            f"{len(self.report['estimated_tests'])} test(s) without history"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test-duration store shared by the CI nodes of a sharded run")
+    parser.add_argument("--store", default=Config.TEST_DURATIONS_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    merge_parser = commands.add_parser("merge", help="fold the measured durations of shard reports into the store")
+    merge_parser.add_argument("reports", nargs="*", help="shard-report-<node>.json files of every node")
+    commands.add_parser("digest", help="print the fingerprint nodes compare via --shard-durations-digest")
+
+    args = parser.parse_args()
+    if args.command == "merge":
+        measured: Dict[str, float] = {}
+        for report_path in args.reports:
+            measured.update((read_json(report_path) or {}).get("measured_durations", {}))
+        DurationStore(args.store, allure_dirs=()).update(measured)
+        print(f"Merged {len(measured)} durations from {len(args.reports)} shard report(s) into {args.store}")
+    else:
+        print(DurationStore(args.store, allure_dirs=()).digest())
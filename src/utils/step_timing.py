@@ -0,0 +1,273 @@
+import csv
+import functools
+import glob
+import inspect
+import json
+import os
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.utils.config import Config
+from src.utils.file_lock import read_json
+
+# Chromium CDP metrics worth diffing around a step (durations in seconds, heap in bytes)
+CDP_METRICS = ("TaskDuration", "ScriptDuration", "LayoutDuration", "RecalcStyleDuration", "JSHeapUsedSize")
+
+
+@dataclass
+class StepRecord:
+    """Timing of one instrumented call within a test."""
+    test: str
+    name: str
+    kind: str
+    elapsed_ms: float
+    rpcs: int
+    depth: int
+    cdp: Dict[str, float] = field(default_factory=dict)
+
+
+class _RpcCounter:
+    """
+    Counts every message the Playwright client sends to its driver, i.e. every RPC.
+    Playwright has no public hook for this, so the single internal chokepoint
+    (`Connection._send_message_to_server`) is wrapped once per process, only with STEP_RPC_COUNTS=true
+    and only if it still has the signature it was written against; otherwise counts stay 0.
+    Counts are kept per thread: a sync Playwright call sends from the calling thread, so RPCs of the
+    AsyncRunner's loop (or of load-test threads) are not charged to the step running on another thread.
+    """
+
+    # Signature of the wrapped method in the Playwright versions this was checked with (1.x)
+    EXPECTED_PARAMETERS = ("self", "object", "method", "params")
+
+    def __init__(self):
+        self.enabled = False
+        self._local = threading.local()
+        self._original: Optional[Callable] = None
+
+    @property
+    def count(self) -> int:
+        """RPCs sent so far by the calling thread."""
+        return getattr(self._local, "count", 0)
+
+    def install(self) -> None:
+        if self._original is not None:
+            return
+        reason = self._incompatibility()
+        if reason is not None:
+            warnings.warn(f"Playwright RPC counting disabled: {reason}")
+            return
+        from playwright._impl._connection import Connection
+
+        original = Connection._send_message_to_server
+        counter = self
+
+        @functools.wraps(original)
+        def counting_send(connection, *args, **kwargs):
+            counter._local.count = counter.count + 1
+            return original(connection, *args, **kwargs)
+
+        Connection._send_message_to_server = counting_send
+        self._original = original
+        self.enabled = True
+
+    def uninstall(self) -> None:
+        """Puts Playwright's own method back."""
+        if self._original is None:
+            return
+        from playwright._impl._connection import Connection
+
+        Connection._send_message_to_server = self._original
+        self._original = None
+        self.enabled = False
+
+    def _incompatibility(self) -> Optional[str]:
+        try:
+            from playwright._impl._connection import Connection
+            from playwright._repo_version import version
+        except ImportError as error:
+            return f"internal module missing ({error})"
+        if not version.startswith("1."):
+            return f"untested Playwright version {version}"
+        method = getattr(Connection, "_send_message_to_server", None)
+        if not callable(method):
+            return "Connection._send_message_to_server not found"
+        parameters = tuple(inspect.signature(method).parameters)[:len(self.EXPECTED_PARAMETERS)]
+        if parameters != self.EXPECTED_PARAMETERS:
+            return f"Connection._send_message_to_server{parameters} changed"
+        return None
+
+
+rpc_counter = _RpcCounter()
+
+
+class StepTimer:
+    """
+    Collects monotonic timings (and Playwright RPC counts) of instrumented steps for the whole session.
+    Fixtures call `start_test`/`finish_test`; code under test is instrumented with `@timed_step`.
+    """
+
+    def __init__(self, capture_cdp: bool = Config.STEP_CDP_METRICS, count_rpcs: bool = Config.STEP_RPC_COUNTS):
+        self.capture_cdp = capture_cdp
+        self.records: List[StepRecord] = []
+        self.current_test: Optional[str] = None
+        self._depth = threading.local()
+        self._cdp_sessions: Dict[int, Any] = {}
+        if count_rpcs:
+            rpc_counter.install()
+
+    def start_test(self, nodeid: str) -> None:
+        self.current_test = nodeid
+        self._cdp_sessions.clear()
+
+    def finish_test(self) -> List[StepRecord]:
+        """Returns the records of the test that just finished."""
+        test, self.current_test = self.current_test, None
+        return [record for record in self.records if record.test == test]
+
+    def record(self, name: str, kind: str, elapsed_ms: float, rpcs: int = 0) -> None:
+        """Adds an externally measured step, e.g. a fixture setup timed by a pytest hook."""
+        self.records.append(StepRecord(self.current_test or "<session>", name, kind, elapsed_ms, rpcs, 0))
+
+    @contextmanager
+    def step(self, name: str, kind: str, page: Any = None) -> Iterator[None]:
+        depth = getattr(self._depth, "value", 0)
+        self._depth.value = depth + 1
+        cdp_before = self._cdp_metrics(page)
+        rpcs_before = rpc_counter.count
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            rpcs = rpc_counter.count - rpcs_before
+            self._depth.value = depth
+
+            cdp = {}
+            cdp_after = self._cdp_metrics(page)
+            if cdp_before and cdp_after:
+                cdp = {name_: cdp_after[name_] - cdp_before[name_] for name_ in cdp_before if name_ in cdp_after}
+            self.records.append(StepRecord(self.current_test or "<session>", name, kind, elapsed_ms, rpcs, depth, cdp))
+
+    def slowest_steps(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Aggregates records per step name, slowest total time first."""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for record in self.records:
+            entry = totals.setdefault(record.name, {
+                "step": record.name, "kind": record.kind, "calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rpcs": 0,
+            })
+            entry["calls"] += 1
+            entry["total_ms"] += record.elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], record.elapsed_ms)
+            entry["rpcs"] += record.rpcs
+        for entry in totals.values():
+            entry["avg_ms"] = entry["total_ms"] / entry["calls"]
+        return sorted(totals.values(), key=lambda entry: entry["total_ms"], reverse=True)[:limit]
+
+    def export(self, directory: str = Config.STEP_TIMINGS_DIR, name: str = Config.WORKER_ID) -> str:
+        """Writes the summary of the recorded steps as `step-timings-<name>.json|csv` and returns the JSON path."""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"step-timings-{name}")
+        summary = self.slowest_steps(limit=len(self.records) or 1)
+
+        with open(f"{base}.json", "w", encoding="utf-8") as handle:
+            json.dump({"slowest_steps": summary, "records": [asdict(r) for r in self.records]}, handle, indent=2)
+        with open(f"{base}.csv", "w", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=["step", "kind", "calls", "total_ms", "avg_ms", "max_ms", "rpcs"])
+            writer.writeheader()
+            writer.writerows(summary)
+        return f"{base}.json"
+
+    def merge_worker_exports(self, directory: str = Config.STEP_TIMINGS_DIR) -> int:
+        """
+        On the xdist controller: adds the records every worker exported, so `summary()` and the
+        session export cover the whole suite. Returns the number of worker files merged.
+        """
+        paths = sorted(glob.glob(os.path.join(directory, "step-timings-gw*.json")))
+        for path in paths:
+            self.records.extend(StepRecord(**record) for record in (read_json(path) or {}).get("records", []))
+        return len(paths)
+
+    @staticmethod
+    def clear_exports(directory: str = Config.STEP_TIMINGS_DIR) -> None:
+        """Removes the exports of an earlier run, whose workers would otherwise be merged into this one."""
+        for path in glob.glob(os.path.join(directory, "step-timings-*.*")):
+            os.remove(path)
+
+    def summary(self) -> str:
+        lines = [
+            f"{entry['total_ms']:>10.1f} ms  {entry['calls']:>4} calls  {entry['rpcs']:>5} rpcs  {entry['step']}"
+            for entry in self.slowest_steps(limit=10)
+        ]
+        return "\n".join(lines) or "no steps recorded"
+
+    def _cdp_metrics(self, page: Any) -> Dict[str, float]:
+        if not self.capture_cdp or page is None:
+            return {}
+        try:
+            session = self._cdp_sessions.get(id(page))
+            if session is None:
+                session = page.context.new_cdp_session(page)
+                session.send("Performance.enable")
+                self._cdp_sessions[id(page)] = session
+            metrics = session.send("Performance.getMetrics")["metrics"]
+        except Exception:
+            # Non-Chromium browser or page already closed: CDP metrics are best effort
+            return {}
+        return {metric["name"]: metric["value"] for metric in metrics if metric["name"] in CDP_METRICS}
+
+
+_active_timer: Optional[StepTimer] = None
+# Called after every outermost instrumented step (also failed ones) with (step name, kind, page object / client);
+# steps run inside another step (e.g. fill_form -> fill_input) are part of it
+_step_listeners: List[Callable[[str, str, Any], None]] = []
+_nesting = threading.local()
+
+
+def set_step_timer(timer: Optional[StepTimer]) -> None:
+    global _active_timer
+    _active_timer = timer
+
+
+def get_step_timer() -> Optional[StepTimer]:
+    return _active_timer
+
+
+def add_step_listener(listener: Callable[[str, str, Any], None]) -> None:
+    _step_listeners.append(listener)
+
+
+def remove_step_listener(listener: Callable[[str, str, Any], None]) -> None:
+    if listener in _step_listeners:
+        _step_listeners.remove(listener)
+
+
+def timed_step(kind: str) -> Callable:
+    """
+    Decorator for page-object and ApiClient methods: records `Class.method` as a step
+    when a StepTimer is active and notifies step listeners after outermost steps; it is a plain call otherwise.
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            timer = _active_timer
+            if timer is None and not _step_listeners:
+                return function(self, *args, **kwargs)
+            name = f"{type(self).__name__}.{function.__name__}"
+            depth = getattr(_nesting, "depth", 0)
+            _nesting.depth = depth + 1
+            try:
+                if timer is None:
+                    return function(self, *args, **kwargs)
+                with timer.step(name, kind, getattr(self, "page", None)):
+                    return function(self, *args, **kwargs)
+            finally:
+                _nesting.depth = depth
+                if depth == 0:
+                    for listener in list(_step_listeners):
+                        listener(name, kind, self)
+        return wrapper
+    return decorator
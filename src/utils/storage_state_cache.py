@@ -0,0 +1,154 @@
+import base64
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from src.utils.config import Config
+from src.utils.file_lock import file_lock, read_json, write_json_atomic
+
+# PST keeps the JWT in localStorage under this key
+AUTH_TOKEN_KEY = "auth-token"
+
+
+def decode_jwt_exp(token: str) -> Optional[int]:
+    """
+    Returns the `exp` claim (unix seconds) of a JWT without verifying its signature.
+    We only need it to know when a cached token becomes useless.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return int(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def storage_state_for_token(token: str, origin: str) -> Dict[str, Any]:
+    """
+    Builds a Playwright `storage_state` dict holding the token in localStorage.
+    Passing it to `browser.new_context(storage_state=...)` replaces the old
+    "open a page, goto BASE_UI_URL, setItem" dance, so no page load is needed.
+    """
+    return {
+        "cookies": [],
+        "origins": [
+            {
+                "origin": origin.rstrip("/"),
+                "localStorage": [{"name": AUTH_TOKEN_KEY, "value": token}],
+            }
+        ],
+    }
+
+
+class StorageStateCache:
+    """
+    On-disk cache of authenticated storage states, keyed by user and origin.
+    Only meant for identities that are reused across tests and runs (pool users, TEST_USER_EMAIL):
+    a freshly registered user never hits, so its state is built in memory with `storage_state_for_token`.
+    Entries are file-locked so parallel xdist workers can share them, and they are
+    invalidated `expiry_margin` seconds before the JWT `exp` claim.
+    """
+
+    def __init__(self, directory: str = Config.STORAGE_STATE_DIR,
+                 expiry_margin: int = Config.STORAGE_STATE_EXPIRY_MARGIN):
+        self.directory = directory
+        self.expiry_margin = expiry_margin
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+
+    def get(self, user: str, origin: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached storage state, or None if it is missing or about to expire."""
+        path = self._path(user, origin)
+        with file_lock(path):
+            entry = read_json(path)
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        if not self._is_fresh(entry.get("expires_at")):
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            self.invalidate(user, origin)
+            return None
+
+        self.stats["hits"] += 1
+        return entry["storage_state"]
+
+    def put(self, user: str, origin: str, token: str) -> Dict[str, Any]:
+        """Stores the storage state for a freshly issued token and returns it."""
+        entry = self._entry(user, origin, token)
+        path = self._path(user, origin)
+        with file_lock(path):
+            write_json_atomic(path, entry)
+        return entry["storage_state"]
+
+    def get_or_create(self, user: str, origin: str, login: Callable[[], str]) -> Dict[str, Any]:
+        """
+        Returns the cached storage state, calling `login()` for a new token on a miss.
+        The entry stays locked during the login, so workers missing the same user log in only once.
+        """
+        path = self._path(user, origin)
+        with file_lock(path):
+            entry = read_json(path)
+            if entry is not None and self._is_fresh(entry.get("expires_at")):
+                self.stats["hits"] += 1
+                return entry["storage_state"]
+
+            self.stats["misses"] += 1
+            if entry is not None:
+                self.stats["expired"] += 1
+            entry = self._entry(user, origin, login())
+            write_json_atomic(path, entry)
+        return entry["storage_state"]
+
+    def evict_expired(self) -> int:
+        """Removes the entries whose token is expired (or about to), e.g. of users dropped from the pool."""
+        names = os.listdir(self.directory) if os.path.isdir(self.directory) else []
+        evicted = 0
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            with file_lock(path):
+                entry = read_json(path)
+                if entry is not None and self._is_fresh(entry.get("expires_at")):
+                    continue
+                if os.path.exists(path):
+                    os.remove(path)
+            evicted += 1
+        self.stats["evicted"] += evicted
+        return evicted
+
+    def invalidate(self, user: str, origin: str) -> None:
+        path = self._path(user, origin)
+        with file_lock(path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def summary(self) -> str:
+        return (
+            f"hits={self.stats['hits']} misses={self.stats['misses']} "
+            f"expired={self.stats['expired']} evicted={self.stats['evicted']}"
+        )
+
+    @staticmethod
+    def _entry(user: str, origin: str, token: str) -> Dict[str, Any]:
+        return {
+            "user": user,
+            "origin": origin,
+            "expires_at": decode_jwt_exp(token),
+            "storage_state": storage_state_for_token(token, origin),
+        }
+
+    def _is_fresh(self, expires_at: Optional[int]) -> bool:
+        # Tokens without an exp claim never expire on their own
+        if expires_at is None:
+            return True
+        return expires_at - self.expiry_margin > time.time()
+
+    def _path(self, user: str, origin: str) -> str:
+        key = hashlib.sha256(f"{user.lower()}|{origin.rstrip('/')}".encode()).hexdigest()[:24]
+        return os.path.join(self.directory, f"{key}.json")
@@ -0,0 +1,161 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.api.api_client import ApiClient
+from src.utils.config import Config
+from src.utils.file_lock import file_lock, read_json, write_json_atomic
+from src.utils.storage_state_cache import decode_jwt_exp
+
+
+class UserPool:
+    """
+    Pool of pre-registered users persisted in a JSON file.
+    Users are registered concurrently up front (or loaded from a previous run), then leased
+    to one test at a time together with a valid token and returned at teardown.
+    The pool file is guarded by a file lock, so every xdist worker leases from the same pool.
+    """
+
+    def __init__(self, user_factory: Callable[[], Dict[str, Any]], api: ApiClient, path: str = Config.USER_POOL_FILE,
+                 size: int = Config.USER_POOL_SIZE, low_water: int = Config.USER_POOL_LOW_WATER):
+        self.user_factory = user_factory
+        self.api = api
+        self.path = path
+        self.size = size
+        self.low_water = low_water
+        self.owner = f"{Config.WORKER_ID}:{os.getpid()}"
+
+        self._refill_thread: Optional[threading.Thread] = None
+        self.stats = {"registered": 0, "leases": 0, "relogins": 0, "dropped": 0, "refills": 0}
+
+    def provision(self) -> None:
+        """Tops the pool up to `size` free users, registering the missing ones concurrently."""
+        with file_lock(self.path):
+            entries = self._load()
+            missing = self.size - self._available(entries)
+            if missing > 0:
+                entries.extend(self._register_many(missing))
+                self._save(entries)
+
+    def lease(self) -> Dict[str, Any]:
+        """Hands out a free user with a valid `token` and marks it as leased by this worker."""
+        while True:
+            with file_lock(self.path):
+                entries = self._load()
+                entry = next((e for e in entries if self._is_free(e)), None)
+                if entry is not None:
+                    entry["lease"] = {"owner": self.owner, "since": time.time()}
+                    self._save(entries)
+                    available = self._available(entries)
+
+            if entry is None:
+                # Pool exhausted: register a brand-new user for this test instead of waiting
+                entry = self._register_many(1)[0]
+                entry["lease"] = {"owner": self.owner, "since": time.time()}
+                with file_lock(self.path):
+                    entries = self._load()
+                    entries.append(entry)
+                    self._save(entries)
+                    available = self._available(entries)
+
+            if self._token_is_fresh(entry) or self._relogin(entry):
+                break
+            self._drop(entry)
+
+        self.stats["leases"] += 1
+        if available < self.low_water:
+            self._refill_in_background()
+        return entry
+
+    def release(self, user: Dict[str, Any]) -> None:
+        """Returns a leased user (with its possibly refreshed token) to the pool."""
+        with file_lock(self.path):
+            entries = self._load()
+            for entry in entries:
+                if entry["email"] == user["email"]:
+                    entry["token"] = user["token"]
+                    entry["expires_at"] = user["expires_at"]
+                    entry["lease"] = None
+            self._save(entries)
+
+    def close(self) -> None:
+        """Waits for a pending background refill so the pool file is not left half-updated."""
+        if self._refill_thread is not None:
+            self._refill_thread.join()
+
+    def summary(self) -> str:
+        return (
+            f"registered={self.stats['registered']} leases={self.stats['leases']} "
+            f"relogins={self.stats['relogins']} dropped={self.stats['dropped']} "
+            f"refills={self.stats['refills']}"
+        )
+
+    def _refill_in_background(self) -> None:
+        if self._refill_thread is not None and self._refill_thread.is_alive():
+            return
+        self.stats["refills"] += 1
+        self._refill_thread = threading.Thread(target=self._refill, name="user-pool-refill", daemon=True)
+        self._refill_thread.start()
+
+    def _refill(self) -> None:
+        with file_lock(self.path):
+            missing = self.size - self._available(self._load())
+        if missing <= 0:
+            return
+
+        # Registration happens outside the lock so other workers can keep leasing meanwhile
+        new_entries = self._register_many(missing)
+        with file_lock(self.path):
+            entries = self._load()
+            entries.extend(new_entries)
+            self._save(entries)
+
+    def _register_many(self, count: int) -> List[Dict[str, Any]]:
+        # Registration and login both run as concurrent batches on the async API client
+        users = [self.user_factory() for _ in range(count)]
+        self.api.register_users(users)
+        tokens = self.api.login_many([(user["email"], user["password"]) for user in users])
+
+        self.stats["registered"] += len(users)
+        return [
+            dict(user, token=token, expires_at=decode_jwt_exp(token), lease=None)
+            for user, token in zip(users, tokens)
+        ]
+
+    def _relogin(self, entry: Dict[str, Any]) -> bool:
+        try:
+            entry["token"] = self.api.login(entry["email"], entry["password"])
+        except AssertionError:
+            return False
+
+        entry["expires_at"] = decode_jwt_exp(entry["token"])
+        self.stats["relogins"] += 1
+        return True
+
+    def _drop(self, entry: Dict[str, Any]) -> None:
+        # The backend no longer knows this user (e.g. the demo database was reset)
+        self.stats["dropped"] += 1
+        with file_lock(self.path):
+            entries = [e for e in self._load() if e["email"] != entry["email"]]
+            self._save(entries)
+
+    def _is_free(self, entry: Dict[str, Any]) -> bool:
+        lease = entry.get("lease")
+        # Leases of crashed workers are reclaimed after a timeout
+        return lease is None or time.time() - lease["since"] > Config.USER_POOL_LEASE_TIMEOUT
+
+    def _available(self, entries: List[Dict[str, Any]]) -> int:
+        return sum(1 for entry in entries if self._is_free(entry))
+
+    def _token_is_fresh(self, entry: Dict[str, Any]) -> bool:
+        expires_at = entry.get("expires_at")
+        if not entry.get("token"):
+            return False
+        return expires_at is None or expires_at - Config.STORAGE_STATE_EXPIRY_MARGIN > time.time()
+
+    def _load(self) -> List[Dict[str, Any]]:
+        return read_json(self.path, default=[])
+
+    def _save(self, entries: List[Dict[str, Any]]) -> None:
+        write_json_atomic(self.path, entries)
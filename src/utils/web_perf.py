@@ -0,0 +1,235 @@
+import json
+import os
+import statistics
+import time
+import warnings
+import weakref
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from src.utils.config import Config
+from src.utils.file_lock import file_lock
+
+# Installed before any page script runs: buffers LCP, layout shifts and long tasks for `collect`
+PERF_INIT_SCRIPT = """
+(() => {
+    if (window.__webPerf || typeof PerformanceObserver === 'undefined') return;
+    const perf = window.__webPerf = { lcp: null, cls: 0, longTasks: 0, longTaskMs: 0, blockingMs: 0 };
+    const observe = (type, callback) => {
+        try { new PerformanceObserver(list => list.getEntries().forEach(callback)).observe({ type, buffered: true }); }
+        catch (e) { /* entry type not supported by this browser */ }
+    };
+    observe('largest-contentful-paint', entry => { perf.lcp = entry.renderTime || entry.loadTime || entry.startTime; });
+    observe('layout-shift', entry => { if (!entry.hadRecentInput) perf.cls += entry.value; });
+    observe('longtask', entry => {
+        perf.longTasks += 1;
+        perf.longTaskMs += entry.duration;
+        perf.blockingMs += Math.max(0, entry.duration - 50);
+    });
+})();
+"""
+
+COLLECT_SCRIPT = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    const perf = window.__webPerf || {};
+    return {
+        ttfb_ms: nav ? nav.responseStart : null,
+        dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+        load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd : null,
+        lcp_ms: perf.lcp === undefined ? null : perf.lcp,
+        cls: perf.cls === undefined ? null : perf.cls,
+        long_tasks: perf.longTasks === undefined ? null : perf.longTasks,
+        blocking_ms: perf.blockingMs === undefined ? null : perf.blockingMs,
+        transferred_kb: ((nav ? nav.transferSize : 0) + resources.reduce((sum, r) => sum + (r.transferSize || 0), 0)) / 1024,
+        requests: resources.length + 1,
+    };
+}
+"""
+
+
+# Smallest worsening that counts as a regression (ms, KB and counts otherwise: 1)
+REGRESSION_MIN_DELTA = {"cls": 0.01}
+
+
+class PerfBudgetExceeded(AssertionError):
+    """A hard web-performance budget was exceeded."""
+
+
+@dataclass(frozen=True)
+class PerfBudget:
+    """
+    Upper limits for one route (None = not budgeted). Declared on page objects in PERF_BUDGETS.
+    "soft" budgets warn and are attached to the report, "hard" budgets fail the test (PERF_BUDGETS=enforce).
+    """
+    ttfb_ms: Optional[float] = None
+    dom_content_loaded_ms: Optional[float] = None
+    load_ms: Optional[float] = None
+    lcp_ms: Optional[float] = None
+    cls: Optional[float] = None
+    blocking_ms: Optional[float] = None
+    transferred_kb: Optional[float] = None
+    severity: str = "soft"
+
+    def violations(self, metrics: Dict[str, Optional[float]]) -> List[str]:
+        result = []
+        for budget_field in fields(self):
+            limit = getattr(self, budget_field.name)
+            if budget_field.name == "severity" or limit is None:
+                continue
+            value = metrics.get(budget_field.name)
+            if value is not None and value > limit:
+                result.append(f"{budget_field.name} {value:.2f} > {limit:g}")
+        return result
+
+
+@dataclass
+class PerfRecord:
+    """Web-performance metrics of one navigation and the budgets it violated."""
+    route: str
+    metrics: Dict[str, Optional[float]]
+    violations: List[Tuple[str, str]] = field(default_factory=list)
+    regressions: List[str] = field(default_factory=list)
+
+
+class PerfTrendStore:
+    """
+    Append-only JSON-lines history of navigation metrics per route (shared by xdist workers via a file lock).
+    A metric regressed when it is worse than the median of its previous `window` values by `tolerance`.
+    """
+
+    def __init__(self, path: str = Config.PERF_TRENDS_FILE, window: int = 10,
+                 tolerance: float = Config.PERF_REGRESSION_TOLERANCE):
+        self.path = path
+        self.window = window
+        self.tolerance = tolerance
+        # Baselines only use earlier runs, not navigations of the current one
+        self.started_at = time.time()
+        self._history: Optional[Dict[Tuple[str, str], List[float]]] = None
+
+    def append(self, record: PerfRecord, test: Optional[str] = None) -> None:
+        line = json.dumps({"time": time.time(), "test": test, "route": record.route, "metrics": record.metrics})
+        with file_lock(self.path):
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+    def regressions(self, record: PerfRecord) -> List[str]:
+        result = []
+        for metric, value in record.metrics.items():
+            baseline = self.baseline(record.route, metric)
+            if value is None or baseline is None:
+                continue
+            # Jitter on tiny values (a few ms, one extra request) is no regression
+            if value > baseline * (1 + self.tolerance) and value - baseline > REGRESSION_MIN_DELTA.get(metric, 1):
+                result.append(f"{metric} {value:.2f} vs. baseline {baseline:.2f}")
+        return result
+
+    def baseline(self, route: str, metric: str) -> Optional[float]:
+        values = self._load().get((route, metric), [])[-self.window:]
+        return statistics.median(values) if values else None
+
+    def _load(self) -> Dict[Tuple[str, str], List[float]]:
+        if self._history is None:
+            self._history = {}
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as handle:
+                    for line in handle:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        if entry["time"] >= self.started_at:
+                            continue
+                        for metric, value in entry["metrics"].items():
+                            if value is not None:
+                                self._history.setdefault((entry["route"], metric), []).append(value)
+        return self._history
+
+
+class _CdpBytes:
+    """Sums encoded bytes of finished network requests (Chromium CDP); cross-origin resources included."""
+
+    def __init__(self, page: Any):
+        self.total = 0
+        self.requests = 0
+        self.session = page.context.new_cdp_session(page)
+        self.session.on("Network.loadingFinished", self._on_finished)
+        self.session.send("Network.enable")
+
+    def _on_finished(self, event: Dict[str, Any]) -> None:
+        self.total += event.get("encodedDataLength", 0)
+        self.requests += 1
+
+
+class WebPerfCollector:
+    """Collects Navigation Timing, LCP, CLS, long tasks and bytes around a navigation and checks budgets."""
+
+    def __init__(self, trends: Optional[PerfTrendStore] = None, mode: str = Config.PERF_BUDGETS):
+        self.trends = trends
+        self.mode = mode
+        self.current_test: Optional[str] = None
+        self.stats = {"navigations": 0, "soft": 0, "hard": 0, "regressions": 0}
+        self._pages: "weakref.WeakKeyDictionary[Any, Optional[_CdpBytes]]" = weakref.WeakKeyDictionary()
+
+    def before_navigation(self, page: Any) -> Tuple[int, int]:
+        if page not in self._pages:
+            page.add_init_script(PERF_INIT_SCRIPT)
+            try:
+                self._pages[page] = _CdpBytes(page)
+            except Exception:
+                # Firefox/WebKit: no CDP, bytes come from Resource Timing only
+                self._pages[page] = None
+        cdp = self._pages[page]
+        return (cdp.total, cdp.requests) if cdp is not None else (0, 0)
+
+    def after_navigation(self, page: Any, path: str, budgets: Sequence[PerfBudget], started: Tuple[int, int]) -> PerfRecord:
+        metrics = page.evaluate(COLLECT_SCRIPT)
+        cdp = self._pages.get(page)
+        if cdp is not None and cdp.requests > started[1]:
+            metrics["transferred_kb"] = (cdp.total - started[0]) / 1024
+            metrics["requests"] = cdp.requests - started[1]
+
+        record = PerfRecord(urlsplit(path).path or "/", metrics)
+        for budget in budgets:
+            record.violations.extend((budget.severity, violation) for violation in budget.violations(metrics))
+        if self.trends is not None:
+            record.regressions = self.trends.regressions(record)
+            self.trends.append(record, self.current_test)
+
+        soft = [message for severity, message in record.violations if severity != "hard" or self.mode != "enforce"]
+        hard = [message for severity, message in record.violations if severity == "hard" and self.mode == "enforce"]
+        self.stats["navigations"] += 1
+        self.stats["soft"] += len(soft)
+        self.stats["hard"] += len(hard)
+        self.stats["regressions"] += len(record.regressions)
+        for message in soft:
+            warnings.warn(f"Web-performance budget for {record.route}: {message}")
+        for message in record.regressions:
+            warnings.warn(f"Web-performance regression on {record.route}: {message}")
+        if hard:
+            raise PerfBudgetExceeded(f"Hard web-performance budget exceeded for {record.route}: " + "; ".join(hard))
+        return record
+
+    def summary(self) -> str:
+        return (
+            f"{self.stats['navigations']} navigations measured ({self.mode}): {self.stats['soft']} soft and "
+            f"{self.stats['hard']} hard budget violations, {self.stats['regressions']} regressions vs. trend"
+        )
+
+
+_active_collector: Optional[WebPerfCollector] = None
+
+
+def set_web_perf_collector(collector: Optional[WebPerfCollector]) -> None:
+    global _active_collector
+    _active_collector = collector
+
+
+def get_web_perf_collector() -> Optional[WebPerfCollector]:
+    return _active_collector
+
+
+def perf_records_as_json(records: Sequence[PerfRecord]) -> str:
+    return json.dumps([asdict(record) for record in records], indent=2)
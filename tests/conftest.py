@@ -1,29 +1,362 @@
 import os
 import pytest
 from playwright.sync_api import sync_playwright, Playwright
-from faker import Faker
 import json
+import time
+import warnings
+import allure
 
+from src.utils.artifacts import ArtifactPipeline, TestArtifacts
 from src.utils.config import Config
+from src.utils.browser_pool import BrowserPool
+from src.utils.browser_server import BrowserServer
+from src.utils.checkpoints import CheckpointStore
+from src.utils.data_factory import DataFactory, run_nonce, run_seed
+from src.utils.failure_tracing import FailureTracer
+from src.utils.storage_state_cache import StorageStateCache, storage_state_for_token
+from src.utils.user_pool import UserPool
+from src.utils.har import HarRecordingMissing, HarTape
+from src.utils.resource_policy import ResourceCounters, ResourcePolicy
+from src.utils.local_server import LocalPstServer
+from src.utils.results_store import AllureResultsStore
+from src.utils.sharding import DurationStore, ShardPlan, ShardTracker
+from src.utils.step_timing import StepTimer, get_step_timer, rpc_counter, set_step_timer
+from src.utils.web_perf import (
+    PerfTrendStore, WebPerfCollector, get_web_perf_collector, perf_records_as_json, set_web_perf_collector,
+)
 from src.api.api_client import ApiClient
+from src.api.response_cache import get_response_cache
 from src.pages.home_page import HomePage
 from src.pages.checkout_page import CheckoutPage
 from src.pages.login_page import LoginPage
 
-fake = Faker()
+# Session-wide components that expose a summary() line for the end of the run
+RUN_SUMMARIES_KEY = pytest.StashKey[dict]()
+SHARD_TRACKER_KEY = pytest.StashKey[ShardTracker]()
+SESSION_START_KEY = pytest.StashKey[float]()
+TRACER_KEY = pytest.StashKey[FailureTracer]()
+ARTIFACTS_KEY = pytest.StashKey[ArtifactPipeline]()
+# Reports of the setup/call phases of a test, by phase
+PHASE_REPORTS_KEY = pytest.StashKey[dict]()
+
+def pytest_configure(config):
+    config.stash[RUN_SUMMARIES_KEY] = {}
+    # Fix the test-data seed (and the run's email nonce) before xdist starts its workers, so they all share them
+    run_seed()
+    run_nonce()
+    # The tracker receives pytest_runtest_logreport itself (on the xdist controller: for all workers)
+    tracker = ShardTracker(config.getoption("--shard-index"))
+    config.stash[SHARD_TRACKER_KEY] = tracker
+    config.pluginmanager.register(tracker, "shard-tracker")
+    if Config.STEP_TIMINGS:
+        if not hasattr(config, "workerinput"):
+            StepTimer.clear_exports()
+        timer = StepTimer()
+        set_step_timer(timer)
+        config.stash[RUN_SUMMARIES_KEY]["slowest steps"] = timer
+    tracer = FailureTracer()
+    config.stash[TRACER_KEY] = tracer
+    if tracer.enabled:
+        config.stash[RUN_SUMMARIES_KEY]["tracing"] = tracer
+    response_cache = get_response_cache()
+    if response_cache is not None:
+        config.stash[RUN_SUMMARIES_KEY]["api response cache"] = response_cache
+    pipeline = ArtifactPipeline(allure_dir=getattr(config.option, "allure_report_dir", None))
+    config.stash[ARTIFACTS_KEY] = pipeline
+    config.stash[RUN_SUMMARIES_KEY]["artifacts"] = pipeline
+    if Config.PERF_BUDGETS != "off":
+        collector = WebPerfCollector(PerfTrendStore())
+        set_web_perf_collector(collector)
+        config.stash[RUN_SUMMARIES_KEY]["web performance"] = collector
+
+def pytest_addoption(parser):
+    group = parser.getgroup("sharding", "duration-aware test sharding")
+    group.addoption("--shard-count", type=int, default=1, help="number of CI nodes the suite is split across")
+    group.addoption("--shard-index", type=int, default=0, help="0-based index of this CI node")
+    group.addoption("--shard-workers", type=int, default=1,
+                    help="workers per node; balances tests into xdist groups (run with -n M --dist loadgroup)")
+    group.addoption("--shard-durations-digest", default=None,
+                    help="expected fingerprint of the durations store (python -m src.utils.sharding digest); "
+                         "on a mismatch the node splits without durations, like every other node would")
+
+def pytest_sessionstart(session):
+    session.config.stash[SESSION_START_KEY] = time.perf_counter()
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """
+    Splits the suite across CI nodes and workers, longest (historical) duration first.
+    Runs before xdist's own hook so the xdist_group markers are honoured by --dist loadgroup.
+    """
+    nodes, workers = config.getoption("--shard-count"), config.getoption("--shard-workers")
+    if nodes <= 1 and workers <= 1:
+        return
+
+    node = config.getoption("--shard-index")
+    # Every node plans for itself, so all of them must plan from identical input: only the shared
+    # durations store, not the node's local allure-results
+    durations = DurationStore(allure_dirs=()) if nodes > 1 else DurationStore()
+    expected_digest = config.getoption("--shard-durations-digest")
+    if expected_digest and durations.digest() != expected_digest:
+        warnings.warn(f"Test durations differ from the run's ({durations.digest()} != {expected_digest}): "
+                      "splitting without them, so every node still computes the same plan")
+        durations.durations = {}
+    plan = ShardPlan(items, durations, nodes, workers)
+    selected = [item for item in items if plan.assignment[item.nodeid][0] == node]
+    deselected = [item for item in items if plan.assignment[item.nodeid][0] != node]
+    if workers > 1:
+        for item in selected:
+            item.add_marker(pytest.mark.xdist_group(f"shard-worker-{plan.assignment[item.nodeid][1]}"))
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+    config.stash[SHARD_TRACKER_KEY].save_plan(plan)
+
+def pytest_sessionfinish(session):
+    timer = get_step_timer()
+    if timer is not None and hasattr(session.config, "workerinput"):
+        timer.export()
+    elif timer is not None:
+        # The controller (or plain pytest) writes the suite-wide summary; xdist workers have exported theirs by now
+        timer.merge_worker_exports()
+        timer.export(name="session")
+    rpc_counter.uninstall()
+    # Every worker drains its own pipeline; Allure has written all of its test results by now
+    session.config.stash[ARTIFACTS_KEY].close()
+
+    # Only the process that saw every test report (controller / plain pytest) updates history
+    config = session.config
+    if hasattr(config, "workerinput"):
+        return
+    tracker = config.stash[SHARD_TRACKER_KEY]
+    if tracker.durations:
+        DurationStore().update(tracker.durations)
+    sharded = config.getoption("--shard-count") > 1 or config.getoption("--shard-workers") > 1
+    if sharded and tracker.finish(time.perf_counter() - config.stash[SESSION_START_KEY]) is not None:
+        config.stash[RUN_SUMMARIES_KEY]["shard makespan"] = tracker
+
+@pytest.hookimpl(trylast=True)
+def pytest_unconfigure(config):
+    """
+    Removes the failure tracer's step listener. With ALLURE_COMPACT=true the controller rolls everything
+    in --alluredir into the results store, prunes old runs and writes only the latest run back
+    (deduplicated), so the directory stops growing.
+    """
+    if TRACER_KEY in config.stash:
+        config.stash[TRACER_KEY].close()
+    alluredir = getattr(config.option, "allure_report_dir", None)
+    if not Config.ALLURE_COMPACT or not alluredir or hasattr(config, "workerinput"):
+        return
+    store = AllureResultsStore()
+    store.compact([alluredir])
+    store.prune(keep_runs=Config.ALLURE_KEEP_RUNS)
+    store.materialize(alluredir)
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Keeps the phase reports on the item, so fixtures can tell at teardown whether the test failed."""
+    outcome = yield
+    report = outcome.get_result()
+    item.stash.setdefault(PHASE_REPORTS_KEY, {})[report.when] = report
+
+# Fixture setup/teardown timings: teardown starts when our finalizer (registered right after
+# setup, so it runs first) fires and ends in pytest_fixture_post_finalizer
+_fixture_teardown_starts = {}
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    timer = get_step_timer()
+    start, rpcs = time.perf_counter(), rpc_counter.count
+    yield
+    if timer is None or fixturedef.argname == "step_timings":
+        return
+    timer.record(f"fixture {fixturedef.argname} setup", "fixture", (time.perf_counter() - start) * 1000, rpc_counter.count - rpcs)
+
+    def mark_teardown_start():
+        _fixture_teardown_starts[id(fixturedef)] = (time.perf_counter(), rpc_counter.count)
+    fixturedef.addfinalizer(mark_teardown_start)
+
+def pytest_fixture_post_finalizer(fixturedef, request):
+    timer = get_step_timer()
+    started = _fixture_teardown_starts.pop(id(fixturedef), None)
+    if timer is not None and started is not None:
+        start, rpcs = started
+        timer.record(f"fixture {fixturedef.argname} teardown", "fixture", (time.perf_counter() - start) * 1000, rpc_counter.count - rpcs)
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Prints metrics (browser launches, cache hits, ...) of the session components."""
+    for title, component in config.stash.get(RUN_SUMMARIES_KEY, {}).items():
+        terminalreporter.write_sep("-", title)
+        terminalreporter.write_line(component.summary())
+
+@pytest.fixture(autouse=True)
+def step_timings(request):
+    """Scopes step timings (and web-performance trend entries) to the current test; attaches the timings to Allure."""
+    collector = get_web_perf_collector()
+    if collector is not None:
+        # Trend entries are tagged with the test that navigated
+        collector.current_test = request.node.nodeid
+    timer = get_step_timer()
+    if timer is None:
+        yield
+        return
+    timer.start_test(request.node.nodeid)
+    yield
+    records = timer.finish_test()
+    if records:
+        allure.attach(json.dumps([vars(record) for record in records], indent=2), name="step-timings", attachment_type=allure.attachment_type.JSON)
+
+@pytest.fixture(scope="session", autouse=True)
+def local_server():
+    """
+    Starts the in-process PST API stand-in when LOCAL_SERVER=true (Config.BASE_API_URL then points at it).
+    Autouse, so it is up before any session fixture (e.g. the user pool) talks to the API.
+    """
+    if not Config.LOCAL_SERVER:
+        yield None
+        return
+    server = LocalPstServer(port=Config.LOCAL_SERVER_PORT).start()
+    yield server
+    server.stop()
+
+@pytest.fixture(scope="session")
+def browser_pool(playwright: Playwright, pytestconfig):
+    """
+    One long-lived browser per pytest/xdist worker.
+    Launching Chromium dominates wall time, so tests only create (cheap) contexts on it.
+    With a warm browser server running (BROWSER_SERVER=auto) the worker connects to it instead of launching,
+    unless the server's headless setting differs from HEADLESS.
+    """
+    warm_server = BrowserServer() if Config.BROWSER_SERVER == "auto" else None
+    state = warm_server.read() if warm_server is not None else None
+    if state is not None and state["headless"] != Config.HEADLESS:
+        # A headed run must not silently get the headless daemon (or vice versa)
+        warnings.warn(f"Warm browser server is {'headless' if state['headless'] else 'headed'}, "
+                      f"HEADLESS={Config.HEADLESS}: launching locally")
+        warm_server = None
+    if warm_server is not None:
+        ws_endpoint = warm_server.lease()
+    else:
+        ws_endpoint = Config.BROWSER_SERVER if Config.BROWSER_SERVER.startswith("ws") else None
+    pool = BrowserPool(playwright, ws_endpoint=ws_endpoint)
+    pytestconfig.stash[RUN_SUMMARIES_KEY]["browser pool"] = pool
+    yield pool
+    pool.close()
+    if warm_server is not None:
+        warm_server.release()
+
+@pytest.fixture(scope="session")
+def storage_state_cache(pytestconfig):
+    """On-disk cache of authenticated storage states, shared by all xdist workers."""
+    cache = StorageStateCache()
+    # Tokens of users dropped from the pool (or of an old TEST_USER_PASSWORD) would otherwise stay forever
+    cache.evict_expired()
+    pytestconfig.stash[RUN_SUMMARIES_KEY]["storage-state cache"] = cache
+    return cache
+
+@pytest.fixture
+def network_tape(request):
+    """
+    Per-test HAR tape shared by the browser contexts and the ApiClient of the test.
+    NETWORK_MODE=record captures the backend traffic, NETWORK_MODE=replay serves it offline,
+    and the default "live" mode yields None.
+    """
+    if Config.NETWORK_MODE not in ("record", "replay"):
+        yield None
+        return
+
+    try:
+        tape = HarTape.for_test(request.node.nodeid, Config.NETWORK_MODE)
+    except HarRecordingMissing as error:
+        pytest.fail(str(error))
+    if tape.is_stale:
+        warnings.warn(f"HAR recording {tape.path} is older than {Config.HAR_MAX_AGE_DAYS} days, re-record it with NETWORK_MODE=record")
+
+    yield tape
+
+    if tape.mode == "record":
+        tape.save()
+    elif tape.missing:
+        message = f"{len(tape.missing)} request(s) had no recording in {tape.path}:\n" + "\n".join(sorted(set(tape.missing)))
+        allure.attach(message, name="har-missing-requests", attachment_type=allure.attachment_type.TEXT)
+        warnings.warn(message)
 
 @pytest.fixture(scope="session")
-def context(playwright: Playwright):
+def resource_policy(pytestconfig):
+    """
+    Blocks analytics/fonts/images and disk-caches hashed static bundles (RESOURCE_POLICY=true enables it).
+    Never applied while PERF_BUDGETS are checked: blocked images and cached bundles would skew LCP and bytes.
+    """
+    if not Config.RESOURCE_POLICY or Config.PERF_BUDGETS != "off":
+        return None
+    policy = ResourcePolicy()
+    pytestconfig.stash[RUN_SUMMARIES_KEY]["resource policy"] = policy
+    return policy
+
+@pytest.fixture
+def artifacts(request) -> TestArtifacts:
+    """
+    Captures screenshots, DOM snapshots and logs of the current test without waiting for their I/O,
+    e.g. `artifacts.screenshot(page, "after-login")`. They are attached to Allure at the end of the run.
+    """
+    return request.config.stash[ARTIFACTS_KEY].for_test(request.node.nodeid)
+
+@pytest.fixture
+def context_factory(request, artifacts: TestArtifacts, browser_pool: BrowserPool, network_tape, resource_policy):
     """
-    Sets up the default browser context (headless mode according to config).
-    We use scope="session" to avoid opening/closing the browser for every test if possible,
-    but Playwright typically manages contexts per test. For a portfolio, per-test context is cleaner.
+    Creates pooled browser contexts for the current test with the network tape and the
+    resource policy applied, traced according to TRACE_MODE. Every context it created is closed at teardown;
+    when the test failed, a screenshot and a DOM snapshot of its open pages go to the artifact pipeline first.
     """
-    browser = playwright.chromium.launch(headless=Config.HEADLESS)
-    context = browser.new_context(base_url=Config.BASE_UI_URL)
-    yield context
-    context.close()
-    browser.close()
+    contexts = []
+    counters = ResourceCounters()
+    tracer = request.config.stash[TRACER_KEY]
+
+    def new_context(**options):
+        context = browser_pool.new_context(**options)
+        # Routes registered last run first: the policy handles its requests, the rest falls back to the tape
+        if network_tape is not None:
+            network_tape.attach(context)
+        if resource_policy is not None:
+            contexts.append((context, resource_policy.apply(context, network_tape)))
+        else:
+            contexts.append((context, None))
+        tracer.attach(context, request.node.nodeid)
+        return context
+
+    yield new_context
+
+    # Traces must be stopped (and failure snapshots taken) while their contexts are still open
+    reports = request.node.stash.get(PHASE_REPORTS_KEY, {})
+    failed = any(report.failed for report in reports.values())
+    if failed:
+        for context, _ in contexts:
+            for page in context.pages:
+                try:
+                    artifacts.screenshot(page, "failure", keep=True)
+                    artifacts.dom_snapshot(page, "failure-dom", keep=True)
+                except Exception:
+                    # Crashed or closing page: the trace (if any) still has its last state
+                    continue
+    keep = failed or request.node.get_closest_marker("flaky") is not None
+    for path in tracer.finish(request.node.nodeid, keep=keep, artifacts=artifacts):
+        allure.attach.file(path, name=os.path.basename(path), extension=path.rsplit(".", 1)[-1])
+
+    for context, context_counters in contexts:
+        browser_pool.release(context)
+        if context_counters is not None:
+            counters.add(context_counters)
+    if resource_policy is not None:
+        resource_policy.totals.add(counters)
+        allure.attach(json.dumps(vars(counters), indent=2), name="resource-policy", attachment_type=allure.attachment_type.JSON)
+
+@pytest.fixture
+def context(context_factory):
+    """
+    Sets up an isolated browser context per test (headless mode according to config).
+    The browser itself is shared through the pool, so a fresh context is cheap.
+    """
+    return context_factory()
 
 @pytest.fixture
 def page(context):
@@ -36,39 +369,32 @@ def page(context):
     page.close()
 
 @pytest.fixture
-def api(playwright: Playwright):
+def api(network_tape):
     """
-    Provides an APIRequestContext configured with the BASE_API_URL.
+    Provides an ApiClient configured with the BASE_API_URL.
     """
-    request_context = playwright.request.new_context(base_url=Config.BASE_API_URL)
-    api_client = ApiClient(request_context)
+    api_client = ApiClient(Config.BASE_API_URL, tape=network_tape)
     yield api_client
-    request_context.dispose()
+    api_client.dispose()
+
+@pytest.fixture(scope="session")
+def data_factory(pytestconfig):
+    """
+    Seeded per-worker factory of user/address/payment records, prefilled in batches on a background thread.
+    Set DATA_SEED to reproduce the data of a previous run (its seed is printed in the terminal summary).
+    """
+    factory = DataFactory()
+    pytestconfig.stash[RUN_SUMMARIES_KEY]["test data"] = factory
+    yield factory
+    factory.close()
 
 @pytest.fixture
-def random_user():
-    """Generates random user data using Faker."""
-    # Generating a unique password to avoid the 'data leak' validation rule
-    unique_password = fake.password(length=12, special_chars=True, digits=True, upper_case=True, lower_case=True) + "A1!xZ"
-    
-    return {
-        "first_name": fake.first_name(),
-        "last_name": fake.last_name(),
-        "email": fake.email(),
-        "password": unique_password,
-        "dob": "1990-01-01",
-        "phone": "5555555555",
-        "address": {
-            "street": fake.street_address(),
-            "city": fake.city(),
-            "state": fake.state(),
-            "country": fake.country_code(),
-            "postal_code": fake.postcode()
-        }
-    }
+def random_user(data_factory: DataFactory):
+    """A unique registration payload from the data factory."""
+    return data_factory.user()
 
 @pytest.fixture
-def authenticated_context(playwright: Playwright, api, random_user):
+def authenticated_context(context_factory, api, random_user):
     """
     The "Magic" fixture.
     Registers a user via API, logs them in via API, and injects the JWT token 
@@ -78,42 +404,111 @@ def authenticated_context(playwright: Playwright, api, random_user):
     api.register_user(random_user)
 
     # 2. API Setup: Login and get Token
+    # In PST, authentication is managed via localStorage['auth-token'], so the token is
+    # turned into a Playwright storage_state instead of opening a page just to call setItem.
+    # The user is new to every test, so its state is never cached on disk.
     token = api.login(random_user["email"], random_user["password"])
+    storage_state = storage_state_for_token(token, Config.BASE_UI_URL)
 
-    # 3. UI Setup: Create browser context with injected LocalStorage state
-    browser = playwright.chromium.launch(headless=Config.HEADLESS)
-    
-    # We construct a fake storage state dict matching Playwright's format
-    # In PST, authentication is usually managed via localStorage
-    # We must ensure we navigate to the domain first before injecting local storage, 
-    # or use Playwright's init_script.
-    
-    context = browser.new_context(base_url=Config.BASE_UI_URL)
-    
-    # Navigate briefly to the base URL so we can set localStorage for that origin
-    page = context.new_page()
-    page.goto(Config.BASE_UI_URL)
-    
-    # Inject token into localStorage (assuming PST uses a specific key like 'auth-token')
-    # We will assume a generic implementation, but this might need adjustment based on the exact app.
-    page.evaluate(f"window.localStorage.setItem('auth-token', '{token}')")
-    
-    # Close the temporary page, the context now holds the state
-    page.close()
+    # 3. UI Setup: Create browser context (on the pooled browser) with the injected state
+    return context_factory(storage_state=storage_state)
 
-    yield context
-    context.close()
-    browser.close()
+@pytest.fixture
+def customer_context(context_factory, storage_state_cache: StorageStateCache, api):
+    """
+    Context logged in as the shared TEST_USER_EMAIL account. Its token is cached on disk,
+    so the login happens once per token lifetime for all workers and runs.
+    """
+    storage_state = storage_state_cache.get_or_create(
+        Config.TEST_USER_EMAIL, Config.BASE_UI_URL,
+        lambda: api.login(Config.TEST_USER_EMAIL, Config.TEST_USER_PASSWORD),
+    )
+    return context_factory(storage_state=storage_state)
+
+@pytest.fixture(scope="session")
+def user_pool(pytestconfig, data_factory: DataFactory):
+    """
+    Pool of pre-registered users shared by all xdist workers.
+    Registers the missing users concurrently on first use (or reuses the persisted pool file).
+    """
+    api_client = ApiClient(Config.BASE_API_URL)
+    pool = UserPool(data_factory.user, api_client)
+    pool.provision()
+    pytestconfig.stash[RUN_SUMMARIES_KEY]["user pool"] = pool
+    yield pool
+    pool.close()
+    api_client.dispose()
+
+@pytest.fixture
+def pooled_user(user_pool: UserPool):
+    """
+    Leases an already registered user with a valid `token` for the duration of the test.
+    Use it instead of `random_user` when the test does not need a brand-new account.
+    """
+    user = user_pool.lease()
+    yield user
+    user_pool.release(user)
+
+@pytest.fixture
+def pooled_context(context_factory, storage_state_cache: StorageStateCache, pooled_user):
+    """
+    Same as `authenticated_context`, but for a leased pool user: no registration and no login.
+    """
+    storage_state = storage_state_cache.get_or_create(
+        pooled_user["email"], Config.BASE_UI_URL, lambda: pooled_user["token"]
+    )
+    return context_factory(storage_state=storage_state)
+
+@pytest.fixture(scope="session")
+def checkpoints(pytestconfig):
+    """Mid-flow snapshots (storage state + server-side cart) shared by the tests and workers of a run."""
+    api_client = ApiClient(Config.BASE_API_URL)
+    store = CheckpointStore(api_client)
+    pytestconfig.stash[RUN_SUMMARIES_KEY]["checkpoints"] = store
+    yield store
+    api_client.dispose()
+
+@pytest.fixture
+def fork_checkpoint(checkpoints: CheckpointStore, context_factory, api, data_factory: DataFactory):
+    """
+    Returns `fork(spec) -> page`: a page started from the checkpoint, with its own copy of the cart.
+    The first test that needs a checkpoint captures it with a freshly registered user.
+    """
+    def new_context(storage_state=None):
+        if storage_state is None:
+            user = data_factory.user()
+            api.register_user(user)
+            storage_state = storage_state_for_token(api.login(user["email"], user["password"]), Config.BASE_UI_URL)
+        return context_factory(storage_state=storage_state)
+
+    return lambda spec: checkpoints.fork(spec, new_context)
 
 # Page Object Fixtures
+def attach_readiness_timings(page_object) -> None:
+    """
+    Attaches every readiness wait of a page object (and the time saved vs. networkidle) to Allure,
+    plus its web-performance records when PERF_BUDGETS is enabled.
+    """
+    if page_object.readiness_timings:
+        records = [dict(vars(timing), saved_ms=timing.saved_ms) for timing in page_object.readiness_timings]
+        allure.attach(json.dumps(records, indent=2), name="readiness-timings", attachment_type=allure.attachment_type.JSON)
+    if page_object.perf_records:
+        allure.attach(perf_records_as_json(page_object.perf_records), name="web-performance", attachment_type=allure.attachment_type.JSON)
+
 @pytest.fixture
-def home_page(page):
-    return HomePage(page)
+def home_page(page, api):
+    home_page = HomePage(page, api)
+    yield home_page
+    attach_readiness_timings(home_page)
 
 @pytest.fixture
 def checkout_page(page):
-    return CheckoutPage(page)
+    checkout_page = CheckoutPage(page)
+    yield checkout_page
+    attach_readiness_timings(checkout_page)
 
 @pytest.fixture
 def login_page(page):
-    return LoginPage(page)
+    login_page = LoginPage(page)
+    yield login_page
+    attach_readiness_timings(login_page)
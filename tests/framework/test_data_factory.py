@@ -0,0 +1,68 @@
+import pytest
+import allure
+
+from src.utils.data_factory import PAYMENT_METHODS, DataFactory
+
+
+def take(count, **options):
+    factory = DataFactory(batch_size=10, **options)
+    try:
+        return factory.records(count)
+    finally:
+        factory.close()
+
+
+@allure.feature("Test Data Factory")
+@allure.story("Reproducibility")
+@pytest.mark.framework
+def test_same_seed_reproduces_records_except_the_run_nonce(monkeypatch):
+    monkeypatch.setenv("DATA_RUN_NONCE", "aaaaaa")
+    first = take(25, seed=1234, worker_id="gw0")
+    monkeypatch.setenv("DATA_RUN_NONCE", "bbbbbb")
+    second = take(25, seed=1234, worker_id="gw0")
+
+    strip_email = [{key: value for key, value in user.items() if key != "email"} for user in first]
+    assert strip_email == [{key: value for key, value in user.items() if key != "email"} for user in second]
+    assert [user["email"].replace(".aaaaaa@", "@") for user in first] == \
+        [user["email"].replace(".bbbbbb@", "@") for user in second]
+    assert first[0]["email"] != second[0]["email"]
+
+
+@allure.feature("Test Data Factory")
+@allure.story("Uniqueness")
+@pytest.mark.framework
+def test_records_are_unique_within_and_across_workers():
+    users = take(100, seed=1234, worker_id="gw0") + take(100, seed=1234, worker_id="gw1")
+
+    assert len({user["email"] for user in users}) == 200
+    assert len({user["password"] for user in users}) == 200
+    assert users[0]["first_name"] != users[100]["first_name"] or users[0]["last_name"] != users[100]["last_name"]
+
+
+@allure.feature("Test Data Factory")
+@allure.story("Schemas")
+@pytest.mark.framework
+def test_schema_variants():
+    factory = DataFactory(seed=7, worker_id="gw0", batch_size=5)
+    try:
+        assert "phone" not in factory.record("registration_required")
+        assert set(factory.record("billing")) == {"address", "city", "state", "country", "postcode"}
+        card = factory.record("payment", method="Credit Card")
+        assert card["method"] == "Credit Card" and card["cvv"].isdigit()
+        assert factory.record("payment")["method"] in PAYMENT_METHODS
+    finally:
+        factory.close()
+
+
+@allure.feature("Test Data Factory")
+@allure.story("Prefill thread")
+@pytest.mark.framework
+def test_prefill_failure_is_raised_in_the_test(monkeypatch):
+    def broken_profile(self, fake, rng):
+        raise RuntimeError("provider missing")
+
+    monkeypatch.setattr(DataFactory, "_profile", broken_profile)
+    factory = DataFactory(seed=1, worker_id="gw0")
+    with pytest.raises(RuntimeError, match="provider missing"):
+        factory.user()
+    factory.close()
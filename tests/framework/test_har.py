@@ -0,0 +1,50 @@
+import json
+
+import pytest
+import allure
+
+from src.utils.har import HarRecordingMissing, HarTape, request_key
+
+
+@allure.feature("HAR Record/Replay")
+@allure.story("Request matching")
+@pytest.mark.framework
+def test_request_key_ignores_volatile_parts():
+    url = "https://api.example.com/products?page=2&by_category=01H&_=1700000000"
+    assert request_key("get", url, None) == request_key("GET", "https://api.example.com/products?by_category=01H&page=2", None)
+    assert request_key("GET", url, None) != request_key("GET", "https://api.example.com/products?page=3&by_category=01H", None)
+
+    first = json.dumps({"email": "a-1@example.com", "password": "x", "address": {"city": "Gent"}, "plan": "basic"})
+    second = json.dumps({"plan": "basic", "address": {"city": "Oslo"}, "password": "y", "email": "b-2@example.com"})
+    other_plan = json.dumps({"email": "a-1@example.com", "password": "x", "address": {"city": "Gent"}, "plan": "pro"})
+    assert request_key("POST", "https://api.example.com/users/register", first) == \
+        request_key("POST", "https://api.example.com/users/register", second)
+    assert request_key("POST", "https://api.example.com/users/register", first) != \
+        request_key("POST", "https://api.example.com/users/register", other_plan)
+
+
+@allure.feature("HAR Record/Replay")
+@allure.story("Replay")
+@pytest.mark.framework
+def test_recorded_responses_replay_in_order(tmp_path):
+    path = str(tmp_path / "test.har")
+    recorder = HarTape(path, "record")
+    for count in (1, 2):
+        recorder.record("GET", "https://api.example.com/carts/1", None, 200, "OK",
+                        {"content-type": "application/json", "content-length": "9"},
+                        json.dumps({"items": count}).encode(), 12.5)
+    recorder.record("GET", "https://cdn.example.com/logo.png", None, 200, "OK",
+                    {"content-type": "image/png"}, b"\x89PNG\x00", 3.0)
+    recorder.save()
+
+    replayer = HarTape(path, "replay")
+    bodies = [json.loads(replayer.lookup("GET", "https://api.example.com/carts/1", None)["body"]) for _ in range(3)]
+    # Identical requests get the recorded responses in order, the last one repeats
+    assert bodies == [{"items": 1}, {"items": 2}, {"items": 2}]
+    assert "content-length" not in replayer.lookup("GET", "https://api.example.com/carts/1", None)["headers"]
+    assert replayer.lookup("GET", "https://cdn.example.com/logo.png", None)["body"] == b"\x89PNG\x00"
+
+    assert replayer.lookup("GET", "https://api.example.com/carts/2", None) is None
+    assert replayer.missing == [request_key("GET", "https://api.example.com/carts/2", None)]
+    with pytest.raises(HarRecordingMissing):
+        HarTape(str(tmp_path / "missing.har"), "replay")
@@ -0,0 +1,51 @@
+import pytest
+import allure
+
+from src.utils.load_test import SCENARIOS, LatencyHistogram, LoadTest, Scenario
+from src.utils.local_server import LocalPstServer
+
+
+@pytest.fixture
+def local_server():
+    server = LocalPstServer(port=0).start()
+    yield server
+    server.stop()
+
+
+@allure.feature("Load Test")
+@allure.story("Histogram")
+@pytest.mark.framework
+def test_histogram_percentiles_within_bucket_precision():
+    histogram = LatencyHistogram()
+    for elapsed_ms in range(1, 1001):
+        histogram.record(elapsed_ms)
+    other = LatencyHistogram()
+    other.record(5000)
+    histogram.merge(other)
+
+    stats = histogram.to_dict()
+    assert stats["count"] == 1001 and stats["min_ms"] == 1 and stats["max_ms"] == 5000
+    for percent, exact in ((50, 500), (95, 950), (99, 990)):
+        assert exact <= stats[f"p{percent}_ms"] <= exact * (1 + 2 ** -7)
+
+
+@allure.feature("Load Test")
+@allure.story("Smoke run")
+@pytest.mark.framework
+def test_api_scenarios_against_the_local_server(local_server, capsys):
+    async def broken(client, data, recorder):
+        raise ValueError("scenario bug")
+
+    scenarios = [SCENARIOS["browse"], SCENARIOS["shop"], Scenario("broken", 1, broken)]
+    summary = LoadTest(scenarios, users=4, duration=1, ramp_up=0, think_time=0.05,
+                       base_url=local_server.url).run()
+
+    assert summary["iterations"] > 0 and summary["dropped_arrivals"] == 0
+    latencies = summary["latencies"]
+    for key in ("scenario browse", "scenario shop", "step shop.add_to_cart", "api GET /products", "api POST /users/login"):
+        assert latencies[key]["count"] > 0, key
+        assert latencies[key]["p50_ms"] <= latencies[key]["p99_ms"] <= latencies[key]["max_ms"]
+    assert latencies["scenario shop"]["errors"] == {}
+    assert latencies["scenario broken"]["errors"] == {"ValueError": latencies["scenario broken"]["count"]}
+    # Only the first failure of a scenario and exception type prints its traceback
+    assert capsys.readouterr().err.count("Traceback") == 1
@@ -0,0 +1,93 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+import allure
+
+from src.utils.local_server import PAGE_SIZE, LocalPstServer
+
+
+@pytest.fixture
+def local_server():
+    server = LocalPstServer(port=0).start()
+    yield server
+    server.stop()
+
+
+def call(server, method, path, body=None, headers=None):
+    """(status, headers, parsed JSON body) of one request; HTTP errors are returned, not raised."""
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(server.url + path, data=data, method=method,
+                                     headers={"Content-Type": "application/json", **(headers or {})})
+    try:
+        with urllib.request.urlopen(request) as response:
+            status, response_headers, raw = response.status, response.headers, response.read()
+    except urllib.error.HTTPError as error:
+        status, response_headers, raw = error.code, error.headers, error.read()
+    return status, response_headers, json.loads(raw) if raw else None
+
+
+def register_and_login(server, email):
+    user = {"first_name": "Jane", "last_name": "Doe", "email": email, "password": "Sup3r$ecret!"}
+    assert call(server, "POST", "/users/register", user)[0] == 201
+    status, _, body = call(server, "POST", "/users/login", {"email": email, "password": user["password"]})
+    assert status == 200
+    return {"Authorization": f"Bearer {body['access_token']}"}
+
+
+@allure.feature("Local Stand-in Server")
+@allure.story("Users")
+@pytest.mark.framework
+def test_register_login_and_me(local_server):
+    auth = register_and_login(local_server, "Jane@Example.com")
+    assert call(local_server, "GET", "/users/me", headers=auth)[2]["email"] == "jane@example.com"
+
+    assert call(local_server, "POST", "/users/register", {"first_name": "x", "last_name": "y",
+                                                           "email": "jane@example.com", "password": "p"})[0] == 422
+    assert call(local_server, "POST", "/users/login", {"email": "jane@example.com", "password": "wrong"})[0] == 401
+    assert call(local_server, "GET", "/users/me", headers={"Authorization": "Bearer not.a.token"})[0] == 401
+
+
+@allure.feature("Local Stand-in Server")
+@allure.story("Catalog")
+@pytest.mark.framework
+def test_catalog_filters_pages_and_conditional_gets(local_server):
+    status, headers, listing = call(local_server, "GET", "/products?page=1")
+    assert status == 200 and len(listing["data"]) == PAGE_SIZE and listing["last_page"] > 1
+
+    tree = call(local_server, "GET", "/categories/tree")[2]
+    hand_tools = next(category["id"] for category in tree if category["name"] == "Hand Tools")
+    filtered = call(local_server, "GET", f"/products?by_category={hand_tools}&between=price,1,100")[2]
+    assert filtered["data"] and all(product["category"]["name"] == "Hand Tools" and product["price"] <= 100
+                                    for product in filtered["data"])
+    search = call(local_server, "GET", "/products/search?q=plier")[2]
+    assert search["data"] and all("Pliers" in product["name"] for product in search["data"])
+
+    # An unchanged listing is confirmed without a body
+    assert call(local_server, "GET", "/products?page=1", headers={"If-None-Match": headers["ETag"]})[0] == 304
+    # Malformed input is answered, not dropped
+    assert call(local_server, "GET", "/products?between=price,5")[0] == 400
+    assert call(local_server, "GET", "/products?page=x")[0] == 400
+    assert call(local_server, "GET", "/nowhere")[0] == 404
+
+
+@allure.feature("Local Stand-in Server")
+@allure.story("Carts")
+@pytest.mark.framework
+def test_carts_belong_to_their_user(local_server):
+    owner = register_and_login(local_server, "owner@example.com")
+    other = register_and_login(local_server, "other@example.com")
+    product_id = call(local_server, "GET", "/products")[2]["data"][0]["id"]
+
+    cart_id = call(local_server, "POST", "/carts", {}, headers=owner)[2]["id"]
+    assert call(local_server, "POST", f"/carts/{cart_id}", {"product_id": product_id, "quantity": 2}, headers=owner)[0] == 200
+    assert call(local_server, "GET", f"/carts/{cart_id}", headers=owner)[2]["cart_items"][0]["quantity"] == 2
+    assert call(local_server, "GET", f"/carts/{cart_id}", headers=other)[0] == 403
+    assert call(local_server, "POST", f"/carts/{cart_id}", {"product_id": product_id}, headers=other)[0] == 403
+    assert call(local_server, "GET", f"/carts/{cart_id}")[0] == 403
+
+    # Guest carts stay open, and a bad token cannot create one
+    guest_cart = call(local_server, "POST", "/carts", {"product_id": product_id})[2]["id"]
+    assert call(local_server, "GET", f"/carts/{guest_cart}", headers=other)[0] == 200
+    assert call(local_server, "POST", "/carts", {}, headers={"Authorization": "Bearer x.y.z"})[0] == 401
@@ -0,0 +1,44 @@
+import pytest
+import allure
+
+from src.utils.resource_policy import HASHED_BUNDLE_PATTERN, ResourcePolicy
+
+
+@allure.feature("Resource Policy")
+@allure.story("Hashed bundles")
+@pytest.mark.framework
+@pytest.mark.parametrize("name, hashed", [
+    # esbuild application builder (Angular 17+, the current storefront)
+    ("main-ABCD1234.js", True),
+    ("polyfills-FFHMD2TL.js", True),
+    ("chunk-2Q3ZVH2Y.js", True),
+    ("styles-5INURTSO.css", True),
+    # webpack browser builder and Vite
+    ("main.3f2a1b9c8d7e6f50.js", True),
+    ("runtime.0b9b1f4c2e5a7d3f.js", True),
+    ("index-BxD3k9aZ.js", True),
+    ("fa-solid-900.8d7f4e2a.woff2", True),
+    # Unhashed names may change content under the same URL
+    ("main.js", False),
+    ("bootstrap-datepicker.js", False),
+    ("jquery-migrate.min.js", False),
+    ("fa-solid-900.woff2", False),
+    ("main-ABCD1234.js.map", False),
+])
+def test_hashed_bundle_names(name, hashed):
+    assert bool(HASHED_BUNDLE_PATTERN.search(f"https://practicesoftwaretesting.com/{name}")) is hashed
+
+
+@allure.feature("Resource Policy")
+@allure.story("Static bundle cache")
+@pytest.mark.framework
+def test_bundles_are_stored_by_content(tmp_path):
+    policy = ResourcePolicy(cache_dir=str(tmp_path))
+    body = b"console.log('storefront')"
+    policy._store("https://shop/main-ABCD1234.js", body, "text/javascript")
+    policy._store("https://cdn/main-ABCD1234.js", body, "text/javascript")
+
+    assert policy._load("https://shop/main-ABCD1234.js") == (body, "text/javascript")
+    assert policy._load("https://shop/main-EFGH5678.js") is None
+    # Identical content is stored once, whatever the URL
+    assert len(list((tmp_path / "blobs").rglob("*"))) == 2  # one shard directory + one blob
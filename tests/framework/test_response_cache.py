@@ -0,0 +1,95 @@
+import time
+
+import pytest
+import allure
+
+from src.api.api_client import ApiClient
+from src.api.async_api_client import _id_by_name
+from src.api.response_cache import ResponseCache
+from src.utils.local_server import LocalPstServer
+
+JSON = {"content-type": "application/json"}
+
+
+@pytest.fixture
+def local_server():
+    server = LocalPstServer(port=0).start()
+    yield server
+    server.stop()
+
+
+@allure.feature("API Response Cache")
+@allure.story("Freshness")
+@pytest.mark.framework
+def test_entries_are_fresh_for_the_ttl_and_refreshed_by_a_304():
+    cache = ResponseCache(ttl=60)
+    entry = cache.put("GET /products", 200, {**JSON, "etag": '"v1"'}, b"[]")
+    assert cache.get("GET /products") is entry and entry.fresh and entry.etag == '"v1"'
+    assert cache.put("GET /brands", 200, {"cache-control": "no-store"}, b"[]") is None
+
+    entry.expires_at = time.time() - 1
+    assert not cache.get("GET /products").fresh
+    assert cache.refresh("GET /products", entry).fresh and cache.stats["revalidated"] == 1
+    assert cache.cacheable("GET", "/products/01H?x=1") and not cache.cacheable("POST", "/products")
+    assert not cache.cacheable("GET", "/productsearch")
+
+
+@allure.feature("API Response Cache")
+@allure.story("Bounded tiers")
+@pytest.mark.framework
+def test_memory_tier_evicts_least_recently_used_by_bytes():
+    cache = ResponseCache(max_bytes=250)
+    for key in ("a", "b"):
+        cache.put(key, 200, {}, b"x" * 100)
+    cache.get("a")
+    cache.put("c", 200, {}, b"x" * 100)
+
+    assert cache.get("b") is None and cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats["evictions"] == 1
+    # An entry larger than the whole tier is not kept at all
+    cache.put("huge", 200, {}, b"x" * 300)
+    assert cache.get("huge") is None and cache.get("a") is not None
+
+
+@allure.feature("API Response Cache")
+@allure.story("Bounded tiers")
+@pytest.mark.framework
+def test_disk_tier_is_shared_and_capped(tmp_path):
+    writer = ResponseCache(directory=str(tmp_path), max_disk_bytes=1000)
+    writer.put("GET /categories", 200, JSON, b"x" * 300)
+    reader = ResponseCache(directory=str(tmp_path), max_disk_bytes=1000)
+    assert reader.get("GET /categories").body == b"x" * 300 and reader.stats["disk_hits"] == 1
+
+    for key in ("GET /brands", "GET /products?page=1", "GET /products?page=2"):
+        writer.put(key, 200, JSON, b"x" * 300)
+        time.sleep(0.01)
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.json")) <= 1000
+    assert writer.stats["disk_evictions"] >= 1
+    assert ResponseCache(directory=str(tmp_path)).get("GET /products?page=2") is not None
+
+
+@allure.feature("API Response Cache")
+@allure.story("Revalidation")
+@pytest.mark.framework
+def test_client_revalidates_stale_entries_with_their_etag(local_server):
+    cache = ResponseCache(ttl=0)
+    api = ApiClient(local_server.url, cache=cache)
+    try:
+        first = api.get_brands()
+        assert api.get_brands() == first
+        assert cache.stats["misses"] == 1 and cache.stats["revalidated"] == 1
+        assert [timing.status for timing in api.timings] == [200, 304]
+    finally:
+        api.dispose()
+
+
+@allure.feature("API Response Cache")
+@allure.story("Names to ids")
+@pytest.mark.framework
+def test_id_by_name_searches_sub_categories():
+    tree = [{"id": "1", "name": "Hand Tools", "sub_categories": [{"id": "2", "name": "Hammer", "sub_categories": []}]},
+            {"id": "3", "name": "Power Tools"}]
+    assert _id_by_name(tree, "hammer", "category") == "2"
+    assert _id_by_name(tree, "Power Tools", "category") == "3"
+    with pytest.raises(AssertionError, match="Unknown brand 'Acme'"):
+        _id_by_name(tree, "Acme", "brand")
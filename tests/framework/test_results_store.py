@@ -0,0 +1,50 @@
+import json
+import os
+import uuid
+from types import SimpleNamespace
+
+import pytest
+import allure
+
+from src.utils.config import Config
+from src.utils.results_store import AllureResultsStore
+from tests.conftest import pytest_unconfigure
+
+
+def write_run(alluredir: str) -> None:
+    """One test result with a screenshot attachment, as allure-pytest writes it."""
+    attachment = f"{uuid.uuid4()}-attachment.png"
+    with open(os.path.join(alluredir, attachment), "wb") as handle:
+        handle.write(b"same screenshot every run")
+    result = {"uuid": str(uuid.uuid4()), "name": "test_example", "status": "passed",
+              "attachments": [{"name": "screenshot", "source": attachment, "type": "image/png"}]}
+    with open(os.path.join(alluredir, f"{result['uuid']}-result.json"), "w", encoding="utf-8") as handle:
+        json.dump(result, handle)
+
+
+@allure.feature("Allure Results Store")
+@allure.story("Compaction at the end of the run")
+@pytest.mark.framework
+def test_compaction_keeps_results_and_store_flat(tmp_path, monkeypatch):
+    """
+    Runs the end-of-run hook twice: the files it materialized after the first run must not be
+    archived again, so the results directory and the stored run stay the same size.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Config, "ALLURE_COMPACT", True)
+    monkeypatch.setattr(Config, "ALLURE_KEEP_RUNS", 5)
+    alluredir = tmp_path / "allure-results"
+    alluredir.mkdir()
+    config = SimpleNamespace(option=SimpleNamespace(allure_report_dir=str(alluredir)), stash=pytest.Stash())
+    store = AllureResultsStore(Config.ALLURE_STORE_DIR)
+
+    sizes = []
+    for _ in range(2):
+        write_run(str(alluredir))
+        pytest_unconfigure(config)
+        latest = store.runs()[-1]
+        blobs = sum(len(files) for _, _, files in os.walk(tmp_path / Config.ALLURE_STORE_DIR / "blobs"))
+        sizes.append((len(os.listdir(alluredir)), latest["documents"], len(latest["attachments"]), blobs))
+
+    assert sizes[0] == sizes[1], f"Sizes grew between runs (files, documents, attachments, blobs): {sizes}"
+    assert sizes[1][1] == 1, "The stored run should hold only the new run's result"
@@ -0,0 +1,62 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+import allure
+
+from src.utils.sharding import EWMA_ALPHA, DurationStore, ShardPlan
+
+
+def items(*nodeids, fixtures=()):
+    return [SimpleNamespace(nodeid=nodeid, fixturenames=fixtures) for nodeid in nodeids]
+
+
+def store(tmp_path, durations):
+    path = tmp_path / "durations.json"
+    path.write_text(json.dumps(durations))
+    return DurationStore(str(path), allure_dirs=())
+
+
+@allure.feature("Sharding")
+@allure.story("Duration history")
+@pytest.mark.framework
+def test_durations_are_smoothed_and_estimated(tmp_path):
+    durations = store(tmp_path, {"tests/a.py::slow": 10.0, "tests/a.py::fast": 2.0, "tests/b.py::other": 30.0})
+    durations.update({"tests/a.py::slow": 20.0, "tests/c.py::new": 5.0})
+
+    reloaded = DurationStore(durations.path, allure_dirs=())
+    assert reloaded.durations["tests/a.py::slow"] == pytest.approx(EWMA_ALPHA * 20 + (1 - EWMA_ALPHA) * 10)
+    assert reloaded.durations["tests/c.py::new"] == 5.0
+
+    assert reloaded.estimate("tests/a.py::slow[param]") == (reloaded.durations["tests/a.py::slow"], True)
+    # Unknown tests: median of their module, else of the suite
+    assert reloaded.estimate("tests/b.py::unknown") == (30.0, False)
+    assert reloaded.estimate("tests/d.py::unknown")[1] is False
+    assert reloaded.digest() == DurationStore(durations.path, allure_dirs=()).digest()
+    assert reloaded.digest() != durations.digest()
+
+
+@allure.feature("Sharding")
+@allure.story("LPT plan")
+@pytest.mark.framework
+def test_longest_tests_are_spread_across_nodes_and_workers(tmp_path):
+    durations = {f"tests/t.py::test_{index}": float(seconds) for index, seconds in enumerate([8, 7, 6, 5, 4, 3, 2, 1])}
+    plan = ShardPlan(items(*durations), store(tmp_path, durations), nodes=2, workers=2)
+
+    # 36 s of tests split into four workers of 9 s each
+    assert sorted(load for loads in plan.worker_loads for load in loads) == [9.0, 9.0, 9.0, 9.0]
+    assert plan.predicted_makespan() == 9.0
+    assert set(plan.assignment) == set(durations)
+    assert not plan.unmeasured
+
+
+@allure.feature("Sharding")
+@allure.story("LPT plan")
+@pytest.mark.framework
+def test_tests_sharing_heavy_fixtures_stay_together(tmp_path):
+    heavy = items("tests/hybrid/test_x.py::a", "tests/hybrid/test_x.py::b", fixtures=("pooled_user",))
+    light = items("tests/api/test_y.py::c", "tests/api/test_y.py::d")
+    plan = ShardPlan(heavy + light, store(tmp_path, {}), nodes=1, workers=2)
+
+    assert plan.assignment["tests/hybrid/test_x.py::a"] == plan.assignment["tests/hybrid/test_x.py::b"]
+    assert len(plan.unmeasured) == 4
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+import allure
+
+from src.utils.step_timing import StepTimer, _RpcCounter
+
+
+@allure.feature("Step Timings")
+@allure.story("Session summary")
+@pytest.mark.framework
+def test_controller_merges_worker_exports(tmp_path):
+    directory = str(tmp_path)
+    for worker, elapsed_ms in (("gw0", 30.0), ("gw1", 50.0)):
+        timer = StepTimer(count_rpcs=False)
+        timer.start_test(f"tests/test_{worker}.py::test")
+        timer.record("HomePage.navigate_home", "page", elapsed_ms)
+        timer.record(f"fixture {worker} setup", "fixture", 1.0)
+        timer.export(directory, name=worker)
+
+    controller = StepTimer(count_rpcs=False)
+    assert controller.merge_worker_exports(directory) == 2
+    controller.export(directory, name="session")
+
+    slowest = controller.slowest_steps()
+    assert slowest[0]["step"] == "HomePage.navigate_home"
+    assert slowest[0]["calls"] == 2 and slowest[0]["total_ms"] == 80.0 and slowest[0]["max_ms"] == 50.0
+    assert (tmp_path / "step-timings-session.csv").exists()
+
+    StepTimer.clear_exports(directory)
+    assert not list(tmp_path.iterdir())
+
+
+@allure.feature("Step Timings")
+@allure.story("RPC counts")
+@pytest.mark.framework
+def test_rpc_counts_are_per_thread(monkeypatch):
+    from playwright._impl._connection import Connection
+
+    def send(self, object, method, params, no_reply=False):
+        return None
+
+    monkeypatch.setattr(Connection, "_send_message_to_server", send)
+    counter = _RpcCounter()
+    counter.install()
+    try:
+        assert counter.enabled
+        background = threading.Thread(target=lambda: [Connection._send_message_to_server(None, None, "m", {})
+                                                      for _ in range(5)])
+        background.start()
+        background.join()
+        Connection._send_message_to_server(None, None, "m", {})
+        assert counter.count == 1
+    finally:
+        counter.uninstall()
+    assert Connection._send_message_to_server is send
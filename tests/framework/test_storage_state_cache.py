@@ -0,0 +1,68 @@
+import base64
+import json
+import os
+import threading
+import time
+
+import pytest
+import allure
+
+from src.utils.storage_state_cache import AUTH_TOKEN_KEY, StorageStateCache, decode_jwt_exp
+
+
+def make_jwt(claims: dict) -> str:
+    """Unsigned JWT carrying `claims`: the cache never verifies signatures."""
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"eyJhbGciOiJub25lIn0.{payload}.signature"
+
+
+@allure.feature("Storage-State Cache")
+@allure.story("JWT expiry")
+@pytest.mark.framework
+def test_decode_jwt_exp():
+    assert decode_jwt_exp(make_jwt({"exp": 1700000000})) == 1700000000
+    assert decode_jwt_exp(make_jwt({"sub": "user"})) is None
+    assert decode_jwt_exp("not-a-jwt") is None
+
+
+@allure.feature("Storage-State Cache")
+@allure.story("Login once per token")
+@pytest.mark.framework
+def test_get_or_create_logs_in_once_for_concurrent_misses(tmp_path):
+    """Workers missing the same user wait on the entry's lock and reuse the first login's token."""
+    cache = StorageStateCache(str(tmp_path))
+    token = make_jwt({"exp": time.time() + 3600})
+    logins = []
+
+    def login():
+        logins.append(threading.get_ident())
+        time.sleep(0.2)
+        return token
+
+    threads = [threading.Thread(target=cache.get_or_create, args=("user@example.com", "https://shop", login))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(logins) == 1
+    state = cache.get_or_create("USER@example.com", "https://shop/", login)
+    assert state["origins"][0]["localStorage"] == [{"name": AUTH_TOKEN_KEY, "value": token}]
+    assert cache.stats["hits"] == 4 and cache.stats["misses"] == 1
+
+
+@allure.feature("Storage-State Cache")
+@allure.story("Eviction")
+@pytest.mark.framework
+def test_expired_entries_are_relogged_and_evicted(tmp_path):
+    cache = StorageStateCache(str(tmp_path), expiry_margin=60)
+    cache.put("expired@example.com", "https://shop", make_jwt({"exp": time.time() + 30}))
+    cache.put("valid@example.com", "https://shop", make_jwt({"exp": time.time() + 3600}))
+
+    assert cache.get("expired@example.com", "https://shop") is None
+    cache.put("expired@example.com", "https://shop", make_jwt({"exp": time.time() - 1}))
+    assert cache.evict_expired() == 1
+    assert cache.get("valid@example.com", "https://shop") is not None
+    remaining = [path.name for path in tmp_path.glob("*.json")]
+    assert remaining == [os.path.basename(cache._path("valid@example.com", "https://shop"))]
@@ -0,0 +1,102 @@
+import itertools
+import time
+
+import pytest
+import allure
+
+from src.utils.config import Config
+from src.utils.user_pool import UserPool
+from tests.framework.test_storage_state_cache import make_jwt
+
+
+class FakeApi:
+    """The part of ApiClient the pool uses; `known` are the users the backend still has."""
+
+    def __init__(self, token_ttl: float = 3600):
+        self.token_ttl = token_ttl
+        self.known = set()
+        self.logins = 0
+
+    def register_users(self, users):
+        self.known.update(user["email"] for user in users)
+        return users
+
+    def login_many(self, credentials):
+        return [self.login(email, password) for email, password in credentials]
+
+    def login(self, email, password):
+        assert email in self.known, f"Login failed for {email}"
+        self.logins += 1
+        return make_jwt({"sub": email, "exp": time.time() + self.token_ttl})
+
+
+def new_pool(tmp_path, api, size=3):
+    counter = itertools.count()
+
+    def user_factory():
+        return {"email": f"user{next(counter)}@example.com", "password": "secret"}
+
+    return UserPool(user_factory, api, path=str(tmp_path / "pool.json"), size=size, low_water=0)
+
+
+@allure.feature("User Pool")
+@allure.story("Leases")
+@pytest.mark.framework
+def test_leases_are_exclusive_and_returned(tmp_path):
+    api = FakeApi()
+    pool = new_pool(tmp_path, api)
+    pool.provision()
+
+    leased = [pool.lease() for _ in range(3)]
+    assert len({user["email"] for user in leased}) == 3
+    # Exhausted: the next lease registers an extra user instead of waiting
+    extra = pool.lease()
+    assert extra["email"] not in {user["email"] for user in leased}
+    assert pool.stats["registered"] == 4
+
+    pool.release(leased[0])
+    assert pool.lease()["email"] == leased[0]["email"]
+
+
+@allure.feature("User Pool")
+@allure.story("Leases")
+@pytest.mark.framework
+def test_lease_of_a_crashed_worker_is_reclaimed(tmp_path, monkeypatch):
+    pool = new_pool(tmp_path, FakeApi(), size=1)
+    pool.provision()
+    first = pool.lease()
+
+    monkeypatch.setattr(Config, "USER_POOL_LEASE_TIMEOUT", -1)
+    assert pool.lease()["email"] == first["email"]
+    assert pool.stats["registered"] == 1
+
+
+@allure.feature("User Pool")
+@allure.story("Token refresh")
+@pytest.mark.framework
+def test_expired_token_is_renewed(tmp_path):
+    # Tokens issued with exp=now are within the expiry margin: the lease logs in again
+    api = FakeApi(token_ttl=0)
+    pool = new_pool(tmp_path, api, size=2)
+    pool.provision()
+    api.token_ttl = 3600
+
+    user = pool.lease()
+    assert pool.stats["relogins"] == 1
+    assert user["expires_at"] > time.time() + Config.STORAGE_STATE_EXPIRY_MARGIN
+
+
+@allure.feature("User Pool")
+@allure.story("Token refresh")
+@pytest.mark.framework
+def test_users_unknown_to_the_backend_are_dropped(tmp_path):
+    api = FakeApi(token_ttl=0)
+    pool = new_pool(tmp_path, api, size=2)
+    pool.provision()
+    # The demo database was reset: the stale tokens cannot be renewed
+    api.known.clear()
+    api.token_ttl = 3600
+
+    user = pool.lease()
+    assert pool.stats["dropped"] == 2
+    assert user["email"] in api.known and pool.stats["registered"] == 3
@@ -0,0 +1,27 @@
+import pytest
+import allure
+
+from src.pages.checkout_page import CheckoutPage
+from src.utils.data_factory import PAYMENT_METHODS
+
+@allure.feature("Checkout")
+@allure.story("Payment Methods from a Checkpoint")
+@pytest.mark.hybrid
+@pytest.mark.parametrize("method", PAYMENT_METHODS)
+def test_checkout_payment_methods(method, fork_checkpoint, data_factory):
+    """
+    Test Case: Pay with every payment method.
+    Login, cart and billing address are not replayed per method: each test forks the
+    "before payment" checkpoint (captured once per run) with its own copy of the cart.
+    """
+    with allure.step("1. Fork the checkout right before the payment step"):
+        page = fork_checkpoint(CheckoutPage.checkpoint_after_billing(data_factory.record("billing")))
+        checkout_page = CheckoutPage(page)
+
+    with allure.step(f"2. Pay with '{method}'"):
+        payment = data_factory.record("payment", method=method)
+        checkout_page.complete_step_3(payment.pop("method"), payment)
+        checkout_page.confirm_order()
+
+    with allure.step("3. Validate the order"):
+        assert checkout_page.validate_success(), f"Payment with '{method}' was not confirmed"
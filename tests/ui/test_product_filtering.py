@@ -26,24 +26,22 @@ def test_ui_dynamic_filtering(page: Page, home_page):
             # Check if this is the product filtering endpoint
             if "category" in route.request.url:
                 request_captured["captured"] = True
-            route.continue_()
+            # fallback (not continue_) hands the request on to the tape, prefetch and resource-policy routes
+            route.fallback()
 
         # Intercept ALL requests globally on the page for demonstration
         page.route("**/*", handle_filter_request)
 
     with allure.step("3. Apply 'Hand Tools' filter"):
-        # The UI interaction that should trigger the API call
-        home_page.filter_by_hand_tools()
+        # The UI interaction that should trigger the API call.
+        # This is where a senior engineer differs from a junior:
+        # the response waiter is registered *before* clicking, so a fast response can't be missed.
+        with page.expect_response(lambda response: "products" in response.url and response.status == 200, timeout=10000) as response_info:
+            home_page.filter_by_hand_tools()
         
     with allure.step("4. Wait for Network Response and Assert"):
-        # This is where a senior engineer differs from a junior.
-        # We explicitly wait for the response to the filter request to finish.
-        with page.expect_response(lambda response: "products" in response.url and response.status == 200, timeout=10000) as response_info:
-            # We wait for the specific API call to complete
-            pass
-            
+        assert response_info.value.ok, "The filtered products request did not succeed"
         assert request_captured["captured"], "The UI did not fire a network request when the filter was clicked."
 
         filtered_count = home_page.get_product_count()
         assert filtered_count >= 0, "The filtered count should be a valid integer"
-
@@ -5,23 +5,20 @@ from playwright.sync_api import Page, expect
 @allure.feature("User Authentication")
 @allure.story("Login Validation - Wrong Password")
 @pytest.mark.ui
-def test_login_wrong_password(page: Page, home_page):
+def test_login_wrong_password(page: Page, login_page):
     """
     Test Case: Try to login with an incorrect password.
     Validates that the system shows an appropriate error message.
     """
     with allure.step("1. Navigate to Login Page"):
-        page.goto("/auth/login")
-        page.wait_for_load_state("networkidle")
+        login_page.navigate_login()
 
     with allure.step("2. Attempt login with wrong password"):
-        page.locator("[data-test='email']").fill("customer@practicesoftwaretesting.com")
-        page.locator("[data-test='password']").fill("wrongpassword123!")
-        page.locator("[data-test='login-submit']").click()
+        # Returns once the /users/login response arrived, no fixed sleep needed
+        login_page.login("customer@practicesoftwaretesting.com", "wrongpassword123!")
 
     with allure.step("3. Validate error message is displayed"):
         # Wait for error toast or message
-        page.wait_for_timeout(2000)
         error_message = page.locator(".alert-danger, .help-block")
         
         # Assert error is visible
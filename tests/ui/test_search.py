@@ -16,18 +16,16 @@ def test_search_functionality(page: Page, home_page):
     with allure.step("2. Search for a product"):
         search_input = page.locator("[data-test='search-query']")
         search_input.fill("Pliers")
-        search_input.press("Enter")
+        # Wait for the search results to load
+        with home_page.until_ready("search", home_page.SEARCH_RESPONSES, rerendered=(home_page.PRODUCT_CARD,)):
+            search_input.press("Enter")
 
     with allure.step("3. Validate search results"):
-        # Wait for results to load
-        page.wait_for_load_state("networkidle")
-        
-        # Check that results are visible
-        product_cards = page.locator(home_page.PRODUCT_CARD)
-        count = product_cards.count()
-        
-        assert count > 0, "No products found for search query 'Pliers'"
+        # All result pages, read as compact records instead of one locator call per card
+        products = list(home_page.iter_catalog())
+
+        assert len(products) > 0, "No products found for search query 'Pliers'"
         
         # Verify at least one product contains "Pliers" in the title
-        first_product_title = product_cards.first.locator(".card-title").inner_text()
+        first_product_title = products[0].name
         assert "pliers" in first_product_title.lower(), f"Expected 'pliers' in title, got {first_product_title}"
@@ -15,8 +15,8 @@ def test_add_to_cart(page: Page, home_page):
 
     with allure.step("2. Click on first product"):
         product_1 = page.locator(home_page.PRODUCT_CARD).first
-        product_1.click()
-        page.wait_for_load_state("networkidle")
+        with home_page.until_ready("open product", selectors=("[data-test='add-to-cart']",)):
+            product_1.click()
 
     with allure.step("3. Add product to cart"):
         page.locator("[data-test='add-to-cart']").click()